@@ -1,7 +1,8 @@
 
-import requests
+from backend.ai_providers.resources import get_resources
+from backend.ai_providers.limits import get_limiter, estimate_tokens, ProviderHTTPError, RateLimitTimeout
 
-def run_copilot(prompt):
+def run_copilot(prompt, max_tokens=None, json_schema=None):
     try:
         url = "https://api.githubcopilot.com/v1/chat/completions"
         headers = {
@@ -13,11 +14,21 @@ def run_copilot(prompt):
             "model": "gpt-4o-copilot",
             "messages": [{"role":"user","content":prompt}]
         }
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        if json_schema:
+            payload["response_format"] = {"type": "json_object"}
 
-        r = requests.post(url, json=payload, headers=headers, timeout=10)
-        if r.status_code == 200:
-            return r.json()["choices"][0]["message"]["content"]
-        return None
+        def post():
+            r = get_resources().http_session().post(url, json=payload, headers=headers, timeout=10)
+            if r.status_code != 200:
+                raise ProviderHTTPError(r.status_code, r.text, r.headers.get("Retry-After"))
+            return r.json()
+
+        data = get_limiter("copilot").run(post, tokens=estimate_tokens(prompt, max_tokens))
+        return data["choices"][0]["message"]["content"]
 
+    except RateLimitTimeout:
+        raise  # local queue deadline: HEALTH.call skips without blaming Copilot
     except:
         return None
@@ -1,49 +1,115 @@
 # backend/ai/fallback_chain.py
+import asyncio
+import os
 import traceback
-from backend.ai_providers.openai_client import generate_openai # Assuming direct wrapper or driver usage
-from backend.ai_providers.gemini_client import generate_gemini # NEW
-from backend.ai.copilot_client import copilot_complete
+from backend.ai_providers.registry import get_provider # SDKs load on first use
+from backend.ai_providers.health import HEALTH
+from backend.ai.micro_batcher import MicroBatcher, BatchFailed, BATCHING_ENABLED, result_text
+from backend.ai.prompt_compact import build_compact_prompt, max_tokens_for, record_answer
+from backend.ai.structured import SEGMENT_SCHEMA, structured_result
 from backend.ai.offline_engine import offline_response
 from backend.utils.memory_engine import memory_lookup, memory_learn
-from backend.utils.soft_merge import soft_merge
+from backend.utils.soft_merge import soft_merge, PARSER_STRONG
+from backend.utils.models import segments_to_dicts
+from backend.utils.metrics import METRICS
+from backend.utils.semantic_cache import SEMANTIC_CACHE
 from backend.utils.confidence_master import evaluate_confidence
-from backend.parser.parser_logic import run_master_parser
+from backend.controllers.parser_controller import parsed_notam, process_notam as run_master_parser
 
-async def intelligent_fallback(notam_text: str):
+# Cloud providers, default priority (reordered at runtime by HEALTH)
+AI_PROVIDERS = ("openai", "gemini", "copilot")
+
+# parser-first: skip providers when the parser alone is confident enough
+FALLBACK_MODES = ("parser-first", "ai-first")
+FALLBACK_MODE = os.getenv("FALLBACK_MODE", "parser-first")
+PARSER_FIRST_THRESHOLD = float(os.getenv("PARSER_FIRST_THRESHOLD", str(PARSER_STRONG)))
+
+
+async def call_provider(name: str, prompt: str, max_tokens: int = None, json_schema: dict = None):
+    """One provider call under its circuit breaker; None when skipped/failed."""
+    try:
+        fn = get_provider(name)
+    except Exception:
+        return None
+    if asyncio.iscoroutinefunction(fn):
+        return await HEALTH.acall(name, fn, prompt, max_tokens, json_schema)
+    return await asyncio.to_thread(HEALTH.call, name, fn, prompt, max_tokens, json_schema)
+
+
+async def _first_provider(prompt: str, max_tokens: int = None, json_schema: dict = None):
+    """OpenAI / Gemini / Copilot — first healthy answer wins → (text, name)."""
+    for name in HEALTH.order(AI_PROVIDERS):
+        out = await call_provider(name, prompt, max_tokens, json_schema)
+        if out:
+            return out, name
+    return None
+
+
+# Concurrent low-confidence NOTAMs share one "super" prompt; answers are
+# structured (segments + FL bands) so they merge without text scraping.
+FALLBACK_BATCHER = MicroBatcher("super", _first_provider, json_schema=SEGMENT_SCHEMA)
+
+
+async def intelligent_fallback(notam_text: str, mode: str = None):
     """
     Priority: OpenAI -> Gemini -> Copilot -> Offline -> Parser -> Memory
+    Cloud providers are tried fastest-healthy-first; open breakers are skipped.
+
+    mode="parser-first" (default, FALLBACK_MODE) runs the deterministic
+    parser before any provider and returns straight away when its
+    confidence clears PARSER_FIRST_THRESHOLD; "ai-first" always asks a
+    provider. Both record how many LLM calls they avoided.
     """
+    mode = mode if mode in FALLBACK_MODES else FALLBACK_MODE
+    METRICS.incr("fallback_requests", mode=mode)
     responses = {}
     sources_used = []
 
-    # 1. OpenAI (Primary)
+    # 0. Deterministic Parser (Logic) — microseconds, cached
+    parser_out = parsed = None
     try:
-        ai1 = generate_openai(notam_text) # Simplified call
-        if ai1:
-            responses["openai"] = ai1
-            sources_used.append("openai")
+        parser_out = run_master_parser(notam_text)
+        parsed = parsed_notam(notam_text)  # same pass, cached: feeds structured_result
     except Exception:
         pass
 
-    # 2. Google Gemini (Redundancy Layer 1)
-    if "openai" not in responses: # Only try if previous failed (or remove 'if' to run parallel)
-        try:
-            ai_gemini = await generate_gemini(notam_text)
-            if ai_gemini:
-                responses["gemini"] = ai_gemini
-                sources_used.append("gemini")
-        except Exception:
-            pass
+    if mode == "parser-first" and parser_out and parser_out.get("confidence", 0) >= PARSER_FIRST_THRESHOLD:
+        METRICS.incr("fallback_llm_avoided", mode=mode)
+        return {
+            "output": parser_out,
+            "confidence": parser_out["confidence"],
+            "sources": ["parser"]
+        }
+    METRICS.incr("fallback_llm_called", mode=mode)
 
-    # 3. Copilot (Redundancy Layer 2)
-    if not responses:
+    # 1-3. OpenAI / Gemini / Copilot — first healthy answer wins
+    # (a near-duplicate NOTAM answered before is reused instead)
+    ai_out = None
+    cached = SEMANTIC_CACHE.lookup("super", notam_text)
+    hit = None
+    batch_failed = False
+    if cached:
+        hit = (cached.value, "semantic-cache")
+    elif BATCHING_ENABLED:
         try:
-            ai3 = await copilot_complete(notam_text)
-            if ai3:
-                responses["copilot"] = ai3
-                sources_used.append("copilot")
-        except Exception:
-            pass
+            hit = await FALLBACK_BATCHER.submit(notam_text)
+        except BatchFailed:
+            batch_failed = True  # providers already tried for this NOTAM: go offline
+    if not hit and not cached and not batch_failed:
+        # unbatched, or the batch answer had no entry for this NOTAM
+        hit = await _first_provider(build_compact_prompt("super", notam_text, structured=True),
+                                    max_tokens_for("super", notam_text), SEGMENT_SCHEMA)
+        if hit:
+            record_answer("super", notam_text, hit[0])
+    if hit and not cached:
+        SEMANTIC_CACHE.put("super", notam_text, *hit)
+    if hit:
+        value, name = hit
+        structured = structured_result(notam_text, value, parsed)
+        out = structured["text"] or result_text(value)
+        responses[name] = out
+        sources_used.append(name)
+        ai_out = {"text": out, "json": structured["json"], "source": name}
 
     # 4. Offline Template AI (Safety Net)
     try:
@@ -51,19 +117,17 @@ async def intelligent_fallback(notam_text: str):
         if offline: 
             responses["offline"] = offline
             sources_used.append("offline")
+            ai_out = ai_out or {"text": offline, "json": [], "source": "offline"}
     except Exception:
         pass
 
     # 5. Deterministic Parser (Logic)
-    try:
-        parser_out = run_master_parser(notam_text)
-        if parser_out:
-            responses["parser"] = parser_out
-            sources_used.append("parser")
-    except Exception:
-        pass
+    if parser_out:
+        responses["parser"] = parser_out
+        sources_used.append("parser")
 
     # 6. Memory (History)
+    mem = None
     try:
         mem = memory_lookup(notam_text)
         if mem:
@@ -80,7 +144,8 @@ async def intelligent_fallback(notam_text: str):
         }
 
     # Merge Logic
-    final = soft_merge(responses)
+    final = soft_merge(parser_out or {}, ai_out or {}, mem)
+    final["json"] = segments_to_dicts(final["json"])
     score = evaluate_confidence(final, responses)
 
     # Auto-Learn
@@ -95,3 +160,18 @@ async def intelligent_fallback(notam_text: str):
         "confidence": score,
         "sources": sources_used
     }
+
+
+def gate_stats():
+    """Per-mode request counts and the fraction of LLM calls avoided."""
+    out = {}
+    for mode in FALLBACK_MODES:
+        total = METRICS.counter("fallback_requests", mode=mode)
+        avoided = METRICS.counter("fallback_llm_avoided", mode=mode)
+        out[mode] = {
+            "requests": total,
+            "llm_called": METRICS.counter("fallback_llm_called", mode=mode),
+            "llm_avoided": avoided,
+            "avoided_fraction": round(avoided / total, 4) if total else 0.0,
+        }
+    return {"default_mode": FALLBACK_MODE, "threshold": PARSER_FIRST_THRESHOLD, "modes": out}
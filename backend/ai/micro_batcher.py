@@ -0,0 +1,150 @@
+# backend/ai/micro_batcher.py
+# Batch 10.10 — AI Micro-Batcher
+# Handles:
+# - collecting concurrent requests for up to AI_BATCH_MAX_WAIT_MS or AI_BATCH_MAX_ITEMS
+# - one packed prompt per batch (prompt_router.build_batch_prompt)
+# - fanning the JSON array answer back out by item id
+# - identical NOTAMs within a batch share one slot
+# - a batch no provider answered fails every caller in it (BatchFailed);
+#   only items missing from a real answer are left to a single retry
+
+import asyncio
+import itertools
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from backend.ai.prompt_router import build_batch_prompt
+from backend.ai.prompt_compact import build_compact_prompt, max_tokens_for, MAX_OUTPUT_TOKENS
+from backend.ai.structured import SCHEMA_HINT, batch_schema
+from backend.utils.json_stream import iter_array_items
+from backend.utils.metrics import METRICS
+
+BATCH_MAX_ITEMS = int(os.getenv("AI_BATCH_MAX_ITEMS", "8"))
+BATCH_MAX_WAIT_MS = float(os.getenv("AI_BATCH_MAX_WAIT_MS", "20"))
+BATCHING_ENABLED = BATCH_MAX_ITEMS > 1
+
+# call(prompt, max_tokens, json_schema) -> (text, source) or None when every provider failed
+BatchCall = Callable[[str, int, Optional[dict]], Awaitable[Optional[Tuple[str, str]]]]
+
+
+class BatchFailed(Exception):
+    """No provider answered the batch; retrying each NOTAM singly would only repeat that."""
+
+
+def parse_batch_response(text: str) -> Dict[str, Any]:
+    """
+    Map id → result from the model's JSON array: bare, fenced or wrapped
+    in {"items": [...]} (structured mode). Rows after a broken one still count.
+    """
+    if not text:
+        return {}
+    start = text.find("[")
+    if start < 0:
+        return {}
+    out = {}
+    for row in iter_array_items([text[start:]]):
+        if isinstance(row, dict) and "id" in row:
+            out[str(row["id"])] = row.get("result")
+    return out
+
+
+def result_text(value: Any) -> str:
+    """Batched results may come back structured; callers want text."""
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+class MicroBatcher:
+    """
+    await submit(notam) → (result, source); None when the batch was answered
+    but the answer has no entry for this NOTAM (worth a single retry);
+    raises BatchFailed when no provider answered at all.
+
+    Lone requests are sent with the plain single-NOTAM prompt
+    (single_prompt, default build_compact_prompt(task, ...)) so batching
+    adds only the wait window when there is no concurrency. With a
+    json_schema the providers are asked for structured output (the batch
+    schema wraps it per item).
+    """
+
+    def __init__(self, task: str, call: BatchCall,
+                 max_items: int = BATCH_MAX_ITEMS, max_wait_ms: float = BATCH_MAX_WAIT_MS,
+                 single_prompt: Optional[Callable[[str], str]] = None,
+                 json_schema: Optional[dict] = None):
+        self.task = task
+        self.call = call
+        self.json_schema = json_schema
+        self.max_items = max(1, max_items)
+        self.max_wait = max_wait_ms / 1000.0
+        self.single_prompt = single_prompt or (
+            lambda text: build_compact_prompt(task, text, structured=json_schema is not None))
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+        self._ids = itertools.count(1)
+
+    async def submit(self, notam: str) -> Optional[Tuple[Any, str]]:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((f"n{next(self._ids)}", notam, fut))
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch) -> None:
+        try:
+            results = await self._dispatch(batch)
+        except Exception:
+            results = None
+        if results is None:
+            METRICS.incr("ai_batches_failed", task=self.task)
+        for item_id, _, fut in batch:
+            if fut.done():
+                continue
+            if results is None:
+                fut.set_exception(BatchFailed(f"no provider answered the {self.task} batch"))
+            else:
+                fut.set_result(results.get(item_id))
+
+    async def _dispatch(self, batch) -> Optional[Dict[str, Tuple[Any, str]]]:
+        """item id → (result, source) for the items answered; None when no provider answered."""
+        # one slot per distinct NOTAM text
+        slots: Dict[str, str] = {}
+        for item_id, text, _ in batch:
+            slots.setdefault(text.strip(), item_id)
+        METRICS.incr("ai_batches", task=self.task)
+        METRICS.observe("ai_batch_size", len(batch), task=self.task)
+
+        if len(slots) == 1:
+            text = next(iter(slots))
+            hit = await self.call(self.single_prompt(text), max_tokens_for(self.task, text), self.json_schema)
+            return {item_id: hit for item_id, _, _ in batch} if hit else None
+
+        budget = min(MAX_OUTPUT_TOKENS * 2, sum(max_tokens_for(self.task, t) for t in slots))
+        schema = batch_schema(self.json_schema) if self.json_schema else None
+        prompt = build_batch_prompt(self.task, [(i, t) for t, i in slots.items()],
+                                    SCHEMA_HINT if schema else None)
+        hit = await self.call(prompt, budget, schema)
+        if not hit:
+            return None
+        answer, source = hit
+        by_slot = parse_batch_response(answer)
+        METRICS.incr("ai_batch_items_missing", len(slots) - len(by_slot.keys() & set(slots.values())), task=self.task)
+        out = {}
+        for item_id, text, _ in batch:
+            slot = slots[text.strip()]
+            if by_slot.get(slot) is not None:
+                out[item_id] = (by_slot[slot], f"{source}-batch")
+        return out
@@ -1,10 +1,12 @@
 import os
 from typing import List, Dict, Any
 
-from openai import OpenAI
+from backend.ai_providers.resources import get_resources
 
-# Use OPENAI_API_KEY from environment (set this in Render)
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+def get_client():
+    """Shared, pooled OpenAI client (OPENAI_API_KEY from environment)."""
+    return get_resources().openai_client()
 
 
 def openai_complete(
@@ -54,7 +56,7 @@ def openai_complete(
         if key in kwargs:
             extra[key] = kwargs[key]
 
-    resp = client.chat.completions.create(
+    resp = get_client().chat.completions.create(
         model=model,
         messages=messages,
         temperature=temperature,
@@ -1,32 +1,60 @@
 
-import openai
 import time
+from backend.ai_providers.resources import get_resources
+from backend.ai_providers.health import HEALTH, ProviderUnavailable
+from backend.ai.structured import openai_response_format
+from backend.ai_providers.limits import get_limiter, estimate_tokens, RateLimitTimeout
 
 TIMEOUT = 10
 
-def call_openai(model, prompt):
-    openai.api_key = None  # Loaded from env in real system
+def call_openai(model, prompt, max_tokens=None, json_schema=None):
+    client = get_resources().openai_client()  # shared, pooled; key from env
 
     for attempt in range(3):
+        # every attempt asks the breaker: once OpenAI is known dead the
+        # remaining retries (and the downgrade model) cost nothing
+        if not HEALTH.allow("openai"):
+            raise ProviderUnavailable("openai")
+        start = time.monotonic()
+        recorded = False
         try:
-            resp = openai.ChatCompletion.create(
+            resp = get_limiter("openai").run(
+                client.chat.completions.create,
+                tokens=estimate_tokens(prompt, max_tokens),
                 model=model,
                 messages=[{"role":"user","content":prompt}],
-                timeout=TIMEOUT
+                timeout=TIMEOUT,
+                **({"max_tokens": max_tokens} if max_tokens else {}),
+                **({"response_format": openai_response_format(json_schema)} if json_schema else {})
             )
-            return resp["choices"][0]["message"]["content"]
+            HEALTH.record("openai", time.monotonic() - start, True)
+            recorded = True
+            return resp.choices[0].message.content
+
+        except RateLimitTimeout:
+            raise  # already queued past the deadline; retrying won't help
 
         except Exception as e:
+            HEALTH.record("openai", time.monotonic() - start, False, e)
+            recorded = True
             if attempt == 2:
                 raise e
             time.sleep(1)
 
-def run_primary_ai(prompt):
+        finally:
+            # no verdict (local queue deadline, interrupt): don't strand a
+            # half-open probe, or OpenAI would never be tried again
+            if not recorded:
+                HEALTH.release("openai")
+
+def run_primary_ai(prompt, max_tokens=None, json_schema=None):
     try:
-        return call_openai("gpt-4.1-turbo", prompt)
+        return call_openai("gpt-4.1-turbo", prompt, max_tokens, json_schema)
+    except RateLimitTimeout:
+        return None  # already waited out the queue; the downgrade would queue again
     except:
         # downgrade
         try:
-            return call_openai("gpt-4.1-mini", prompt)
+            return call_openai("gpt-4.1-mini", prompt, max_tokens, json_schema)
         except:
             return None
@@ -0,0 +1,137 @@
+# backend/ai/prompt_compact.py
+# Batch 10.13 — Prompt Compaction
+# Handles:
+# - sending only the NOTAM fields a task needs (normalize.split_sections)
+# - compact Q-line summary instead of the raw Q/A/B/C/D header block
+# - cached static instruction prefixes per task
+# - per-task max_tokens derived from the expected answer size, resized
+#   from measured answer lengths once enough answers were seen
+
+import json
+import os
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Any, Deque, Dict
+
+from backend.utils.normalize import normalize_notam
+from backend.utils.route_extract import extract_raw_segments
+
+# Fields each task actually reads. "q" is replaced by q_summary().
+TASK_FIELDS = {
+    "explain": ("a", "b", "c", "d", "e", "f", "g"),
+    "simplify": ("a", "b", "c", "d", "e", "f", "g"),
+    "risk": ("q", "b", "c", "e", "f", "g"),
+    "super": ("q", "e", "f", "g"),
+}
+
+# Expected answer size in tokens: base + per route segment found in E
+# (starting point only; record_answer() rescales it from real answers)
+TASK_OUTPUT = {
+    "explain": (250, 40),
+    "simplify": (150, 30),
+    "risk": (120, 15),
+    "super": (150, 60),
+}
+MAX_OUTPUT_TOKENS = 2048
+MIN_OUTPUT_TOKENS = 32
+
+# Measured sizing: after ANSWER_SAMPLES answers of a task, its budget is
+# the table estimate scaled by the ANSWER_PERCENTILE answer/estimate ratio
+# of the last ANSWER_WINDOW answers, plus ANSWER_HEADROOM
+ANSWER_SAMPLES = int(os.getenv("ANSWER_SAMPLES", "20"))
+ANSWER_WINDOW = int(os.getenv("ANSWER_WINDOW", "500"))
+ANSWER_PERCENTILE = float(os.getenv("ANSWER_PERCENTILE", "0.95"))
+ANSWER_HEADROOM = float(os.getenv("ANSWER_HEADROOM", "1.25"))
+
+_ANSWERS: Dict[str, Deque[float]] = {}
+_ANSWERS_LOCK = threading.Lock()
+
+LABELS = {"a": "A", "b": "FROM", "c": "TO", "d": "SCHEDULE", "e": "E", "f": "LOWER", "g": "UPPER"}
+
+
+def q_summary(q: str) -> str:
+    """'UMKK/QARLC/IV/NBO/E/045/130/5435N02024E028' → 'UMKK QARLC FL045-130 5435N02024E028'."""
+    parts = [p.strip() for p in (q or "").split("/")]
+    if len(parts) < 2:
+        return (q or "").strip()
+    out = [parts[0], parts[1]]
+    if len(parts) >= 7 and parts[5].isdigit() and parts[6].isdigit():
+        out.append(f"FL{parts[5]}-{parts[6]}")
+    if len(parts) >= 8 and parts[7]:
+        out.append(parts[7])
+    return " ".join(p for p in out if p)
+
+
+def compact_notam(task: str, notam_text: str) -> str:
+    """Only the sections the task needs; the whole text when nothing splits."""
+    cleaned, sections = normalize_notam(notam_text or "")
+    if not sections.e:
+        return cleaned
+    lines = []
+    for key in TASK_FIELDS.get(task, "qabcdefg"):
+        value = getattr(sections, key)
+        if not value:
+            continue
+        if key == "q":
+            lines.append(f"Q: {q_summary(value)}")
+        else:
+            lines.append(f"{LABELS[key]}: {value}")
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=None)
+def instruction_prefix(task: str) -> str:
+    """Static part of the task prompt, built once and byte-identical per call."""
+    from backend.ai.prompt_router import build_prompt
+
+    header = build_prompt(task, "").rstrip()
+    if header.endswith("NOTAM:"):
+        header = header[: -len("NOTAM:")].rstrip()
+    return header.strip()
+
+
+def build_compact_prompt(task: str, notam_text: str, structured: bool = False) -> str:
+    """structured=True appends the JSON answer contract (see ai.structured)."""
+    prompt = f"{instruction_prefix(task)}\n\nNOTAM:\n{compact_notam(task, notam_text)}\n"
+    if structured:
+        from backend.ai.structured import SCHEMA_HINT
+        prompt += f"\n{SCHEMA_HINT}\n"
+    return prompt
+
+
+def _estimate(task: str, notam_text: str) -> int:
+    """Table answer size: task base plus a share per route segment in E."""
+    base, per_segment = TASK_OUTPUT.get(task, (300, 40))
+    _, sections = normalize_notam(notam_text or "")
+    segments = len(extract_raw_segments(sections.e)) if sections.e else 0
+    return base + per_segment * min(max(segments, 1), 20)
+
+
+def record_answer(task: str, notam_text: str, answer: Any) -> None:
+    """Feed the size of one provider answer back into max_tokens_for(task)."""
+    if not answer:
+        return
+    if not isinstance(answer, str):
+        answer = json.dumps(answer, separators=(",", ":"), default=str)
+    used = max(1, len(answer) // 4)  # ~4 characters per token
+    with _ANSWERS_LOCK:
+        samples = _ANSWERS.get(task)
+        if samples is None:
+            samples = _ANSWERS[task] = deque(maxlen=ANSWER_WINDOW)
+        samples.append(used / _estimate(task, notam_text))
+
+
+def answer_scale(task: str) -> float:
+    """Measured answer/estimate ratio with headroom; 1.0 until enough samples."""
+    with _ANSWERS_LOCK:
+        samples = sorted(_ANSWERS.get(task, ()))
+    if len(samples) < ANSWER_SAMPLES:
+        return 1.0
+    return samples[int(ANSWER_PERCENTILE * (len(samples) - 1))] * ANSWER_HEADROOM
+
+
+def max_tokens_for(task: str, notam_text: str = "", items: int = 1) -> int:
+    """Answer budget: the table estimate, resized by measured answers."""
+    per_item = max(MIN_OUTPUT_TOKENS, round(_estimate(task, notam_text) * answer_scale(task)))
+    return min(MAX_OUTPUT_TOKENS, items * per_item)
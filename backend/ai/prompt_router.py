@@ -1,3 +1,4 @@
+from backend.ai.prompt_compact import instruction_prefix, compact_notam
 
 def build_prompt(task, notam_text):
     notam_text = notam_text.strip()
@@ -61,3 +62,25 @@ NOTAM:
 """
 
     return f"ERROR: Unknown task '{task}'"
+
+
+def build_batch_prompt(task, items, result_hint=None):
+    """
+    Pack several NOTAMs into one prompt: the task instructions once,
+    then every NOTAM tagged with its id. The model must answer with a
+    JSON array of {"id", "result"} objects (see micro_batcher);
+    result_hint describes the shape of each result.
+    """
+    header = instruction_prefix(task)
+    if result_hint:
+        header = f"{header}\n\nEach result: {result_hint}"
+
+    body = "\n\n".join(f"NOTAM [{item_id}]:\n{compact_notam(task, text)}" for item_id, text in items)
+    return f"""{header}
+
+Apply the instructions above to EACH NOTAM below independently.
+Return ONLY a JSON array, one object per NOTAM, in this form:
+[{{"id": "<id>", "result": <your answer for that NOTAM>}}]
+
+{body}
+"""
@@ -0,0 +1,154 @@
+# backend/ai/structured.py
+# Batch 10.14 — Structured AI Output
+# Handles:
+# - JSON schema for route segments + FL bands sent to the providers
+# - incremental parsing of the answer (utils.json_stream)
+# - validation into the same Segment records build_segments emits,
+#   so AI output feeds soft_merge without text scraping
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from backend.utils.fix_validator import validate_fix
+from backend.utils.fl_engine import fl_for
+from backend.utils.json_stream import ArrayItemParser, iter_array_items
+from backend.utils.models import FLBand, ParsedNotam, Segment
+from backend.utils.normalize import normalize_notam
+from backend.utils.segment_builder import build_segments
+
+_FL = {"type": ["integer", "null"], "minimum": 0, "maximum": 999}
+
+SEGMENT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "segments": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "route": {"type": "string"},
+                    "from": {"type": "string"},
+                    "to": {"type": "string"},
+                    "fl_lower": _FL,
+                    "fl_upper": _FL,
+                },
+                "required": ["route", "from", "to", "fl_lower", "fl_upper"],
+                "additionalProperties": False,
+            },
+        },
+        "explanation": {"type": "string"},
+    },
+    "required": ["segments", "explanation"],
+    "additionalProperties": False,
+}
+
+SCHEMA_HINT = (
+    'Answer with JSON only: {"segments": [{"route", "from", "to", '
+    '"fl_lower", "fl_upper"}], "explanation"}. Fixes are ICAO identifiers, '
+    "flight levels are integers (SFC/GND = 0, UNL = 999)."
+)
+
+
+def batch_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Schema for a micro-batch answer: {"items": [{"id", "result"}]}."""
+    return {
+        "type": "object",
+        "properties": {
+            "items": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"id": {"type": "string"}, "result": schema},
+                    "required": ["id", "result"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["items"],
+        "additionalProperties": False,
+    }
+
+
+def openai_response_format(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """response_format for OpenAI chat completions (strict JSON schema)."""
+    return {"type": "json_schema", "json_schema": {"name": "notam_segments", "strict": True, "schema": schema}}
+
+
+def _fl(value) -> Optional[int]:
+    try:
+        fl = int(value)
+    except (TypeError, ValueError):
+        return None
+    return fl if 0 <= fl <= 999 else None
+
+
+def raw_segment(item: Any) -> Optional[Segment]:
+    """One schema item → raw Segment (band attached when the AI gave one)."""
+    if not isinstance(item, dict):
+        return None
+    seg = Segment.from_dict(item)
+    p1, p2 = validate_fix(seg.from_fix), validate_fix(seg.to_fix)
+    if not seg.route or not p1 or not p2:
+        return None
+    low, high = _fl(item.get("fl_lower")), _fl(item.get("fl_upper"))
+    band = None
+    if low is not None or high is not None:
+        band = FLBand(fl_lower=low or 0, fl_upper_final=999 if high is None else high)
+    return Segment(seg.route, p1, p2, band=band)
+
+
+def iter_segments(chunks: Iterable[str]) -> Iterator[Segment]:
+    """Raw segments as soon as each array element of the answer closes."""
+    for item in iter_array_items(chunks, key="segments"):
+        seg = raw_segment(item)
+        if seg is not None:
+            yield seg
+
+
+def to_segments(raw: List[Segment], parsed: Optional[ParsedNotam] = None,
+                fl_info: Optional[FLBand] = None) -> List[Segment]:
+    """
+    Same post-processing as the parser: memory repair, Q clamp, dedup.
+    The FL band comes from the caller's ParsedNotam (fl_for, computed once).
+    """
+    if fl_info is None:
+        fl_info = fl_for(parsed) if parsed is not None else FLBand()
+    return build_segments(raw, fl_info)
+
+
+def structured_result(notam_text: str, answer: Any, parsed: Optional[ParsedNotam] = None) -> Dict[str, Any]:
+    """
+    Provider answer (JSON text, streamed chunks or an already-decoded
+    dict) → {"text": explanation, "json": [Segment, ...]}. Pass the
+    ParsedNotam already held for notam_text; without one the text is only
+    normalized (for its FL band), not run through the parser again.
+    """
+    if parsed is None and notam_text:
+        cleaned, sections = normalize_notam(notam_text)
+        parsed = ParsedNotam(cleaned=cleaned, sections=sections)
+    if isinstance(answer, dict):
+        items = answer.get("segments") or []
+        raw = [s for s in map(raw_segment, items) if s is not None]
+        text = answer.get("explanation") or ""
+    else:
+        chunks = [answer] if isinstance(answer, str) else answer
+        parser = ArrayItemParser(key="segments")
+        raw, seen = [], []
+        for chunk in chunks:
+            seen.append(chunk)
+            raw.extend(s for s in map(raw_segment, parser.feed(chunk)) if s is not None)
+        full = "".join(seen)
+        text = _explanation(full)
+    return {"text": text, "json": to_segments(raw, parsed)}
+
+
+def _explanation(full: str) -> str:
+    start, end = full.find("{"), full.rfind("}")
+    if start >= 0 and end > start:
+        try:
+            data = json.loads(full[start:end + 1])
+            if isinstance(data, dict):
+                return str(data.get("explanation") or "")
+        except ValueError:
+            pass
+    return full.strip()
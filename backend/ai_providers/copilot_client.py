@@ -1,6 +1,8 @@
+import json
 import os
-import requests
 from dotenv import load_dotenv
+from backend.ai_providers.resources import get_resources
+from backend.ai_providers.limits import get_limiter, estimate_tokens, ProviderHTTPError, RateLimitTimeout
 
 load_dotenv()
 
@@ -15,7 +17,14 @@ HEADERS = {
 MODEL = "gpt-4o-mini"  # GitHub Models fallback
 
 
-def generate_copilot(prompt: str) -> str:
+def _post(payload):
+    r = get_resources().http_session().post(COPILOT_ENDPOINT, json=payload, headers=HEADERS, timeout=20)
+    if r.status_code != 200:
+        raise ProviderHTTPError(r.status_code, r.text, r.headers.get("Retry-After"))
+    return r.json()
+
+
+def generate_copilot(prompt: str, max_tokens: int = None, json_schema: dict = None) -> str:
     """
     GitHub Copilot fallback model.
     Returns empty string on failure.
@@ -29,16 +38,48 @@ def generate_copilot(prompt: str) -> str:
             ],
             "temperature": 0
         }
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        if json_schema:
+            payload["response_format"] = {"type": "json_object"}
 
-        r = requests.post(COPILOT_ENDPOINT, json=payload, headers=HEADERS, timeout=20)
-
-        if r.status_code != 200:
-            print("[Copilot ERROR]", r.text)
-            return ""
-
-        data = r.json()
+        data = get_limiter("copilot").run(_post, payload, tokens=estimate_tokens(prompt, max_tokens))
         return data["choices"][0]["message"]["content"].strip()
 
+    except RateLimitTimeout:
+        raise  # local queue deadline: the caller skips without blaming the provider
     except Exception as e:
         print(f"[Copilot EXCEPTION] {e}")
         return ""
+
+
+def stream_copilot(prompt: str, max_tokens: int = None, json_schema: dict = None):
+    """Yield completion text deltas from the SSE answer (raises on failure)."""
+    payload = {
+        "model": MODEL,
+        "messages": [
+            {"role": "system", "content": "You are an aviation NOTAM assistant."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0,
+        "stream": True
+    }
+    if max_tokens:
+        payload["max_tokens"] = max_tokens
+    if json_schema:
+        payload["response_format"] = {"type": "json_object"}
+    with get_resources().http_session().post(
+        COPILOT_ENDPOINT, json=payload, headers=HEADERS, timeout=20, stream=True
+    ) as r:
+        if r.status_code != 200:
+            raise ProviderHTTPError(r.status_code, r.text, r.headers.get("Retry-After"))
+        for line in r.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            choices = json.loads(data).get("choices") or []
+            delta = (choices[0].get("delta") or {}).get("content") if choices else None
+            if delta:
+                yield delta
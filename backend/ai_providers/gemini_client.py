@@ -1,12 +1,24 @@
 # backend/ai_providers/gemini_client.py
-import google.generativeai as genai
 from backend.utils.config import GOOGLE_API_KEY
+from backend.ai_providers.resources import get_resources
+from backend.ai_providers.limits import get_limiter, estimate_tokens, RateLimitTimeout
 
-# Configure the library
-if GOOGLE_API_KEY:
-    genai.configure(api_key=GOOGLE_API_KEY)
+_genai = None
 
-async def generate_gemini(prompt: str) -> str:
+
+def get_genai():
+    """Import and configure google.generativeai on first use."""
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+        # Configure the library
+        if GOOGLE_API_KEY:
+            genai.configure(api_key=GOOGLE_API_KEY)
+        _genai = genai
+    return _genai
+
+
+async def generate_gemini(prompt: str, max_tokens: int = None, json_schema: dict = None) -> str:
     """
     Sends a prompt to Google Gemini Pro and returns the text response.
     """
@@ -14,11 +26,19 @@ async def generate_gemini(prompt: str) -> str:
         return ""
 
     try:
-        model = genai.GenerativeModel('gemini-pro')
-        response = await model.generate_content_async(prompt)
+        model = get_resources().gemini_model('gemini-pro')
+        config = {"max_output_tokens": max_tokens} if max_tokens else {}
+        if json_schema:
+            config["response_mime_type"] = "application/json"
+        response = await get_limiter("gemini").arun(
+            model.generate_content_async, prompt,
+            tokens=estimate_tokens(prompt, max_tokens), generation_config=config or None
+        )
         
         if response.text:
             return response.text.strip()
+    except RateLimitTimeout:
+        raise  # local queue deadline: the caller skips without blaming the provider
     except Exception as e:
         print(f"[Gemini ERROR] {e}")
     
@@ -0,0 +1,217 @@
+# backend/ai_providers/health.py
+"""
+Provider health tracking.
+
+Each provider gets a circuit breaker (closed → open → half-open) plus
+EWMA latency and error rate. Fallback chains ask the tracker for the
+provider order (fastest expected first) and skip providers whose breaker
+is open, so a dead provider costs nothing per request instead of a full
+timeout cascade.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from backend.ai_providers.limits import RateLimitTimeout
+
+FAILURE_THRESHOLD = int(os.getenv("CB_FAILURE_THRESHOLD", "3"))
+RESET_TIMEOUT = float(os.getenv("CB_RESET_TIMEOUT", "30"))
+EWMA_ALPHA = float(os.getenv("PROVIDER_EWMA_ALPHA", "0.3"))
+
+class ProviderUnavailable(Exception):
+    """Raised by drivers when the provider's breaker refuses the call."""
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """Opens after N consecutive failures; lets one probe through after the cool-down."""
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and now - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self._probing = False
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def release_probe(self) -> None:
+        """The half-open probe ended without a verdict: let the next one through."""
+        if self.state == HALF_OPEN:
+            self._probing = False
+
+    def record_failure(self, now: Optional[float] = None) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic() if now is None else now
+
+
+class ProviderHealth:
+    """Breaker + EWMA latency/error rate for one provider."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.breaker = CircuitBreaker()
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_error: Optional[str] = None
+
+    def _observe(self, latency: float, failed: bool) -> None:
+        self.calls += 1
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += EWMA_ALPHA * (latency - self.latency)
+        self.error_rate += EWMA_ALPHA * ((1.0 if failed else 0.0) - self.error_rate)
+
+    def record_success(self, latency: float) -> None:
+        self._observe(latency, False)
+        self.breaker.record_success()
+
+    def record_failure(self, latency: float, error: Any = None) -> None:
+        self._observe(latency, True)
+        self.failures += 1
+        self.last_error = str(error) if error is not None else "empty response"
+        self.breaker.record_failure()
+
+    def expected_cost(self) -> float:
+        """Expected seconds to a good answer; unknown providers rank by given order."""
+        if self.latency is None:
+            return 0.0
+        return self.latency / max(1.0 - self.error_rate, 0.05)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.breaker.state,
+            "latency_ewma": round(self.latency, 4) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 4),
+            "calls": self.calls,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_error": self.last_error,
+        }
+
+
+class HealthTracker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._providers: Dict[str, ProviderHealth] = {}
+
+    def get(self, name: str) -> ProviderHealth:
+        with self._lock:
+            h = self._providers.get(name)
+            if h is None:
+                h = self._providers[name] = ProviderHealth(name)
+            return h
+
+    def allow(self, name: str) -> bool:
+        h = self.get(name)
+        with self._lock:
+            ok = h.breaker.allow()
+            if not ok:
+                h.skipped += 1
+            return ok
+
+    def release(self, name: str) -> None:
+        """An allowed call ended without a result either way (queue deadline,
+        cancellation): free a half-open probe without counting a failure."""
+        h = self.get(name)
+        with self._lock:
+            h.breaker.release_probe()
+
+    def order(self, names: Iterable[str]) -> List[str]:
+        """Providers sorted by expected latency; open breakers go last."""
+        names = list(names)
+        def key(item):
+            idx, name = item
+            h = self.get(name)
+            return (h.breaker.state == OPEN, h.expected_cost(), idx)
+        return [n for _, n in sorted(enumerate(names), key=key)]
+
+    def record(self, name: str, latency: float, ok: bool, error: Any = None) -> None:
+        h = self.get(name)
+        with self._lock:
+            if ok:
+                h.record_success(latency)
+            else:
+                h.record_failure(latency, error)
+
+    def call(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a sync provider call under the breaker; None when skipped or failed."""
+        if not self.allow(name):
+            return None
+        start = time.monotonic()
+        recorded = False
+        try:
+            out = fn(*args, **kwargs)
+            self.record(name, time.monotonic() - start, bool(out))
+            recorded = True
+            return out or None
+        except RateLimitTimeout:
+            return None  # our own queue ran out of time: skip, not a provider failure
+        except Exception as e:
+            self.record(name, time.monotonic() - start, False, e)
+            recorded = True
+            return None
+        finally:
+            if not recorded:  # also cancellation
+                self.release(name)
+
+    async def acall(self, name: str, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Async variant of call()."""
+        if not self.allow(name):
+            return None
+        start = time.monotonic()
+        recorded = False
+        try:
+            out = await fn(*args, **kwargs)
+            self.record(name, time.monotonic() - start, bool(out))
+            recorded = True
+            return out or None
+        except RateLimitTimeout:
+            return None  # our own queue ran out of time: skip, not a provider failure
+        except Exception as e:
+            self.record(name, time.monotonic() - start, False, e)
+            recorded = True
+            return None
+        finally:
+            if not recorded:  # also cancellation
+                self.release(name)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {n: h.snapshot() for n, h in self._providers.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._providers.clear()
+
+
+HEALTH = HealthTracker()
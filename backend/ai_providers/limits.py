@@ -0,0 +1,270 @@
+# backend/ai_providers/limits.py
+"""
+Per-provider rate limiting.
+
+Each provider gets two token buckets (requests/min and tokens/min) and
+an AIMD concurrency limit: +1/limit per success, halved on a 429.
+Callers queue for capacity until their deadline instead of failing, and
+a 429 pauses the provider for its Retry-After before the call is retried
+from the queue. Works from threads (run) and coroutines (arun).
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+QUEUE_TIMEOUT = float(os.getenv("PROVIDER_QUEUE_TIMEOUT", "15"))
+OUTPUT_TOKENS = int(os.getenv("PROVIDER_OUTPUT_TOKENS", "512"))
+DEFAULT_RETRY_AFTER = 1.0
+
+# provider → (requests/min, tokens/min, max concurrency); override with
+# <NAME>_RPM, <NAME>_TPM and <NAME>_MAX_CONCURRENCY
+DEFAULT_LIMITS = {
+    "openai": (500, 200000, 16),
+    "gemini": (60, 120000, 8),
+    "copilot": (15, 150000, 4),
+}
+
+
+class RateLimitTimeout(Exception):
+    """No capacity before the caller's deadline."""
+
+
+def estimate_tokens(prompt: str, output_tokens: Optional[int] = None) -> int:
+    """~4 characters per token for the prompt plus the expected answer."""
+    return max(1, len(prompt or "") // 4) + (output_tokens or OUTPUT_TOKENS)
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """429 from any SDK: openai.RateLimitError, google ResourceExhausted, HTTP errors."""
+    if getattr(exc, "status_code", None) == 429 or getattr(exc, "code", None) == 429:
+        return True
+    return type(exc).__name__ in ("RateLimitError", "ResourceExhausted", "TooManyRequests")
+
+
+def retry_after(exc: BaseException) -> float:
+    seconds = getattr(exc, "retry_after", None)
+    if seconds is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        seconds = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return max(0.0, float(seconds))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class ProviderHTTPError(Exception):
+    """Non-200 answer from a plain HTTP provider (status + Retry-After)."""
+
+    def __init__(self, status_code: int, body: str = "", retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status_code}: {body[:200]}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Reservation-style bucket: a caller debits now and is told how long to
+    wait for the balance to refill, so waiters are served in arrival order.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self, amount: float, now: float, max_wait: float) -> Optional[float]:
+        """Seconds to wait (0 = go), or None without debiting if past max_wait."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        wait = 0.0 if self.level >= amount else (amount - self.level) / self.rate
+        if wait > max_wait:
+            return None
+        self.level -= amount
+        return wait
+
+    def pause(self, seconds: float, now: float) -> None:
+        """Provider said 429: empty the bucket for Retry-After seconds."""
+        self._refill(now)
+        self.level = min(self.level, -seconds * self.rate)
+
+
+class AIMDLimit:
+    """Additive-increase / multiplicative-decrease concurrency limit."""
+
+    def __init__(self, maximum: int, minimum: int = 1):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(maximum)
+        self.inflight = 0
+
+    def available(self) -> bool:
+        return self.inflight < max(self.minimum, int(self.limit))
+
+    def on_success(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+    def on_throttle(self) -> None:
+        self.limit = max(self.minimum, self.limit / 2.0)
+
+
+class ProviderLimiter:
+    def __init__(self, name: str, rpm: float, tpm: float, concurrency: int,
+                 queue_timeout: float = QUEUE_TIMEOUT):
+        self.name = name
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.concurrency = AIMDLimit(concurrency)
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self.stats = {"calls": 0, "throttled": 0, "errors": 0, "timeouts": 0, "waited_s": 0.0}
+
+    # -- admission ----------------------------------------------------
+    def _reserve(self, tokens: int, deadline: float) -> float:
+        with self._cond:
+            now = time.monotonic()
+            budget = deadline - now
+            w_req = self.requests.reserve(1, now, budget)
+            if w_req is None:
+                return self._timeout()
+            w_tok = self.tokens.reserve(tokens, now, budget)
+            if w_tok is None:
+                self.requests.level += 1  # give the request slot back
+                return self._timeout()
+            return max(w_req, w_tok)
+
+    def _timeout(self) -> float:
+        self.stats["timeouts"] += 1
+        raise RateLimitTimeout(f"{self.name}: no capacity before deadline")
+
+    def _try_slot(self) -> bool:
+        with self._cond:
+            if self.concurrency.available():
+                self.concurrency.inflight += 1
+                return True
+            return False
+
+    def acquire(self, tokens: int, deadline: float) -> None:
+        wait = self._reserve(tokens, deadline)
+        if wait:
+            self.stats["waited_s"] += wait
+            time.sleep(wait)
+        with self._cond:
+            while not self.concurrency.available():
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    self._timeout()
+                self._cond.wait(left)
+            self.concurrency.inflight += 1
+
+    async def aacquire(self, tokens: int, deadline: float) -> None:
+        wait = self._reserve(tokens, deadline)
+        if wait:
+            self.stats["waited_s"] += wait
+            await asyncio.sleep(wait)
+        while not self._try_slot():
+            if time.monotonic() >= deadline:
+                with self._cond:
+                    self._timeout()
+            await asyncio.sleep(0.01)
+
+    def release(self, throttled: bool = False, pause: float = 0.0, ok: bool = True) -> None:
+        """Free a slot; only successes grow the limit, 429s shrink it."""
+        with self._cond:
+            self.concurrency.inflight -= 1
+            self.stats["calls"] += 1
+            if throttled:
+                self.stats["throttled"] += 1
+                self.concurrency.on_throttle()
+                now = time.monotonic()
+                self.requests.pause(pause, now)
+            elif ok:
+                self.concurrency.on_success()
+            else:  # other errors, cancellation: no signal about capacity
+                self.stats["errors"] += 1
+            self._cond.notify()
+
+    # -- calls --------------------------------------------------------
+    def run(self, fn: Callable[..., Any], *args, tokens: int = OUTPUT_TOKENS,
+            timeout: Optional[float] = None, **kwargs) -> Any:
+        """Call fn when capacity allows; 429s pause and requeue until the deadline."""
+        deadline = time.monotonic() + (self.queue_timeout if timeout is None else timeout)
+        while True:
+            self.acquire(tokens, deadline)
+            throttled, pause, ok = False, 0.0, False
+            try:
+                out = fn(*args, **kwargs)
+                ok = True
+                return out
+            except Exception as e:
+                throttled = is_rate_limited(e)
+                if not throttled:
+                    raise
+                pause = retry_after(e)
+            finally:
+                # also on cancellation/KeyboardInterrupt, or the slot leaks
+                self.release(throttled, pause, ok)
+
+    async def arun(self, fn: Callable[..., Any], *args, tokens: int = OUTPUT_TOKENS,
+                   timeout: Optional[float] = None, **kwargs) -> Any:
+        """Async variant of run()."""
+        deadline = time.monotonic() + (self.queue_timeout if timeout is None else timeout)
+        while True:
+            await self.aacquire(tokens, deadline)
+            throttled, pause, ok = False, 0.0, False
+            try:
+                out = await fn(*args, **kwargs)
+                ok = True
+                return out
+            except Exception as e:
+                throttled = is_rate_limited(e)
+                if not throttled:
+                    raise
+                pause = retry_after(e)
+            finally:
+                # also on cancellation/KeyboardInterrupt, or the slot leaks
+                self.release(throttled, pause, ok)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "concurrency_limit": round(self.concurrency.limit, 2),
+                "inflight": self.concurrency.inflight,
+                "requests_available": round(self.requests.level, 2),
+                "tokens_available": round(self.tokens.level, 1),
+                **{k: round(v, 3) if isinstance(v, float) else v for k, v in self.stats.items()},
+            }
+
+
+_LIMITERS: Dict[str, ProviderLimiter] = {}
+_LOCK = threading.Lock()
+
+
+def get_limiter(name: str) -> ProviderLimiter:
+    """Process-wide limiter for a provider, configured from env on first use."""
+    limiter = _LIMITERS.get(name)
+    if limiter is None:
+        with _LOCK:
+            limiter = _LIMITERS.get(name)
+            if limiter is None:
+                rpm, tpm, conc = DEFAULT_LIMITS.get(name, (60, 100000, 4))
+                prefix = name.upper()
+                limiter = _LIMITERS[name] = ProviderLimiter(
+                    name,
+                    float(os.getenv(f"{prefix}_RPM", rpm)),
+                    float(os.getenv(f"{prefix}_TPM", tpm)),
+                    int(os.getenv(f"{prefix}_MAX_CONCURRENCY", conc)),
+                )
+    return limiter
+
+
+def limits_snapshot() -> Dict[str, Dict[str, Any]]:
+    return {n: l.snapshot() for n, l in list(_LIMITERS.items())}
@@ -1,25 +1,61 @@
 import os
-from openai import OpenAI
 from dotenv import load_dotenv
+from backend.ai_providers.resources import get_resources
+from backend.ai_providers.limits import get_limiter, estimate_tokens, RateLimitTimeout
 
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-client = OpenAI(api_key=OPENAI_API_KEY)
 MODEL = "gpt-4.1"
 
-def generate_openai(prompt: str) -> str:
+
+def get_client():
+    """Shared, pooled OpenAI client (created on first use)."""
+    return get_resources().openai_client()
+
+
+def _limit_kwargs(max_tokens, json_schema=None):
+    kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+    if json_schema:
+        from backend.ai.structured import openai_response_format
+        kwargs["response_format"] = openai_response_format(json_schema)
+    return kwargs
+
+
+def generate_openai(prompt: str, max_tokens: int = None, json_schema: dict = None) -> str:
     try:
-        response = client.chat.completions.create(
+        response = get_limiter("openai").run(
+            get_client().chat.completions.create,
+            tokens=estimate_tokens(prompt, max_tokens),
             model=MODEL,
             messages=[
                 {"role": "system", "content": "You are an aviation NOTAM assistant."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0,
+            **_limit_kwargs(max_tokens, json_schema),
         )
         return response.choices[0].message.content.strip()
+    except RateLimitTimeout:
+        raise  # local queue deadline: the caller skips without blaming the provider
     except Exception as e:
         print(f"[OpenAI ERROR] {e}")
         return ""
+
+
+def stream_openai(prompt: str, max_tokens: int = None, json_schema: dict = None):
+    """Yield completion text deltas as they arrive (raises on failure)."""
+    stream = get_client().chat.completions.create(
+        model=MODEL,
+        messages=[
+            {"role": "system", "content": "You are an aviation NOTAM assistant."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0,
+        stream=True,
+        **_limit_kwargs(max_tokens, json_schema),
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
@@ -0,0 +1,53 @@
+# backend/ai_providers/registry.py
+"""
+Lazy provider registry.
+
+Provider SDKs (openai, google.generativeai, requests) are heavy to import
+and are not needed by the parser-only endpoints. Callers ask the registry
+for a provider by name; its module is imported on first use only.
+"""
+
+import importlib
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+# name -> (module path, callable name)
+PROVIDERS: Dict[str, Tuple[str, str]] = {
+    "openai": ("backend.ai_providers.openai_client", "generate_openai"),
+    "gemini": ("backend.ai_providers.gemini_client", "generate_gemini"),
+    "copilot": ("backend.ai_providers.copilot_client", "generate_copilot"),
+}
+
+_LOADED: Dict[str, Callable[..., Any]] = {}
+_LOCK = threading.Lock()
+
+
+def register_provider(name: str, module: str, attr: str) -> None:
+    """Add or replace a provider entry (loaded lazily like the built-ins)."""
+    with _LOCK:
+        PROVIDERS[name] = (module, attr)
+        _LOADED.pop(name, None)
+
+
+def get_provider(name: str) -> Callable[..., Any]:
+    """Return the provider's generate function, importing it on first use."""
+    fn = _LOADED.get(name)
+    if fn is not None:
+        return fn
+    if name not in PROVIDERS:
+        raise KeyError(f"Unknown AI provider '{name}'")
+    with _LOCK:
+        fn = _LOADED.get(name)
+        if fn is None:
+            module, attr = PROVIDERS[name]
+            fn = getattr(importlib.import_module(module), attr)
+            _LOADED[name] = fn
+    return fn
+
+
+def provider_names() -> List[str]:
+    return list(PROVIDERS)
+
+
+def loaded_providers() -> List[str]:
+    return [n for n in PROVIDERS if n in _LOADED]
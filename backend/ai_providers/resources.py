@@ -0,0 +1,138 @@
+# backend/ai_providers/resources.py
+"""
+Shared, long-lived provider clients.
+
+One container per process holds a pooled requests.Session (Copilot),
+the OpenAI client (httpx connection pool) and cached Gemini models.
+Every router and driver borrows from here instead of opening a new
+connection per call. The FastAPI lifespan below warms the container in
+the background at startup and closes it on shutdown.
+"""
+
+import asyncio
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+HTTP_POOL_SIZE = int(os.getenv("PROVIDER_HTTP_POOL_SIZE", "10"))
+PROVIDER_WARMUP = os.getenv("PROVIDER_WARMUP", "1") not in ("0", "false", "False", "")
+
+
+class ProviderResources:
+    """Lazily built, thread-safe holder of provider clients."""
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE):
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._http = None
+        self._openai = None
+        self._gemini: Dict[str, Any] = {}
+
+    def http_session(self):
+        """requests.Session with a keep-alive connection pool."""
+        if self._http is None:
+            with self._lock:
+                if self._http is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._http = session
+        return self._http
+
+    def openai_client(self):
+        """Single OpenAI client; it keeps its own httpx connection pool."""
+        if self._openai is None:
+            with self._lock:
+                if self._openai is None:
+                    from openai import OpenAI
+                    self._openai = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._openai
+
+    def gemini_model(self, name: str = "gemini-pro"):
+        """GenerativeModel per model name, built once."""
+        model = self._gemini.get(name)
+        if model is None:
+            with self._lock:
+                model = self._gemini.get(name)
+                if model is None:
+                    from backend.ai_providers.gemini_client import get_genai
+                    model = get_genai().GenerativeModel(name)
+                    self._gemini[name] = model
+        return model
+
+    def warm(self) -> Dict[str, str]:
+        """Build the clients of every configured provider."""
+        report = {}
+        if os.getenv("OPENAI_API_KEY"):
+            report["openai"] = _try(self.openai_client)
+        if os.getenv("GOOGLE_API_KEY"):
+            report["gemini"] = _try(self.gemini_model)
+        if os.getenv("COPILOT_API_KEY"):
+            report["copilot"] = _try(self.http_session)
+        return report
+
+    def close(self) -> None:
+        with self._lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+            if self._openai is not None:
+                try:
+                    self._openai.close()
+                except Exception:
+                    pass
+                self._openai = None
+            self._gemini.clear()
+
+
+def _try(fn) -> str:
+    try:
+        fn()
+        return "ready"
+    except Exception as e:
+        return f"error: {e}"
+
+
+_RESOURCES: Optional[ProviderResources] = None
+
+
+def get_resources() -> ProviderResources:
+    """Process-wide container shared by backend/main.py and backend/app.py."""
+    global _RESOURCES
+    if _RESOURCES is None:
+        _RESOURCES = ProviderResources()
+    return _RESOURCES
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    FastAPI lifespan: expose the container on app.state, warm it (and the
+    corpus / memory index snapshots) without delaying readiness, and close
+    pooled connections on shutdown.
+    """
+    from backend.utils import corpus_memory
+    from backend.utils.memory_index import MEMORY_INDEX
+
+    resources = get_resources()
+    app.state.providers = resources
+    tasks = []
+    if PROVIDER_WARMUP:
+        tasks.append(asyncio.create_task(asyncio.to_thread(resources.warm)))
+    if corpus_memory.WARM_START:
+        tasks.append(asyncio.create_task(asyncio.to_thread(corpus_memory.CORPUS_MEMORY.load)))
+    tasks.append(asyncio.create_task(asyncio.to_thread(MEMORY_INDEX.load)))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            try:
+                await task
+            except Exception:
+                pass
+        resources.close()
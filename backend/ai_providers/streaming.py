@@ -0,0 +1,133 @@
+# backend/ai_providers/streaming.py
+"""
+Token streaming with provider fallback.
+
+Streamers are looked up lazily like the registry's generate functions.
+stream_with_fallback() tries providers in health order; a provider that
+errors, ends empty or stalls for STREAM_FIRST_TOKEN_TIMEOUT seconds
+before its first token is abandoned for the next one. Once a token has
+been relayed the stream is committed to that provider. Time-to-first-
+token goes to METRICS as "ai_ttft_seconds".
+"""
+
+import asyncio
+import importlib
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Tuple
+
+from backend.ai_providers.health import HEALTH
+from backend.ai_providers.limits import get_limiter, estimate_tokens, is_rate_limited, RateLimitTimeout
+from backend.utils.metrics import METRICS
+
+FIRST_TOKEN_TIMEOUT = float(os.getenv("STREAM_FIRST_TOKEN_TIMEOUT", "8"))
+
+# name -> (module path, generator name); sync generators run in a thread
+STREAMERS: Dict[str, Tuple[str, str]] = {
+    "openai": ("backend.ai_providers.openai_client", "stream_openai"),
+    "copilot": ("backend.ai_providers.copilot_client", "stream_copilot"),
+}
+
+
+def get_streamer(name: str) -> Callable[[str], Any]:
+    module, attr = STREAMERS[name]
+    return getattr(importlib.import_module(module), attr)
+
+
+async def aiter_thread(gen_fn: Callable[..., Iterable[str]], *args) -> AsyncIterator[str]:
+    """Relay a blocking generator through a worker thread."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def pump():
+        try:
+            for item in gen_fn(*args):
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, ("item", item))
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, ("error", e))
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, ("done", None))
+
+    loop.run_in_executor(None, pump)
+    try:
+        while True:
+            kind, value = await queue.get()
+            if kind == "item":
+                yield value
+            elif kind == "error":
+                raise value
+            else:
+                return
+    finally:
+        stop.set()
+
+
+def _open(fn, prompt, max_tokens) -> AsyncIterator[str]:
+    out = fn(prompt, max_tokens=max_tokens)
+    return out if hasattr(out, "__anext__") else aiter_thread(lambda: out)
+
+
+async def stream_with_fallback(prompt: str, providers: Iterable[str],
+                               first_token_timeout: float = FIRST_TOKEN_TIMEOUT,
+                               get_stream: Callable[[str], Any] = get_streamer,
+                               max_tokens: int = None) -> AsyncIterator[Tuple[str, str]]:
+    """
+    Yield ("provider", name) once, then ("token", text) items.
+    Nothing is yielded for providers abandoned before their first token.
+    """
+    for name in HEALTH.order(providers):
+        if not HEALTH.allow(name):
+            continue
+        limiter = get_limiter(name)
+        start = time.monotonic()
+        recorded = False
+        try:
+            try:
+                await limiter.aacquire(estimate_tokens(prompt, max_tokens), start + first_token_timeout)
+            except RateLimitTimeout:
+                continue  # our own queue is full: skip without blaming the provider
+
+            stream = None
+            throttled = ok = False
+            try:
+                try:
+                    stream = _open(get_stream(name), prompt, max_tokens)
+                    first = await asyncio.wait_for(stream.__anext__(), first_token_timeout)
+                except Exception as e:
+                    throttled = is_rate_limited(e)
+                    if isinstance(e, asyncio.TimeoutError):
+                        error = "stalled before first token"
+                    elif isinstance(e, StopAsyncIteration):
+                        error = "empty response"
+                    else:
+                        error = e
+                    HEALTH.record(name, time.monotonic() - start, False, error)
+                    recorded = True
+                    METRICS.incr("ai_stream_fallbacks", provider=name)
+                    continue
+
+                METRICS.observe("ai_ttft_seconds", time.monotonic() - start, provider=name)
+                try:
+                    yield "provider", name
+                    yield "token", first
+                    async for token in stream:
+                        yield "token", token
+                except Exception as e:
+                    HEALTH.record(name, time.monotonic() - start, False, e)
+                    recorded = True
+                    raise
+                HEALTH.record(name, time.monotonic() - start, True)
+                recorded = ok = True
+                return
+            finally:
+                # also on client disconnect (GeneratorExit) and cancellation
+                limiter.release(throttled, ok=ok)
+                if stream is not None and hasattr(stream, "aclose"):
+                    await stream.aclose()
+        finally:
+            if not recorded:
+                HEALTH.release(name)  # no verdict: free a half-open probe
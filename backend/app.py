@@ -11,8 +11,10 @@ from fastapi.responses import FileResponse, RedirectResponse
 from backend.routes.parse_route import router as parse_router
 from backend.routes.ai_routes import router as ai_router
 from backend.routes.memory_routes import router as memory_router
+from backend.routes.notam_routes import router as notam_router
+from backend.ai_providers.resources import lifespan
 
-app = FastAPI(title="One Stop Solution Backend")
+app = FastAPI(title="One Stop Solution Backend", lifespan=lifespan)
 
 # Dynamic CORS
 origins = [
@@ -34,6 +36,7 @@ app.add_middleware(
 app.include_router(parse_router)
 app.include_router(ai_router)
 app.include_router(memory_router)
+app.include_router(notam_router)
 
 
 @app.get("/health")
@@ -1,34 +1,51 @@
 
 # Batch 7B - AI Controller (Medium Skeleton)
 
-from backend.ai.prompt_router import build_prompt
+import asyncio
+import os
+
+from backend.ai.prompt_compact import build_compact_prompt, max_tokens_for, record_answer
+from backend.ai.micro_batcher import MicroBatcher, BatchFailed, BATCHING_ENABLED, result_text
+from backend.ai.structured import SEGMENT_SCHEMA, structured_result
+from backend.controllers.parser_controller import parsed_notam
+from backend.utils.models import segments_to_dicts
+from backend.utils.semantic_cache import SEMANTIC_CACHE
 from backend.ai.openai_driver import run_primary_ai
 from backend.ai.copilot_driver import run_copilot
+from backend.ai_providers.health import HEALTH
 from backend.ai.offline_engine import offline_explain, offline_simplify, offline_risk, offline_super
 
 """
 AI Controller manages:
-1. Prompt construction
+1. Prompt construction (compacted to the fields each task needs)
 2. OpenAI primary call
-3. Copilot fallback
+3. Copilot fallback (OpenAI/Copilot tried fastest-healthy-first)
 4. Offline fallback
 5. Hybrid output structuring
+6. Micro-batching of concurrent requests (run_ai_batched)
+7. Structured (JSON schema) answers validated into parser Segments
+8. Near-duplicate answer reuse (utils.semantic_cache) before any provider
 """
 
-def run_ai(task: str, notam: str):
-    prompt = build_prompt(task, notam)
+BATCH_TASKS = set(filter(None, os.getenv("AI_BATCH_TASKS", "super").split(",")))
+STRUCTURED_TASKS = set(filter(None, os.getenv("AI_STRUCTURED_TASKS", "super").split(",")))
 
-    # Primary AI
-    primary = run_primary_ai(prompt)
-    if primary:
-        return {"text": primary, "json": [], "source": "openai"}
+def schema_for(task: str):
+    return SEGMENT_SCHEMA if task in STRUCTURED_TASKS else None
 
-    # Copilot fallback
-    cop = run_copilot(prompt)
-    if cop:
-        return {"text": cop, "json": [], "source": "copilot"}
+def call_providers(prompt: str, max_tokens: int = None, json_schema: dict = None):
+    """Primary AI / Copilot fallback, ordered by provider health → (text, source)."""
+    for name in HEALTH.order(("openai", "copilot")):
+        if name == "openai":
+            out = run_primary_ai(prompt, max_tokens, json_schema)  # records per attempt itself
+        else:
+            out = HEALTH.call("copilot", run_copilot, prompt, max_tokens, json_schema)
+        if out:
+            return out, name
+    return None, None
 
-    # Offline fallback
+
+def offline_result(task: str, notam: str):
     if task == "explain":
         return {"text": offline_explain(notam), "json": [], "source": "offline"}
 
@@ -42,3 +59,74 @@ def run_ai(task: str, notam: str):
         return {"text": "Offline model cannot fully decode NOTAM", "json": offline_super(notam), "source": "offline"}
 
     return {"text": "Unknown task", "json": [], "source": "error"}
+
+
+def ai_result(task: str, notam: str, value, source: str):
+    """Provider answer → {"text", "json", "source"}; structured tasks get Segment dicts."""
+    if task in STRUCTURED_TASKS:
+        res = structured_result(notam, value, parsed_notam(notam))
+        return {"text": res["text"] or result_text(value), "json": segments_to_dicts(res["json"]), "source": source}
+    return {"text": result_text(value), "json": [] if isinstance(value, str) else value, "source": source}
+
+
+def cached_ai(task: str, notam: str):
+    """Answer of a near-duplicate NOTAM, re-validated for this one; None on miss."""
+    hit = SEMANTIC_CACHE.lookup(task, notam)
+    if hit is None:
+        return None
+    res = ai_result(task, notam, hit.value, hit.source)
+    res["source"] = f"semantic-cache:{hit.source}"
+    res["similarity"] = hit.score
+    return res
+
+
+def run_ai(task: str, notam: str):
+    cached = cached_ai(task, notam)
+    if cached:
+        return cached
+
+    schema = schema_for(task)
+    prompt = build_compact_prompt(task, notam, structured=schema is not None)
+
+    out, source = call_providers(prompt, max_tokens_for(task, notam), schema)
+    if out:
+        record_answer(task, notam, out)
+        SEMANTIC_CACHE.put(task, notam, out, source)
+        return ai_result(task, notam, out, source)
+
+    # Offline fallback
+    return offline_result(task, notam)
+
+
+async def _batch_call(prompt: str, max_tokens: int = None, json_schema: dict = None):
+    out, source = await asyncio.to_thread(call_providers, prompt, max_tokens, json_schema)
+    return (out, source) if out else None
+
+
+_BATCHERS = {}
+
+def batcher_for(task: str) -> MicroBatcher:
+    if task not in _BATCHERS:
+        _BATCHERS[task] = MicroBatcher(task, _batch_call, json_schema=schema_for(task))
+    return _BATCHERS[task]
+
+
+async def run_ai_batched(task: str, notam: str):
+    """
+    run_ai for async callers: tasks in AI_BATCH_TASKS share one LLM
+    round trip with concurrent requests; items the batch answer left out
+    fall back to a single run_ai call. When no provider answered the
+    batch at all, every caller gets the offline result without a retry.
+    """
+    if BATCHING_ENABLED and task in BATCH_TASKS:
+        cached = cached_ai(task, notam)
+        if cached:
+            return cached
+        try:
+            hit = await batcher_for(task).submit(notam)
+        except BatchFailed:
+            return offline_result(task, notam)
+        if hit:
+            SEMANTIC_CACHE.put(task, notam, *hit)
+            return ai_result(task, notam, *hit)
+    return await asyncio.to_thread(run_ai, task, notam)
@@ -9,6 +9,7 @@
 from backend.utils.confidence_master import master_confidence
 from backend.utils.soft_merge import soft_merge
 from backend.utils.memory_engine import save_entry, get_all
+from backend.utils.models import segments_to_dicts
 
 def final_parser_pipeline(eline, fline, gline, qline, ai_payload):
     """
@@ -26,17 +27,17 @@ def final_parser_pipeline(eline, fline, gline, qline, ai_payload):
     merged = soft_merge(
         parser = {
             "text": "",   # parser text not implemented yet until Batch 8.6
-            "json": parsed["segments"],
-            "confidence": parsed["confidence"]
+            "json": parsed.segments,
+            "confidence": parsed.confidence
         },
         ai = ai_payload,
         memory = memory_snapshot
     )
 
     return {
-        "segments": merged["json"],
-        "fl": parsed["fl_info"],
-        "confidence": parsed["confidence"],
+        "segments": segments_to_dicts(merged["json"]),
+        "fl": parsed.fl_info.to_dict(),
+        "confidence": parsed.confidence,
         "source": merged["source"],
         "merged": merged["merged"],
         "text": merged["text"]
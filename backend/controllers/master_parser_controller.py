@@ -3,20 +3,29 @@
 # Full NOTAM → Output pipeline
 
 from backend.utils.normalize import normalize_notam
+import json
 from backend.controllers.ai_merge_controller import final_parser_pipeline
+from backend.utils.parse_cache import PARSE_CACHE
 
 def master_parser(notam_text, ai_payload):
     """
     notam_text: raw NOTAM string
     ai_payload: {text:"...", json:[...], source:"openai"} from ai_controller
+    Results are cached per NOTAM + AI payload (see parse_cache).
     """
+    extra = json.dumps(ai_payload, sort_keys=True, default=str)
+    return PARSE_CACHE.cached(
+        "master", notam_text, lambda: _master_parser(notam_text, ai_payload), extra
+    )
+
+def _master_parser(notam_text, ai_payload):
 
     cleaned, sections = normalize_notam(notam_text)
 
-    eline = sections.get("E","")
-    fline = sections.get("F","")
-    gline = sections.get("G","")
-    qline = sections.get("Q","")
+    eline = sections.e
+    fline = sections.f
+    gline = sections.g
+    qline = sections.q
 
     result = final_parser_pipeline(
         eline=eline,
@@ -28,6 +37,6 @@ def master_parser(notam_text, ai_payload):
 
     return {
         "cleaned": cleaned,
-        "sections": sections,
+        "sections": sections.to_dict(),
         "final": result
     }
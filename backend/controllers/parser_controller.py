@@ -1,8 +1,9 @@
 
 # Batch 7A - Parser Controller (Medium Skeleton)
 
-from backend.utils import parser_logic, fl_utils, similarity, confidence, memory_engine
-from backend.utils.fix_validator import validate_fix
+from backend.utils.confidence_master import build_parsed_notam
+from backend.utils.models import segments_to_dicts
+from backend.utils.parse_cache import PARSE_CACHE
 
 """
 This module will handle the full NOTAM parsing pipeline.
@@ -19,25 +20,22 @@ STAGES (to be implemented in Batch 7B–7E):
 9. Format hybrid response
 """
 
-def process_notam(notam_text: str):
-    # --- Stage 1: Clean input (Placeholder)
-    cleaned = parser_logic.clean_notam(notam_text)
-
-    # --- Stage 2: Extract raw segments (Placeholder)
-    raw_segments = parser_logic.extract_segments(cleaned)
+def parsed_notam(notam_text: str):
+    """The ParsedNotam behind process_notam (cached; treat as read-only)."""
+    return PARSE_CACHE.cached("parsed", notam_text, lambda: build_parsed_notam(notam_text))
 
-    # --- Stage 3: Extract FL (Placeholder)
-    fl_bounds = fl_utils.extract_fl(cleaned)
+def process_notam(notam_text: str):
+    return PARSE_CACHE.cached("process", notam_text, lambda: _process_notam(notam_text))
 
-    # --- Stage 4: Validate fixes (Placeholder)
-    validated = [seg for seg in raw_segments]
+def _process_notam(notam_text: str):
+    # --- Stages 1–6: normalize → FL engine (once) → segments → confidence
+    parsed = parsed_notam(notam_text)
 
-    # --- Stage 5: Confidence (Placeholder)
-    conf = confidence.evaluate(validated, fl_bounds)
+    lines = [f"{s.route} {s.segment} {s.fl}" for s in parsed.segments]
 
     return {
-        "text": "PARSER_CONTROLLER_SKELETON",
-        "json": [],
-        "confidence": conf,
+        "text": "\n".join(lines),
+        "json": segments_to_dicts(parsed.segments),
+        "confidence": parsed.confidence,
         "source": "parser"
     }
@@ -0,0 +1,23 @@
+# backend/gunicorn_conf.py
+# Pre-fork multi-worker mode (the Docker CMD):
+#   gunicorn -c backend/gunicorn_conf.py backend.app:app
+# The master imports the app and builds the corpus layer and memory
+# indexes once (shared_store.prefork_warm); forked workers share those
+# pages copy-on-write. Store writes go through shared_store's single-writer
+# lock and workers catch up via the store generation counter.
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+
+def when_ready(server):
+    # runs in the master after the app is preloaded, before any fork
+    from backend.utils.shared_store import prefork_warm
+
+    stats = prefork_warm()
+    server.log.info("prefork warm: %d objects frozen, %d memory entries indexed",
+                    stats["frozen"], stats["memory_index"]["entries"])
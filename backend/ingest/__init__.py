@@ -0,0 +1 @@
+# auto-generated
@@ -0,0 +1,49 @@
+
+# Batch 10.5 — Ingestion CLI
+# python -m backend.ingest --source tail:feed.txt --sink ndjson:out.ndjson
+
+import argparse
+import asyncio
+import json
+import signal
+
+from backend.ingest.pipeline import IngestPipeline, DEFAULT_WORKERS, DEFAULT_QUEUE_SIZE
+from backend.ingest.sinks import sink_from_spec
+from backend.ingest.sources import source_from_spec
+
+
+async def _run(pipeline):
+    # Ctrl-C / SIGTERM: flush the pending record and drain, then exit
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, pipeline.stop)
+        except (NotImplementedError, RuntimeError):  # Windows
+            pass
+    return await pipeline.run()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Stream NOTAMs through the parser pipeline.")
+    ap.add_argument("--source", default="stdin",
+                    help="tail:PATH | dir:PATH | stdin | socket:HOST:PORT")
+    ap.add_argument("--sink", default="ndjson:ingest_output.ndjson",
+                    help="ndjson:PATH | memory[:MIN_CONFIDENCE] | index")
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    ap.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE)
+    ap.add_argument("--once", action="store_true",
+                    help="stop at end of file/directory instead of following")
+    args = ap.parse_args(argv)
+
+    pipeline = IngestPipeline(
+        source_from_spec(args.source, follow=not args.once),
+        sink_from_spec(args.sink),
+        workers=args.workers,
+        queue_size=args.queue_size,
+    )
+    stats = asyncio.run(_run(pipeline))
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
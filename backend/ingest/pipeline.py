@@ -0,0 +1,172 @@
+
+# Batch 10.5 — Streaming Ingestion Pipeline
+# reader → normalize → parse (N workers) → merge/confidence → sink
+# Stages are joined by bounded asyncio queues: a slow sink stalls the
+# parsers, which stall the reader, instead of buffering without limit.
+# A record failing in any stage is counted in stats["errors"] and skipped.
+
+import asyncio
+import os
+import time
+from typing import Any, Dict
+
+from backend.utils.normalize import normalize_notam
+from backend.utils.route_extract import process_eline
+from backend.utils.confidence import evaluate
+from backend.utils.fl_engine import fl_for
+from backend.utils.models import ParsedNotam
+
+DEFAULT_WORKERS = int(os.getenv("INGEST_WORKERS", "4"))
+DEFAULT_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "100"))
+
+_DONE = object()
+
+
+def normalize_stage(raw):
+    cleaned, sections = normalize_notam(raw)
+    return ParsedNotam(cleaned=cleaned, sections=sections)
+
+
+def parse_stage(parsed):
+    s = parsed.sections
+    parsed.segments, _ = process_eline(s.e, s.f, s.g, s.q, fl_for(parsed))
+    return parsed
+
+
+def confidence_stage(parsed):
+    parsed.confidence = evaluate(parsed.segments, parsed.fl_info)
+    return parsed
+
+
+class IngestPipeline:
+    """
+    Wire a source (async iterable of raw NOTAM texts) to a sink.
+    `workers` parse stages run concurrently in threads.
+    """
+
+    def __init__(self, source, sink, workers: int = DEFAULT_WORKERS,
+                 queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.source = source
+        self.sink = sink
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.stats: Dict[str, Any] = {
+            "read": 0, "parsed": 0, "written": 0, "errors": 0, "elapsed": 0.0,
+        }
+        self._reader_task = None
+        self._stopping = False
+
+    def stop(self) -> None:
+        """
+        Finish early (SIGINT/SIGTERM): a source with stop() flushes its
+        pending record first; otherwise reading ends now. Records already
+        read still drain to the sink.
+        """
+        stop = getattr(self.source, "stop", None)
+        if stop is not None and not self._stopping:
+            stop()
+        elif self._reader_task is not None:
+            self._reader_task.cancel()
+        self._stopping = True
+
+    async def _reader(self, out_q):
+        try:
+            async for raw in self.source:
+                try:
+                    if not (raw and raw.strip()):
+                        continue
+                except Exception:
+                    self.stats["errors"] += 1
+                    continue
+                self.stats["read"] += 1
+                await out_q.put(raw)
+        except asyncio.CancelledError:
+            pass  # stop(): end of input
+        except Exception:
+            self.stats["errors"] += 1  # the source itself broke: end of input
+        finally:
+            await out_q.put(_DONE)
+
+    async def _normalizer(self, in_q, out_q):
+        while True:
+            raw = await in_q.get()
+            if raw is _DONE:
+                break
+            try:
+                parsed = normalize_stage(raw)
+            except Exception:
+                self.stats["errors"] += 1
+                continue
+            await out_q.put((raw, parsed))
+        for _ in range(self.workers):
+            await out_q.put(_DONE)
+
+    async def _parser(self, in_q, out_q):
+        while True:
+            item = await in_q.get()
+            if item is _DONE:
+                break
+            raw, parsed = item
+            try:
+                parsed = await asyncio.to_thread(parse_stage, parsed)
+            except Exception:
+                self.stats["errors"] += 1
+                continue
+            self.stats["parsed"] += 1
+            await out_q.put((raw, parsed))
+        await out_q.put(_DONE)
+
+    async def _merger(self, in_q, out_q):
+        finished = 0
+        while finished < self.workers:
+            item = await in_q.get()
+            if item is _DONE:
+                finished += 1
+                continue
+            raw, parsed = item
+            try:
+                parsed = confidence_stage(parsed)
+            except Exception:
+                self.stats["errors"] += 1
+                continue
+            await out_q.put((raw, parsed))
+        await out_q.put(_DONE)
+
+    async def _writer(self, in_q):
+        try:
+            while True:
+                item = await in_q.get()
+                if item is _DONE:
+                    break
+                raw, parsed = item
+                try:
+                    await self.sink.write(raw, parsed)
+                    self.stats["written"] += 1
+                except Exception:
+                    self.stats["errors"] += 1
+        finally:
+            await self.sink.close()
+
+    async def run(self) -> Dict[str, Any]:
+        """Run until the source is exhausted; returns stage counters."""
+        start = time.perf_counter()
+        raw_q = asyncio.Queue(self.queue_size)
+        norm_q = asyncio.Queue(self.queue_size)
+        parsed_q = asyncio.Queue(self.queue_size)
+        out_q = asyncio.Queue(self.queue_size)
+
+        self._reader_task = asyncio.create_task(self._reader(raw_q))
+        tasks = [
+            self._reader_task,
+            asyncio.create_task(self._normalizer(raw_q, norm_q)),
+            *[asyncio.create_task(self._parser(norm_q, parsed_q)) for _ in range(self.workers)],
+            asyncio.create_task(self._merger(parsed_q, out_q)),
+            asyncio.create_task(self._writer(out_q)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for t in tasks:
+                t.cancel()
+        self.stats["elapsed"] = round(time.perf_counter() - start, 4)
+        return self.stats
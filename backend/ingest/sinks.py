@@ -0,0 +1,132 @@
+
+# Batch 10.5 — Ingestion Sinks
+# Where parsed NOTAMs end up. Every sink exposes async write()/close().
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.utils import memory_engine
+from backend.utils import notam_store
+
+MEMORY_SINK_BATCH = int(os.getenv("INGEST_MEMORY_BATCH", "100"))
+MEMORY_SINK_MAX_WAIT = float(os.getenv("INGEST_MEMORY_MAX_WAIT", "1.0"))
+
+
+class NDJSONSink:
+    """One JSON object per line: {"notam": raw, "parsed": {...}}."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._fh = None
+
+    async def write(self, raw, parsed):
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.path.open("a", encoding="utf-8")
+        line = json.dumps({"notam": raw, "parsed": parsed.to_dict()}, ensure_ascii=False)
+        self._fh.write(line + "\n")
+
+    async def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class MemorySink:
+    """
+    Persist results into the memory store (memory_engine), one
+    append_entries transaction per `batch_size` records instead of a
+    store rewrite per record. A partial batch is written after
+    `max_wait` seconds and on close().
+    """
+
+    def __init__(self, min_confidence: float = 0.0, batch_size: int = MEMORY_SINK_BATCH,
+                 max_wait: float = MEMORY_SINK_MAX_WAIT):
+        self.min_confidence = min_confidence
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+        self._pending: List[Dict[str, Any]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock = asyncio.Lock()
+        self._tasks = set()
+
+    async def write(self, raw, parsed):
+        if parsed.confidence < self.min_confidence:
+            return
+        d = parsed.to_dict()
+        aviation = {
+            "segments": d["segments"],
+            "fl_info": d["fl_info"],
+            "confidence": d["confidence"],
+        }
+        self._pending.append({"notam": raw, "aviation": aviation})
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        elif self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.max_wait, self._flush_later)
+
+    def _flush_later(self) -> None:
+        self._timer = None
+        task = asyncio.get_running_loop().create_task(self._timed_flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _timed_flush(self) -> None:
+        try:
+            await self.flush()
+        except Exception:
+            pass  # batch kept; the next write or close() retries it
+
+    async def flush(self) -> int:
+        """
+        Write the pending records in one transaction; returns how many.
+        On failure they stay pending and the error propagates.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if batch:
+                try:
+                    await asyncio.to_thread(memory_engine.append_entries, batch)
+                except Exception:
+                    self._pending[:0] = batch
+                    raise
+            return len(batch)
+
+    async def close(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+        await self.flush()
+
+
+class IndexSink:
+    """Index each NOTAM (Q-line area, B/C/D validity, FL bands) for /notams queries."""
+
+    async def write(self, raw, parsed):
+        d = parsed.to_dict()
+        notam_store.index_notam(raw, value={"segments": d["segments"], "confidence": d["confidence"]},
+                                parsed=parsed)
+
+    async def close(self):
+        pass
+
+
+def sink_from_spec(spec: str):
+    """
+    CLI helper:
+      ndjson:PATH | memory[:MIN_CONFIDENCE] | index
+    """
+    kind, _, arg = spec.partition(":")
+    if kind == "ndjson":
+        return NDJSONSink(arg)
+    if kind == "memory":
+        return MemorySink(float(arg) if arg else 0.0)
+    if kind in ("index", "spatial"):
+        return IndexSink()
+    raise ValueError(f"Unknown sink '{spec}'")
@@ -0,0 +1,245 @@
+
+# Batch 10.5 — Ingestion Sources
+# Async generators of raw NOTAM texts for the ingestion pipeline.
+# Records are separated by blank lines; a line holding a JSON object
+# ({"notam": "..."}) is a record on its own.
+
+import asyncio
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import AsyncIterator, Iterable, List, Optional
+
+
+class RecordSplitter:
+    """Feed lines, get complete NOTAM records back."""
+
+    def __init__(self):
+        self._buf: List[str] = []
+
+    def feed(self, line: str) -> List[str]:
+        out = []
+        s = line.rstrip("\r\n")
+        if s.lstrip().startswith("{"):
+            out.extend(self.flush())
+            try:
+                obj = json.loads(s)
+                text = obj.get("notam") if isinstance(obj, dict) else None
+                if text:
+                    out.append(str(text))
+            except ValueError:
+                pass
+            return out
+        if not s.strip():
+            return self.flush()
+        self._buf.append(s)
+        return out
+
+    def flush(self) -> List[str]:
+        if not self._buf:
+            return []
+        rec = "\n".join(self._buf)
+        self._buf = []
+        return [rec]
+
+
+def split_records(lines: Iterable[str]) -> List[str]:
+    sp = RecordSplitter()
+    out = []
+    for ln in lines:
+        out.extend(sp.feed(ln))
+    out.extend(sp.flush())
+    return out
+
+
+class FileTailSource:
+    """
+    Read a file and keep following it (like tail -f) when follow=True.
+    A record is emitted at its closing blank line; the last one at EOF
+    (follow=False) or after stop(), never while the writer is mid-record.
+    """
+
+    def __init__(self, path, follow: bool = True, poll: float = 0.5):
+        self.path = Path(path)
+        self.follow = follow
+        self.poll = poll
+        self._stopped = False
+
+    def stop(self) -> None:
+        """Stop following: the pending record is flushed, then iteration ends."""
+        self._stopped = True
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        sp = RecordSplitter()
+        partial = ""  # line still being written
+        with self.path.open("r", encoding="utf-8", errors="replace") as fh:
+            while True:
+                line = fh.readline()
+                if line:
+                    if self.follow and not line.endswith("\n"):
+                        partial += line
+                        continue
+                    for rec in sp.feed(partial + line):
+                        yield rec
+                    partial = ""
+                    continue
+                if not self.follow or self._stopped:
+                    break
+                await asyncio.sleep(self.poll)
+        for rec in (sp.feed(partial) if partial else []) + sp.flush():
+            yield rec
+
+
+class DirectorySource:
+    """
+    Directory drop: every new file is one batch of records.
+    Processed files are moved into a `done/` subdirectory.
+    """
+
+    def __init__(self, path, pattern: str = "*", follow: bool = True, poll: float = 1.0):
+        self.path = Path(path)
+        self.pattern = pattern
+        self.follow = follow
+        self.poll = poll
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        done = self.path / "done"
+        done.mkdir(parents=True, exist_ok=True)
+        while True:
+            files = sorted(p for p in self.path.glob(self.pattern) if p.is_file())
+            for f in files:
+                text = await asyncio.to_thread(f.read_text, "utf-8", "replace")
+                for rec in split_records(text.splitlines()):
+                    yield rec
+                f.replace(done / f.name)
+            if not self.follow:
+                break
+            await asyncio.sleep(self.poll)
+
+
+class StdinSource:
+    """
+    Records piped on standard input. Lines are read on a daemon thread,
+    so stop() or cancellation ends iteration at once instead of waiting
+    for the next line (or EOF), and a blocked read never holds up exit.
+    """
+
+    def __init__(self, stream=None, queue_size: int = 100):
+        self.stream = stream or sys.stdin
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._stopped = False
+
+    def stop(self) -> None:
+        """Stop reading: the pending record is flushed, then iteration ends."""
+        self._stopped = True
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait(None)
+            except asyncio.QueueFull:
+                pass  # the iterator sees _stopped after its next line
+
+    @staticmethod
+    def _send(loop, queue, item):
+        coro = queue.put(item)
+        try:
+            return asyncio.run_coroutine_threadsafe(coro, loop)
+        except RuntimeError:  # loop closed: nobody is reading any more
+            coro.close()
+            return None
+
+    def _pump(self, loop, queue) -> None:
+        # runs on the reader thread; put() waits for room (back-pressure)
+        try:
+            for line in iter(self.stream.readline, ""):
+                fut = self._send(loop, queue, line)
+                if fut is None:
+                    return
+                fut.result()
+            item = None
+        except asyncio.CancelledError:  # loop shut down mid-put
+            return
+        except Exception as e:
+            item = e
+        self._send(loop, queue, item)
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        self._queue = queue = asyncio.Queue(self.queue_size)
+        threading.Thread(target=self._pump, args=(loop, queue),
+                         name="stdin-source", daemon=True).start()
+        sp = RecordSplitter()
+        while not self._stopped:
+            line = await queue.get()
+            if line is None:  # EOF or stop()
+                break
+            if isinstance(line, Exception):
+                raise line
+            for rec in sp.feed(line):
+                yield rec
+        for rec in sp.flush():
+            yield rec
+
+
+class SocketSource:
+    """
+    Local TCP stand-in for a NOTAM feed: every client connection streams
+    records. Stops after `max_connections` clients when set.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765,
+                 max_connections: Optional[int] = None, queue_size: int = 100):
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.queue_size = queue_size
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        remaining = self.max_connections
+
+        async def handle(reader, writer):
+            nonlocal remaining
+            sp = RecordSplitter()
+            try:
+                while True:
+                    raw = await reader.readline()
+                    if not raw:
+                        break
+                    for rec in sp.feed(raw.decode("utf-8", "replace")):
+                        await queue.put(rec)
+                for rec in sp.flush():
+                    await queue.put(rec)
+            finally:
+                writer.close()
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining <= 0:
+                        await queue.put(None)
+
+        server = await asyncio.start_server(handle, self.host, self.port)
+        async with server:
+            while True:
+                rec = await queue.get()
+                if rec is None:
+                    break
+                yield rec
+
+
+def source_from_spec(spec: str, follow: bool = True):
+    """
+    CLI helper:
+      tail:PATH | dir:PATH | stdin | socket:HOST:PORT
+    """
+    kind, _, arg = spec.partition(":")
+    if kind == "tail":
+        return FileTailSource(arg, follow=follow)
+    if kind == "dir":
+        return DirectorySource(arg, follow=follow)
+    if kind == "stdin":
+        return StdinSource()
+    if kind == "socket":
+        host, _, port = arg.rpartition(":")
+        return SocketSource(host or "127.0.0.1", int(port or 8765))
+    raise ValueError(f"Unknown source '{spec}'")
@@ -8,10 +8,12 @@ Unified FastAPI backend for:
 - Merging + confidence
 """
 
-import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+# Shared provider clients (built once, closed on shutdown)
+from backend.ai_providers.resources import lifespan
+
 # Routers
 from backend.routers.ai import router as ai_router
 from backend.routers.parser import router as parser_router
@@ -21,13 +23,14 @@ from backend.routers.memory import router as memory_router
 from backend.ai.fallback_chain import intelligent_fallback
 
 # Utilities
-from backend.utils.normalize import normalize_notam_full
+from backend.utils.normalize import clean_raw_notam
 
 
 app = FastAPI(
     title="One Stop Solution – NOTAM AI Engine",
     version="1.0.0",
-    description="Flightscape full AI + Parser unified NOTAM decoding engine"
+    description="Flightscape full AI + Parser unified NOTAM decoding engine",
+    lifespan=lifespan
 )
 
 # -----------------------------------------------------
@@ -60,15 +63,15 @@ async def process_notam(payload: dict):
     Unified NOTAM processor endpoint.
     Steps:
     1. Normalize NOTAM (whitespace, case, line breaks)
-    2. Run fallback chain (AI + parser + memory)
+    2. Run fallback chain (parser-first unless payload "mode" says "ai-first")
     3. Return final merged version + confidence + sources
     """
     raw = payload.get("notam", "")
     if not raw:
         return {"error": "No NOTAM provided"}
 
-    clean = normalize_notam_full(raw)
-    result = await intelligent_fallback(clean)
+    clean = clean_raw_notam(raw)
+    result = await intelligent_fallback(clean, payload.get("mode"))
 
     return {
         "input": raw,
@@ -103,4 +106,6 @@ async def global_ex_handler(request: Request, exc: Exception):
 #  LOCAL DEVELOPMENT ENTRYPOINT
 # -----------------------------------------------------
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
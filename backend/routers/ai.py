@@ -1,7 +1,17 @@
+import json
+import time
+
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from backend.ai_providers.openai_client import generate_openai
-from backend.ai_providers.copilot_client import generate_copilot
+from backend.ai_providers.registry import get_provider
+from backend.ai_providers.health import HEALTH
+from backend.ai_providers.limits import limits_snapshot
+from backend.ai_providers.streaming import stream_with_fallback
+from backend.ai.fallback_chain import gate_stats
+from backend.ai.prompt_compact import compact_notam, max_tokens_for, record_answer
+from backend.utils.metrics import METRICS
+from backend.utils.semantic_cache import SEMANTIC_CACHE
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
@@ -31,23 +41,21 @@ def offline_model(prompt: str):
 # FALLBACK CHAIN: OpenAI → Copilot → Offline
 # ===============================================================
 
-def ai_fallback(prompt: str):
+PROVIDER_LABELS = {"openai": "OpenAI", "copilot": "Copilot"}
+# Display label → provider name; the semantic cache is shared with
+# controllers.ai_controller and stores the name ("openai"), not the label.
+PROVIDER_NAMES = {label: name for name, label in PROVIDER_LABELS.items()}
 
-    # TRY OPENAI
-    try:
-        out = generate_openai(prompt)
-        if out and len(out.strip()) > 0:
-            return out, "OpenAI"
-    except Exception:
-        pass
+def ai_fallback(prompt: str, max_tokens: int = None):
 
-    # TRY COPILOT
-    try:
-        out = generate_copilot(prompt)
+    # TRY OPENAI / COPILOT — fastest healthy first, open breakers skipped
+    for name in HEALTH.order(PROVIDER_LABELS):
+        try:
+            out = HEALTH.call(name, get_provider(name), prompt, max_tokens)
+        except Exception:
+            out = None
         if out and len(out.strip()) > 0:
-            return out, "Copilot"
-    except Exception:
-        pass
+            return out, PROVIDER_LABELS[name]
 
     # OFFLINE FALLBACK
     try:
@@ -68,26 +76,148 @@ def ai_auto(data: NOTAMInput):
     return {"output": output, "provider": provider}
 
 
+TASK_PROMPTS = {
+    "explain": "Explain this NOTAM in clear language:\n\n{notam}",
+    "simplify": "Simplify this NOTAM without losing essential information:\n\n{notam}",
+    "risk": (
+        "Assess the operational risk of the following NOTAM and return "
+        "risk level and reasons:\n\n"
+        "{notam}"
+    ),
+}
+
+
+def task_prompt(task: str, notam: str):
+    """Compact prompt (only the fields the task reads) + its answer budget."""
+    return TASK_PROMPTS[task].format(notam=compact_notam(task, notam)), max_tokens_for(task, notam)
+
+
+def task_fallback(task: str, notam: str):
+    """Semantic cache (near-duplicate NOTAMs) → ai_fallback; provider answers are cached."""
+    hit = SEMANTIC_CACHE.lookup(task, notam)
+    if hit:
+        return hit.value, "Semantic-Cache"
+    output, provider = ai_fallback(*task_prompt(task, notam))
+    if provider in PROVIDER_NAMES:
+        record_answer(task, notam, output)
+        SEMANTIC_CACHE.put(task, notam, output, PROVIDER_NAMES[provider])
+    return output, provider
+
+
 @router.post("/explain")
 def ai_explain(data: NOTAMInput):
-    prompt = f"Explain this NOTAM in clear language:\n\n{data.notam}"
-    output, provider = ai_fallback(prompt)
+    output, provider = task_fallback("explain", data.notam)
     return {"output": output, "provider": provider}
 
 
 @router.post("/simplify")
 def ai_simplify(data: NOTAMInput):
-    prompt = f"Simplify this NOTAM without losing essential information:\n\n{data.notam}"
-    output, provider = ai_fallback(prompt)
+    output, provider = task_fallback("simplify", data.notam)
     return {"output": output, "provider": provider}
 
 
 @router.post("/risk")
 def ai_risk(data: NOTAMInput):
-    prompt = (
-        "Assess the operational risk of the following NOTAM and return "
-        "risk level and reasons:\n\n"
-        f"{data.notam}"
-    )
-    output, provider = ai_fallback(prompt)
+    output, provider = task_fallback("risk", data.notam)
     return {"output": output, "provider": provider}
+
+
+# ===============================================================
+# STREAMING (SSE) VARIANTS
+#   event: provider  {"provider": "OpenAI"}
+#   data:            {"token": "..."}            (repeated)
+#   event: done      {"provider": ..., "ttft_ms": ...}
+# ===============================================================
+
+def _sse(data: dict, event: str = None) -> str:
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def sse_fallback(prompt: str, max_tokens: int = None, cache_key: tuple = None):
+    """
+    Relay the first provider that starts streaming; offline model otherwise.
+    cache_key=(task, notam): serve a near-duplicate's answer, cache new ones.
+    """
+    start = time.monotonic()
+    if cache_key:
+        hit = SEMANTIC_CACHE.lookup(*cache_key)
+        if hit:
+            yield _sse({"provider": "Semantic-Cache"}, "provider")
+            yield _sse({"token": hit.value})
+            yield _sse({"provider": "Semantic-Cache", "ttft_ms": round((time.monotonic() - start) * 1000, 1)}, "done")
+            return
+
+    provider, ttft, tokens = "Offline-Model", None, []
+    try:
+        async for kind, value in stream_with_fallback(prompt, PROVIDER_LABELS, max_tokens=max_tokens):
+            if kind == "provider":
+                provider = PROVIDER_LABELS[value]
+                ttft = round((time.monotonic() - start) * 1000, 1)
+                yield _sse({"provider": provider}, "provider")
+            else:
+                tokens.append(value)
+                yield _sse({"token": value})
+    except Exception as e:
+        yield _sse({"provider": provider, "error": str(e)}, "error")
+        return
+
+    if ttft is None:
+        yield _sse({"provider": provider}, "provider")
+        yield _sse({"token": offline_model(prompt)})
+    elif cache_key:
+        SEMANTIC_CACHE.put(*cache_key, "".join(tokens), PROVIDER_NAMES[provider])
+    yield _sse({"provider": provider, "ttft_ms": ttft}, "done")
+
+
+def _stream(task: str, data: NOTAMInput) -> StreamingResponse:
+    return StreamingResponse(
+        sse_fallback(*task_prompt(task, data.notam), cache_key=(task, data.notam)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/explain/stream")
+def ai_explain_stream(data: NOTAMInput):
+    return _stream("explain", data)
+
+
+@router.post("/simplify/stream")
+def ai_simplify_stream(data: NOTAMInput):
+    return _stream("simplify", data)
+
+
+@router.post("/risk/stream")
+def ai_risk_stream(data: NOTAMInput):
+    return _stream("risk", data)
+
+
+@router.get("/health")
+def ai_health():
+    """Circuit-breaker state, EWMA latency and error rate per provider."""
+    return HEALTH.snapshot()
+
+
+@router.get("/metrics")
+def ai_metrics():
+    """Counters and summaries (time-to-first-token, batch sizes, gate hits)."""
+    return METRICS.snapshot()
+
+
+@router.get("/semantic-cache")
+def ai_semantic_cache():
+    """Near-duplicate answer reuse: size, hit rate, entries scored per lookup."""
+    return SEMANTIC_CACHE.stats()
+
+
+@router.get("/limits")
+def ai_limits():
+    """Token buckets and AIMD concurrency limit per provider."""
+    return limits_snapshot()
+
+
+@router.get("/gate-stats")
+def ai_gate_stats():
+    """How many /process-notam requests the parser answered without an LLM."""
+    return gate_stats()
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
 from backend.utils.parser_logic import parse_notam_advanced
+from backend.utils.parse_cache import PARSE_CACHE
 
 router = APIRouter(prefix="/parse", tags=["Parser"])
 
@@ -15,3 +16,8 @@ def parse_route(data: NOTAMInput):
         return {"output": output}
     except Exception as e:
         return {"error": f"Parser error: {str(e)}"}
+
+@router.get("/cache-stats")
+def parse_cache_stats():
+    """Hit-rate and size of the parse-result cache"""
+    return PARSE_CACHE.stats()
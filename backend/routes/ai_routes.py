@@ -2,7 +2,8 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Any, Dict, Optional
-from backend.controllers.ai_controller import run_ai
+from backend.controllers.ai_controller import run_ai_batched
+from backend.ai_providers.health import HEALTH
 
 router = APIRouter()
 
@@ -23,8 +24,9 @@ async def _call(action: str, payload: Dict[str, Any]) -> AIResponse:
     """
     try:
         notam_text = (payload.get("notam") or "").strip()
-        # run_ai returns raw result (string or structured JSON) depending on implementation
-        result = run_ai(action, notam_text)
+        # run_ai returns raw result (string or structured JSON) depending on implementation;
+        # the batched variant shares one LLM call with concurrent requests
+        result = await run_ai_batched(action, notam_text)
         return AIResponse(status="ok", result=result)
     except Exception as exc:
         # Catch and surface controller errors as 500 with message
@@ -61,3 +63,11 @@ async def ai_super(data: AIRequest):
     A combined/advanced AI operation (super).
     """
     return await _call("super", data.dict())
+
+
+@router.get("/ai-health")
+async def ai_health():
+    """
+    Circuit-breaker state and EWMA latency / error rate per AI provider.
+    """
+    return AIResponse(status="ok", result=HEALTH.snapshot())
@@ -1,8 +1,16 @@
 # backend/routes/memory_routes.py
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+import zlib
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
 from pydantic import BaseModel
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from backend.utils import memory_engine
+from backend.utils.corpus_memory import CORPUS_MEMORY
+from backend.utils.memory_index import MEMORY_INDEX
+from backend.utils.memory_import import MemoryImporter, IMPORT_BATCH
 
 router = APIRouter()
 
@@ -11,8 +19,41 @@ class MemorySaveRequest(BaseModel):
     aviation: Dict[str, Any] | None = None
 
 @router.get("/memory/get")
-async def get_memory():
-    return memory_engine.get_all()
+async def get_memory(cursor: Optional[str] = None, limit: int = memory_engine.DEFAULT_PAGE_SIZE):
+    """
+    Entries one page at a time: pass next_cursor back as `cursor` until it
+    is null. Use /memory/export to dump the whole store.
+    """
+    try:
+        return await asyncio.to_thread(memory_engine.page_memory_entries, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Bad cursor '{cursor}'")
+
+
+def _ndjson(gzip: bool):
+    """Entries as NDJSON lines, optionally gzip-compressed on the fly."""
+    z = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    for entry in memory_engine.iter_memory_entries():
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        if z is None:
+            yield line
+        else:
+            out = z.compress(line)
+            if out:
+                yield out
+    if z is not None:
+        yield z.flush()
+
+
+@router.get("/memory/export")
+async def export_memory(gzip: bool = False):
+    """Stream every entry as NDJSON (gzip=true → memory.ndjson.gz), constant memory."""
+    name = "memory.ndjson.gz" if gzip else "memory.ndjson"
+    return StreamingResponse(
+        _ndjson(gzip),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{name}"'},
+    )
 
 @router.post("/memory/save")
 async def save_memory(data: MemorySaveRequest):
@@ -23,6 +64,40 @@ async def save_memory(data: MemorySaveRequest):
         raise HTTPException(status_code=400, detail=res["error"])
     return res
 
+@router.post("/memory/import")
+async def import_memory(request: Request, batch_size: int = IMPORT_BATCH, dedup: bool = True):
+    """
+    Bulk import from the raw request body: a JSON array, a memory store
+    dump or NDJSON (as written by /memory/export), optionally gzipped.
+    Parsed as it arrives and committed in batches of `batch_size`.
+    """
+    importer = MemoryImporter(batch_size=batch_size, dedup=dedup)
+    try:
+        async for chunk in request.stream():
+            await asyncio.to_thread(importer.feed_bytes, chunk)
+        return await asyncio.to_thread(importer.close)
+    except ClientDisconnect:
+        # upload cut off: keep what was parsed; nobody is left to answer
+        return await asyncio.to_thread(importer.commit)
+    except (ValueError, zlib.error) as e:
+        await asyncio.to_thread(importer.commit)  # keep what was parsed, announce it once
+        raise HTTPException(status_code=400, detail=f"Import stopped after {importer.imported} entries: {e}")
+
+@router.get("/memory/corpus")
+async def corpus_memory_stats():
+    """Warm-start layer built from the shipped corpus (read-only)."""
+    return CORPUS_MEMORY.stats()
+
+@router.get("/memory/index")
+async def memory_index_stats():
+    """Derived lookups over learned memory and their snapshot."""
+    return await asyncio.to_thread(MEMORY_INDEX.stats)
+
+@router.post("/memory/compact")
+async def compact_memory():
+    """Drop duplicate entries and write a fresh index snapshot."""
+    return await asyncio.to_thread(memory_engine.compact_memory)
+
 @router.post("/memory/clear")
 async def clear_memory():
     return memory_engine.clear_memory()
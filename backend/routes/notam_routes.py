@@ -0,0 +1,193 @@
+# backend/routes/notam_routes.py
+import time
+from datetime import datetime, timezone
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import List, Optional, Tuple
+from backend.utils import notam_store
+from backend.utils.fl_index import FL_INDEX
+from backend.utils.spatial_index import SPATIAL_INDEX
+from backend.utils.validity import VALIDITY_INDEX, parse_notam_time
+
+router = APIRouter()
+
+
+class IndexRequest(BaseModel):
+    notams: List[str]
+
+
+class CorridorRequest(BaseModel):
+    points: List[Tuple[float, float]]
+    width_nm: float = 10.0
+    at: Optional[str] = None
+
+
+class PlanLeg(BaseModel):
+    route: str
+    fl_lower: int
+    fl_upper: Optional[int] = None
+    fixes: List[str] = []
+
+
+class PlanCheckRequest(BaseModel):
+    legs: List[PlanLeg]
+    at: Optional[str] = None
+
+
+def _epoch(value: Optional[str]) -> float:
+    """YYMMDDHHMM (NOTAM style) or ISO-8601 (UTC if no offset); None → now."""
+    if not value:
+        return time.time()
+    dt = parse_notam_time(value)
+    if dt is None:
+        try:
+            dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Bad time '{value}'")
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _in_force(items, key, at: Optional[str] = None):
+    """
+    With `at`, keep only items of NOTAMs in force then (no B/C → kept).
+    Handlers call notam_store.sync_memory() before querying their index,
+    so NOTAMs saved to memory (by any worker) are already in `items`.
+    """
+    notam_store.evict_expired(lazy=True)
+    if not at:
+        return items
+    active = set(VALIDITY_INDEX.active_at(_epoch(at)))
+    return [i for i in items if key(i) in active or VALIDITY_INDEX.get(key(i)) is None]
+
+
+def _areas(areas, at: Optional[str] = None):
+    areas = _in_force(areas, lambda a: a.key, at)
+    return {"count": len(areas), "notams": [a.to_dict() for a in areas]}
+
+
+def _segments(segments, at: Optional[str] = None):
+    segments = _in_force(segments, lambda s: s.notam, at)
+    return {"count": len(segments), "segments": [s.to_dict() for s in segments]}
+
+
+@router.post("/notams/index")
+async def index_notams(data: IndexRequest):
+    """
+    Index NOTAMs by Q-line area, B/C/D validity and per-segment FL band.
+    NOTAMR/NOTAMC replace/cancel the NOTAM they reference. NOTAMs with
+    nothing to index, already expired or already superseded are skipped.
+    """
+    results = [notam_store.index_notam(n) for n in data.notams]
+    out = {"indexed": 0, "replaced": 0, "cancelled": 0, "skipped": 0, "ids": []}
+    for r in results:
+        if r is None or r["status"] == "superseded":
+            out["skipped"] += 1
+            continue
+        out[r["status"]] += 1
+        if r["status"] != "cancelled":
+            out["ids"].append(r["id"])
+    return out
+
+
+@router.get("/notams/area/point")
+async def notams_at_point(lat: float, lon: float, at: Optional[str] = None):
+    """NOTAM areas containing a position, nearest centre first."""
+    notam_store.sync_memory()
+    return _areas(SPATIAL_INDEX.query_point(lat, lon), at)
+
+
+@router.get("/notams/area/bbox")
+async def notams_in_bbox(south: float, west: float, north: float, east: float, at: Optional[str] = None):
+    """NOTAM areas intersecting a box (west > east crosses 180°)."""
+    notam_store.sync_memory()
+    return _areas(SPATIAL_INDEX.query_bbox(south, west, north, east), at)
+
+
+@router.post("/notams/area/corridor")
+async def notams_in_corridor(data: CorridorRequest):
+    """NOTAM areas within width_nm of a route given as [lat, lon] points."""
+    if not data.points:
+        raise HTTPException(status_code=400, detail="points must not be empty")
+    notam_store.sync_memory()
+    return _areas(SPATIAL_INDEX.query_corridor(data.points, data.width_nm), data.at)
+
+
+@router.get("/notams/area/stats")
+async def notams_area_stats():
+    return SPATIAL_INDEX.stats()
+
+
+@router.get("/notams/fl")
+async def notams_fl(fl: Optional[int] = None, lower: Optional[int] = None, upper: Optional[int] = None,
+                    route: Optional[str] = None, fix: Optional[str] = None, at: Optional[str] = None):
+    """
+    Closed segments at flight level `fl`, or overlapping [lower, upper],
+    optionally on `route` and/or touching `fix`.
+    """
+    if fl is None and lower is None:
+        raise HTTPException(status_code=400, detail="fl or lower/upper required")
+    lo = fl if fl is not None else lower
+    hi = fl if fl is not None else (upper if upper is not None else lower)
+    notam_store.sync_memory()
+    return _segments(FL_INDEX.query(lo, hi, route=route, fix=fix), at)
+
+
+@router.post("/notams/check")
+async def notams_check_plan(data: PlanCheckRequest):
+    """
+    Flight-plan check: closures on each leg's route overlapping its FL band
+    (touching one of `fixes` when given).
+    """
+    notam_store.sync_memory()
+    legs = []
+    for leg in data.legs:
+        hits = FL_INDEX.query(leg.fl_lower, leg.fl_upper, route=leg.route)
+        if leg.fixes:
+            fixes = {f.upper() for f in leg.fixes}
+            hits = [s for s in hits if s.from_fix in fixes or s.to_fix in fixes]
+        legs.append({"leg": leg.dict(), **_segments(hits, data.at)})
+    return {"conflicts": sum(l["count"] for l in legs), "legs": legs}
+
+
+@router.get("/notams/query")
+async def notams_query(route: Optional[str] = None, fix: Optional[str] = None, fir: Optional[str] = None,
+                       id: Optional[str] = None, at: Optional[str] = None, active: bool = False,
+                       offset: int = 0, limit: int = notam_store.DEFAULT_PAGE_SIZE):
+    """
+    Closed segments by route designator, fix, FIR and/or NOTAM id, paginated
+    (offset/limit, next_offset). `at` or active=true: only NOTAMs in force.
+    """
+    t = _epoch(at) if at or active else None
+    return notam_store.query(route=route, fix=fix, fir=fir, notam_id=id, at=t, offset=offset, limit=limit)
+
+
+@router.get("/notams/get")
+async def notams_get(id: str):
+    """One indexed NOTAM: text, FIR, segments and validity."""
+    notam_store.sync_memory()
+    rec = notam_store.get(id.strip()) or notam_store.get(id.strip().upper())
+    if rec is None:
+        raise HTTPException(status_code=404, detail=f"NOTAM '{id}' not indexed")
+    return rec.to_dict()
+
+
+@router.get("/notams/active")
+async def notams_active(at: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None):
+    """
+    NOTAMs in force at `at` (default now), or at any moment of [start, end].
+    Times: YYMMDDHHMM or ISO-8601.
+    """
+    notam_store.sync_memory()
+    notam_store.evict_expired(lazy=True)
+    if start or end:
+        ids = VALIDITY_INDEX.active_during(_epoch(start), _epoch(end))
+    else:
+        ids = VALIDITY_INDEX.active_at(_epoch(at))
+    return {"count": len(ids), "ids": ids}
+
+
+@router.get("/notams/stats")
+async def notams_stats():
+    return notam_store.stats()
@@ -3,6 +3,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Any, Dict, Optional
 from backend.controllers.parser_controller import process_notam
+from backend.utils.parse_cache import PARSE_CACHE
 
 router = APIRouter()
 
@@ -80,3 +81,11 @@ async def process_notam_alias(data: ParseRequest):
         return _normalize_result(result)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
+
+
+@router.get("/parse/cache-stats")
+async def parse_cache_stats():
+    """
+    Hit-rate and size of the parse-result cache.
+    """
+    return PARSE_CACHE.stats()
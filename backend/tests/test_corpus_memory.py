@@ -0,0 +1,63 @@
+import os
+
+from backend.utils import corpus_memory, memory_engine
+from backend.utils.corpus_memory import CorpusMemory
+from backend.utils.similarity import find_similar_memory
+
+DNH = """A2625/25 NOTAMN
+Q)ZLHW/QARLT/IV/NBO/E/000/341/3938N09334E069
+A)ZLHW B)2508120100 C)2508120600
+E)SEGMENT TUSLI - DUNHUANG VOR'DNH' OF ATS RTE W187 CLSD AT
+10,400M AND BELOW.
+FROM GND TO FL341"""
+
+CORPUS = f"""i/p:\r\n{DNH}\r\n\r\nO/P: \r\nW187 TUSLI-DNH FL000-FL341\r\n
+i/p:
+
+O/P:
+
+i/p:
+A0310/25 NOTAMN
+E)AWY L604 BRN/DANAD.
+
+O/P:
+L604 BRN-DANAD GND-FL500
+"""
+
+
+def _layer(tmp_path, text=CORPUS):
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text(text, encoding="utf-8")
+    return CorpusMemory(corpus, tmp_path / "corpus.snapshot")
+
+
+def test_corpus_builds_then_loads_snapshot(tmp_path):
+    layer = _layer(tmp_path)
+    assert layer.stats()["source"] == "corpus"
+    assert layer.stats()["entries"] == 2  # the empty pair is skipped
+    assert layer.lookup_fix("dunhuang") == "DNH"
+    assert layer.segments_of("L604") == [["BRN", "DANAD"]]
+    assert layer.entry_for_fix("DANAD")["aviation"]["segments"][0]["fl"] == "GND-FL500"
+
+    again = CorpusMemory(layer.corpus, layer.snapshot)
+    assert again.stats()["source"] == "snapshot" and again.lookup_fix("DUNHUANG") == "DNH"
+
+    # an edited corpus invalidates the snapshot
+    layer.corpus.write_text(CORPUS.split("i/p:\n\nO/P:")[0], encoding="utf-8")
+    os.utime(layer.corpus, ns=(0, 1))
+    rebuilt = CorpusMemory(layer.corpus, layer.snapshot).stats()
+    assert rebuilt["source"] == "corpus" and rebuilt["entries"] == 1
+
+
+def test_memory_falls_back_to_corpus(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    monkeypatch.setattr(corpus_memory, "CORPUS_MEMORY", _layer(tmp_path))
+
+    assert memory_engine.memory_lookup("DUNHUANG") == "DNH"
+    memory_engine.learn_fix("DUNHUANG", "DNX")
+    assert memory_engine.memory_lookup("DUNHUANG") == "DNX"  # learned wins
+    assert memory_engine.memory_lookup_fix("BRN")["source"] == "corpus"
+    assert find_similar_memory(DNH) == "W187 TUSLI-DNH FL000-FL341"
+
+    monkeypatch.setattr(corpus_memory, "WARM_START", False)
+    assert find_similar_memory(DNH) is None
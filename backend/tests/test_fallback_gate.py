@@ -0,0 +1,62 @@
+import asyncio
+
+from backend.ai import fallback_chain
+from backend.utils.metrics import METRICS
+from backend.utils.semantic_cache import SEMANTIC_CACHE
+
+STRONG = "E)ATS RTE A810 SEGMENT RINOP-AGINO CLSD. FROM FL095 TO FL230"
+WEAK = "E)RWY 09/27 CLSD DUE WIP"
+
+
+def _run(monkeypatch, text, mode):
+    calls = []
+
+    async def provider(name, prompt, max_tokens=None, json_schema=None):
+        calls.append(name)
+        return "ai answer"
+
+    SEMANTIC_CACHE.clear()
+    monkeypatch.setattr(fallback_chain, "call_provider", provider)
+    monkeypatch.setattr(fallback_chain, "memory_learn", lambda *a, **k: None)
+    return asyncio.run(fallback_chain.intelligent_fallback(text, mode)), calls
+
+
+def test_parser_first_skips_llm_when_confident(monkeypatch):
+    METRICS.reset()
+    result, calls = _run(monkeypatch, STRONG, "parser-first")
+    assert calls == [] and result["sources"] == ["parser"]
+    assert result["output"]["json"][0]["route"] == "A810"
+
+    result, calls = _run(monkeypatch, WEAK, "parser-first")
+    assert calls and "parser" in result["sources"]
+    assert result["output"]["text"] == "ai answer"
+
+    stats = fallback_chain.gate_stats()["modes"]["parser-first"]
+    assert stats["requests"] == 2 and stats["avoided_fraction"] == 0.5
+
+
+def test_ai_first_always_calls_provider(monkeypatch):
+    METRICS.reset()
+    result, calls = _run(monkeypatch, STRONG, "ai-first")
+    assert calls and result["output"]["source"] == "parser-strong"
+    assert fallback_chain.gate_stats()["modes"]["ai-first"]["llm_avoided"] == 0
+
+
+def test_batch_miss_falls_back_to_single_call(monkeypatch):
+    async def missing(notam):
+        return None  # batch answer had no entry for this NOTAM
+
+    monkeypatch.setattr(fallback_chain, "BATCHING_ENABLED", True)
+    monkeypatch.setattr(fallback_chain.FALLBACK_BATCHER, "submit", missing)
+    result, calls = _run(monkeypatch, WEAK, "ai-first")
+    assert calls and result["output"]["text"] == "ai answer"
+
+
+def test_failed_batch_is_not_retried_per_notam(monkeypatch):
+    async def failed(notam):
+        raise fallback_chain.BatchFailed("no provider answered")
+
+    monkeypatch.setattr(fallback_chain, "BATCHING_ENABLED", True)
+    monkeypatch.setattr(fallback_chain.FALLBACK_BATCHER, "submit", failed)
+    result, calls = _run(monkeypatch, WEAK, "ai-first")
+    assert calls == [] and "openai" not in result["sources"]
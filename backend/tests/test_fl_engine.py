@@ -0,0 +1,30 @@
+from backend.utils import fl_engine
+from backend.utils.models import ParsedNotam, Sections
+
+
+def test_rounding_policies():
+    # 10,400 m = 341.2 hundreds of feet
+    assert fl_engine.meters_to_fl(10400, "floor") == 341
+    assert fl_engine.meters_to_fl(10400, "ceil") == 342
+    assert fl_engine.meters_to_fl(10400, "round") == 341
+
+
+def test_inline_bands_single_scan():
+    bands = fl_engine.scan_inline_bands(
+        "SEGMENT TUSLI - DNH CLSD AT 10,400M AND BELOW. FROM GND TO FL341", "floor"
+    )
+    assert [(lo, hi) for _, _, lo, hi in bands] == [(0, 341), (0, 341)]
+    assert [b[2:] for b in fl_engine.scan_inline_bands("FL095/FL110")] == [(95, 110)]
+
+
+def test_priority_and_q_clamp():
+    band = fl_engine.compute_fl("UIII/QARLC/IV/NBO/E/095/230/", "SFC", "FL300", "")
+    assert (band.fl_lower, band.fl_upper_final) == (95, 230)
+    assert band.reason == "clamped-upper-to-q"
+
+
+def test_fl_for_caches_on_parsed_notam():
+    parsed = ParsedNotam(sections=Sections(q="X/E/045/130/", e="L736 NEDRA-GOMED FL045-FL130"))
+    first = fl_engine.fl_for(parsed)
+    assert fl_engine.fl_for(parsed) is first
+    assert first.label() == "FL045-FL130"
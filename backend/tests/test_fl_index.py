@@ -0,0 +1,39 @@
+from backend.utils import notam_store
+from backend.utils.fl_index import FLIndex, FL_INDEX
+from backend.utils.models import FLBand, Segment
+
+NOTAM = """A1234/25 NOTAMN
+Q)UUWV/QARLC/IV/NBO/E/045/130/5435N02024E028
+A)UUWV B)2508120000 C)2508172359
+E)ATS RTE CLSD: L736 NEDRA-GOMED, N5 KRD-GITOV.
+F)FL045 G)FL130"""
+
+
+def seg(route, a, b, lo, hi):
+    return Segment(route, a, b, band=FLBand(fl_lower=lo, fl_upper_final=hi))
+
+
+def test_band_overlap_by_route_and_fix():
+    idx = FLIndex()
+    idx.add("N1", [seg("W187", "TUSLI", "KARVI", 300, 360), seg("L736", "NEDRA", "GOMED", 45, 130)])
+    idx.add("N2", [seg("W187", "KARVI", "GITOV", 0, 290), Segment("W187", "X", "Y")])  # band-less skipped
+
+    assert [s.id for s in idx.query(350)] == ["N1#0"]
+    assert [s.id for s in idx.query(280, 310, route="w187")] == ["N2#0", "N1#0"]
+    assert [s.id for s in idx.query(290, route="W187")] == ["N2#0"]  # bands are inclusive
+    assert [s.id for s in idx.query(100, 400, fix="KARVI")] == ["N2#0", "N1#0"]
+    assert [s.id for s in idx.query(0, 999, route="W187", fix="TUSLI")] == ["N1#0"]
+    assert idx.query(140, route="L736") == [] and idx.query(0, route="UL1") == []
+
+    idx.add("N1", [seg("L736", "NEDRA", "GOMED", 200, 250)])  # re-issue replaces
+    assert idx.query(350) == [] and idx.stats() == {"segments": 2, "notams": 2, "routes": 2, "fixes": 4}
+    assert idx.remove("N2") and idx.query(0, 999, fix="KARVI") == []
+
+
+def test_store_indexes_parser_segments():
+    notam_store.clear()
+    res = notam_store.index_notam(NOTAM, now=0)
+    assert res["segments"] == 2
+    assert [s.to_dict()["segment"] for s in FL_INDEX.query(130, route="N5")] == ["KRD-GITOV"]
+    notam_store.drop("A1234/25")
+    assert len(FL_INDEX) == 0
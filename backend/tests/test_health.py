@@ -0,0 +1,136 @@
+import asyncio
+from types import SimpleNamespace
+
+from backend.ai_providers.health import CircuitBreaker, HealthTracker, OPEN, HALF_OPEN, CLOSED
+
+
+def test_breaker_opens_then_single_half_open_probe():
+    cb = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    cb.record_failure(now=0)
+    assert cb.state == CLOSED
+    cb.record_failure(now=0)
+    assert cb.state == OPEN and not cb.allow(now=5)
+    assert cb.allow(now=10) and cb.state == HALF_OPEN
+    assert not cb.allow(now=10)  # only one probe in flight
+    cb.record_failure(now=10)
+    assert cb.state == OPEN and not cb.allow(now=15)
+    assert cb.allow(now=20)
+    cb.record_success()
+    assert cb.state == CLOSED
+
+
+def test_dead_provider_costs_nothing():
+    health = HealthTracker()
+    calls = []
+
+    def dead(prompt):
+        calls.append(prompt)
+        raise TimeoutError("timeout")
+
+    for _ in range(10):
+        assert health.call("openai", dead, "x") is None
+    snap = health.snapshot()["openai"]
+    assert len(calls) == 3 and snap["state"] == OPEN and snap["skipped"] == 7
+
+
+def test_order_by_expected_latency_open_last():
+    health = HealthTracker()
+    health.record("openai", 2.0, True)
+    health.record("copilot", 0.5, True)
+    assert health.order(["openai", "gemini", "copilot"]) == ["gemini", "copilot", "openai"]
+    for _ in range(3):
+        health.record("gemini", 0.1, False, "down")
+    assert health.order(["openai", "gemini", "copilot"])[-1] == "gemini"
+
+
+def test_async_call_and_empty_output_is_failure():
+    health = HealthTracker()
+
+    async def empty(prompt):
+        return ""
+
+    assert asyncio.run(health.acall("gemini", empty, "x")) is None
+    assert health.snapshot()["gemini"]["failures"] == 1
+
+
+def test_probe_without_verdict_is_released(monkeypatch):
+    from backend.ai import openai_driver
+    from backend.ai_providers import health as health_mod
+    from backend.ai_providers.limits import RateLimitTimeout
+
+    tracker = HealthTracker()
+    monkeypatch.setattr(health_mod, "HEALTH", tracker)
+    monkeypatch.setattr(openai_driver, "HEALTH", tracker)
+
+    class Limiter:
+        def run(self, fn, *a, **kw):
+            raise RateLimitTimeout("openai queue deadline")
+
+    monkeypatch.setattr(openai_driver, "get_limiter", lambda name: Limiter())
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=None)))
+    monkeypatch.setattr(openai_driver, "get_resources", lambda: SimpleNamespace(openai_client=lambda: client))
+
+    breaker = tracker.get("openai").breaker
+    breaker.state, breaker.opened_at = HALF_OPEN, 0.0
+    try:
+        openai_driver.call_openai("gpt-4.1-mini", "x")
+    except RateLimitTimeout:
+        pass
+    # the probe ended with no verdict: still half-open, next call may probe
+    assert breaker.state == HALF_OPEN and tracker.allow("openai")
+
+
+def test_local_queue_timeout_is_not_a_provider_failure():
+    from backend.ai_providers.limits import RateLimitTimeout
+
+    health = HealthTracker()
+
+    def queued_out(prompt):
+        raise RateLimitTimeout("deadline")
+
+    for _ in range(5):
+        assert health.call("openai", queued_out, "x") is None
+    snap = health.snapshot()["openai"]
+    assert snap["state"] == CLOSED and snap["failures"] == 0
+
+
+def test_cancelled_acall_releases_probe():
+    health = HealthTracker()
+    breaker = health.get("gemini").breaker
+    breaker.state = HALF_OPEN
+
+    async def main():
+        task = asyncio.create_task(health.acall("gemini", asyncio.sleep, 10, "late"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(main())
+    assert breaker.state == HALF_OPEN and health.allow("gemini")
+
+
+def test_drivers_pass_queue_timeouts_through(monkeypatch):
+    from backend.ai import copilot_driver, openai_driver
+    from backend.ai_providers.limits import RateLimitTimeout
+
+    class Limiter:
+        def run(self, fn, *a, **kw):
+            raise RateLimitTimeout("queue deadline")
+
+    monkeypatch.setattr(copilot_driver, "get_limiter", lambda name: Limiter())
+    health = HealthTracker()
+    for _ in range(5):
+        assert health.call("copilot", copilot_driver.run_copilot, "x") is None
+    assert health.snapshot()["copilot"]["state"] == CLOSED
+
+    models = []
+
+    def queued(model, *a):
+        models.append(model)
+        raise RateLimitTimeout("queue deadline")
+
+    monkeypatch.setattr(openai_driver, "call_openai", queued)
+    assert openai_driver.run_primary_ai("x") is None and models == ["gpt-4.1-turbo"]
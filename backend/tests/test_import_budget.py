@@ -0,0 +1,25 @@
+import subprocess
+import sys
+
+from tools import import_budget
+
+
+def test_provider_sdks_load_lazily():
+    for module in ("backend.app", "backend.main"):
+        total, _, eager = import_budget.measure(module)
+        assert eager == []
+        assert total > 0
+
+
+def test_registry_imports_on_first_use():
+    # fresh interpreter: other tests may already have loaded the SDKs
+    code = (
+        "from backend.ai_providers import registry\n"
+        "assert 'copilot' not in registry.loaded_providers()\n"
+        "fn = registry.get_provider('copilot')\n"
+        "assert callable(fn) and registry.get_provider('copilot') is fn\n"
+        "assert 'copilot' in registry.loaded_providers()\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=import_budget.ROOT,
+                          capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
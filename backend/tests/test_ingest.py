@@ -0,0 +1,136 @@
+import asyncio
+import json
+import threading
+import time
+
+from backend.ingest.pipeline import IngestPipeline
+from backend.ingest.sinks import MemorySink, NDJSONSink
+from backend.ingest.sources import FileTailSource, StdinSource, split_records
+from backend.utils import memory_engine
+
+NOTAM = """L5570/25 NOTAMN
+Q)UIII/QARLC/IV/NBO/E/095/230/5139N11211E096
+E)ATS RTE A810 RINOP-AGINO CLSD.
+FROM FL095 TO FL230"""
+
+
+class ListSink:
+    def __init__(self):
+        self.items = []
+
+    async def write(self, raw, parsed):
+        await asyncio.sleep(0)
+        self.items.append(parsed)
+
+    async def close(self):
+        pass
+
+
+def test_split_records_blank_lines_and_json():
+    recs = split_records(["A", "B", "", '{"notam": "C"}', "D"])
+    assert recs == ["A\nB", "C", "D"]
+
+
+def test_pipeline_bounded_queues_deliver_everything():
+    async def source():
+        for _ in range(25):
+            yield NOTAM
+
+    sink = ListSink()
+    stats = asyncio.run(IngestPipeline(source(), sink, workers=3, queue_size=2).run())
+    assert stats["read"] == stats["written"] == 25
+    assert sink.items[0].fl_info.label() == "FL095-FL230"
+    assert sink.items[0].segments[0].route == "A810"
+
+
+def test_file_source_to_ndjson(tmp_path):
+    feed = tmp_path / "feed.txt"
+    feed.write_text(NOTAM + "\n\n" + NOTAM + "\n", encoding="utf-8")
+    out = tmp_path / "out.ndjson"
+    asyncio.run(IngestPipeline(FileTailSource(feed, follow=False), NDJSONSink(out)).run())
+    rows = [json.loads(l) for l in out.read_text(encoding="utf-8").splitlines()]
+    assert len(rows) == 2 and rows[0]["parsed"]["confidence"] > 0
+
+
+def test_failing_records_are_counted_and_skipped(monkeypatch):
+    from backend.ingest import pipeline
+
+    real = pipeline.normalize_stage
+
+    def flaky(raw):
+        if "BAD" in raw:
+            raise ValueError("unreadable")
+        return real(raw)
+
+    async def source():
+        for text in (NOTAM, "BAD", NOTAM):
+            yield text
+
+    monkeypatch.setattr(pipeline, "normalize_stage", flaky)
+    sink = ListSink()
+    stats = asyncio.run(IngestPipeline(source(), sink, workers=2).run())
+    assert stats["read"] == 3 and stats["errors"] == 1 and stats["written"] == 2
+
+
+def test_tail_emits_partial_record_only_at_stop(tmp_path):
+    feed = tmp_path / "feed.txt"
+    head, tail = NOTAM.split("\nE)")
+    feed.write_text(head + "\n", encoding="utf-8")
+    src = FileTailSource(feed, follow=True, poll=0.01)
+
+    async def go():
+        it = src.__aiter__()
+        first = asyncio.ensure_future(it.__anext__())
+        await asyncio.sleep(0.05)            # several idle polls mid-record
+        assert not first.done()
+        with feed.open("a", encoding="utf-8") as fh:
+            fh.write("E)" + tail)            # last line, no newline yet
+        await asyncio.sleep(0.05)
+        assert not first.done()
+        src.stop()
+        return await first
+
+    assert asyncio.run(go()) == NOTAM
+
+
+def test_memory_sink_writes_one_transaction_per_batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    batches = []
+    append = memory_engine.append_entries
+    monkeypatch.setattr(memory_engine, "append_entries",
+                        lambda items, **kw: batches.append(len(items)) or append(items, **kw))
+
+    async def source():
+        for _ in range(5):
+            yield NOTAM
+
+    stats = asyncio.run(IngestPipeline(source(), MemorySink(batch_size=2, max_wait=60)).run())
+    assert stats["written"] == 5 and batches == [2, 2, 1]
+    assert len(memory_engine.get_all_memory_entries()) == 5
+
+
+def test_stdin_stop_does_not_wait_for_eof():
+    eof = threading.Event()
+    guard = threading.Timer(5, eof.set)  # unblock the reader whatever happens
+    guard.start()
+
+    class Blocking:
+        lines = [NOTAM + "\n"]
+
+        def readline(self):
+            if self.lines:
+                return self.lines.pop()
+            eof.wait()
+            return ""
+
+    src = StdinSource(Blocking())
+
+    async def go():
+        asyncio.get_running_loop().call_later(0.05, src.stop)
+        return [rec async for rec in src]
+
+    start = time.monotonic()
+    assert asyncio.run(go()) == [NOTAM]  # pending record flushed at stop()
+    assert time.monotonic() - start < 2
+    eof.set()
+    guard.cancel()
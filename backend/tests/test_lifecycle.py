@@ -0,0 +1,64 @@
+from backend.utils import memory_engine, notam_store
+from backend.utils.fl_index import FL_INDEX
+from backend.utils.parse_cache import PARSE_CACHE
+from backend.utils.semantic_cache import SEMANTIC_CACHE
+
+BODY = """Q)UUWV/QARLC/IV/NBO/E/000/290/5435N02024E050
+A)UUWV B)2708120000 C)2708172359
+E)ATS RTE CLSD: W187 TUSLI-KARVI.
+F)SFC G)FL290"""
+NEW = "A0001/27 NOTAMN\n" + BODY
+REPLACE = "A0005/27 NOTAMR A0001/27\n" + BODY.replace("C)2708172359", "C)2708202359")
+CANCEL = "A0006/27 NOTAMC A0005/27\nQ)UUWV/QARCH/IV/NBO/E/000/290/5435N02024E050\nA)UUWV B)2708150000"
+
+
+def test_replace_and_cancel_by_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    notam_store.clear()
+    assert notam_store.index_notam(NEW, now=0)["status"] == "indexed"
+
+    res = notam_store.index_notam(REPLACE, now=0)
+    assert res["status"] == "replaced" and res["replaces"] == "A0001/27"
+    assert notam_store.get("A0001/27") is None and notam_store.get("A0005/27").replaces == "A0001/27"
+    assert [s.notam for s in FL_INDEX.query(100)] == ["UUWV:A0005/27"]
+    assert notam_store.stats()["lifecycle"]["reused_parses"] == 1  # only B/C changed
+
+    # the original arriving late stays out
+    assert notam_store.index_notam(NEW, now=0) == {
+        "id": "A0001/27", "key": "UUWV:A0001/27", "status": "superseded", "by": "A0005/27"}
+
+    assert notam_store.index_notam(CANCEL, now=0)["status"] == "cancelled"
+    assert notam_store.get("A0005/27") is None and len(FL_INDEX) == 0
+    assert notam_store.query(route="W187")["total"] == 0
+
+
+def test_retire_invalidates_only_that_notams_caches(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    notam_store.clear()
+    PARSE_CACHE.clear()
+    SEMANTIC_CACHE.clear()
+    other = NEW.replace("A0001/27", "A0002/27").replace("TUSLI-KARVI", "KARVI-GITOV")
+    for text in (NEW, other):
+        notam_store.index_notam(text, now=0)
+        PARSE_CACHE.cached("process", text, lambda: "parsed")
+        SEMANTIC_CACHE.put("explain", text, "answer", "openai")
+
+    notam_store.index_notam(REPLACE, now=0)
+    assert PARSE_CACHE.stats()["size"] == 1 and SEMANTIC_CACHE.stats()["size"] == 1
+    assert PARSE_CACHE.cached("process", other, lambda: "recomputed") == "parsed"
+    assert notam_store.get("A0002/27") is not None
+
+
+def test_same_id_from_different_issuers(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    notam_store.clear()
+    umkk = NEW.replace("UUWV", "UMKK").replace("TUSLI-KARVI", "KARVI-GITOV")
+    assert notam_store.index_notam(NEW, now=0)["key"] == "UUWV:A0001/27"
+    assert notam_store.index_notam(umkk, now=0)["status"] == "indexed"  # not a duplicate
+    assert notam_store.query(notam_id="A0001/27")["total"] == 2
+
+    # UUWV's replacement retires only UUWV's A0001/27
+    notam_store.index_notam(REPLACE, now=0)
+    assert notam_store.get("UMKK:A0001/27") is not None and notam_store.get("UUWV:A0001/27") is None
+    assert notam_store.index_notam(umkk, now=0)["status"] == "indexed"
+    assert notam_store.get("A0001/27").issuer == "UMKK"
@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.ai_providers.limits import (
+    AIMDLimit, ProviderHTTPError, ProviderLimiter, RateLimitTimeout, TokenBucket,
+)
+
+
+def test_bucket_reservations_queue_in_order():
+    bucket = TokenBucket(per_minute=60, capacity=1)  # 1 per second
+    assert bucket.reserve(1, now=0, max_wait=10) == 0
+    assert bucket.reserve(1, now=0, max_wait=10) == pytest.approx(1)
+    assert bucket.reserve(1, now=0, max_wait=10) == pytest.approx(2)
+    assert bucket.reserve(1, now=0, max_wait=1) is None  # past the deadline, not debited
+    assert bucket.level == pytest.approx(-2)
+
+
+def test_aimd_halves_on_throttle_and_grows_back():
+    limit = AIMDLimit(maximum=8)
+    limit.on_throttle()
+    limit.on_throttle()
+    assert limit.limit == 2
+    for _ in range(4):
+        limit.on_success()
+    assert 2 < limit.limit < 8
+
+
+def test_429_is_retried_after_pause():
+    limiter = ProviderLimiter("t", rpm=6000, tpm=10**6, concurrency=2, queue_timeout=5)
+    calls = []
+
+    def flaky():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise ProviderHTTPError(429, "slow down", retry_after=0.05)
+        return "ok"
+
+    assert limiter.run(flaky) == "ok"
+    assert len(calls) == 2 and calls[1] - calls[0] >= 0.04
+    snap = limiter.snapshot()
+    assert snap["throttled"] == 1 and snap["calls"] == 2
+
+
+def test_other_errors_propagate_and_deadline_times_out():
+    limiter = ProviderLimiter("t", rpm=60, tpm=10**6, concurrency=1, queue_timeout=0.1)
+    with pytest.raises(ValueError):
+        limiter.run(lambda: (_ for _ in ()).throw(ValueError("boom")))
+    with pytest.raises(RateLimitTimeout):
+        for _ in range(100):
+            limiter.run(lambda: "ok")
+
+
+def test_async_waiters_share_concurrency():
+    limiter = ProviderLimiter("t", rpm=6000, tpm=10**6, concurrency=2, queue_timeout=5)
+    peak = []
+
+    async def work():
+        peak.append(limiter.concurrency.inflight)
+        await asyncio.sleep(0.01)
+        return 1
+
+    async def go():
+        return await asyncio.gather(*(limiter.arun(work) for _ in range(6)))
+
+    assert asyncio.run(go()) == [1] * 6
+    assert max(peak) <= 2 and limiter.concurrency.inflight == 0
+
+
+def test_cancelled_call_frees_its_slot():
+    limiter = ProviderLimiter("t", rpm=6000, tpm=10**6, concurrency=1, queue_timeout=5)
+
+    async def main():
+        task = asyncio.create_task(limiter.arun(asyncio.sleep, 10))
+        await asyncio.sleep(0.01)
+        assert limiter.concurrency.inflight == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert limiter.concurrency.inflight == 0
+
+    def interrupted():
+        raise KeyboardInterrupt
+    with pytest.raises(KeyboardInterrupt):
+        limiter.run(interrupted)
+    assert limiter.concurrency.inflight == 0
+
+
+def test_only_successes_grow_the_limit():
+    limiter = ProviderLimiter("t", rpm=6000, tpm=10**6, concurrency=8, queue_timeout=5)
+    limiter.concurrency.on_throttle()
+    before = limiter.concurrency.limit
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            limiter.run(lambda: (_ for _ in ()).throw(ValueError("500")))
+    assert limiter.concurrency.limit == before and limiter.snapshot()["errors"] == 5
+    limiter.run(lambda: "ok")
+    assert limiter.concurrency.limit > before
@@ -0,0 +1,71 @@
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.app import app
+from backend.utils import memory_engine
+
+
+def _fill(tmp_path, monkeypatch, n):
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    monkeypatch.setattr(memory_engine, "READ_CHUNK", 64)  # entries straddle reads
+    for i in range(n):
+        memory_engine.save_memory_entry(f"E)W187 FIX{i:02d}-KARVI CLSD", {"note": 'a "quoted" ]'})
+
+
+def test_cursor_pages_cover_store_once(tmp_path, monkeypatch):
+    _fill(tmp_path, monkeypatch, 7)
+    seen, cursor = [], None
+    while True:
+        page = memory_engine.page_memory_entries(cursor, limit=3)
+        seen += [e["id"] for e in page["entries"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == list(range(1, 8))
+    assert memory_engine.page_memory_entries("7")["entries"] == []
+
+
+def test_later_pages_seek_past_earlier_ones(tmp_path, monkeypatch):
+    _fill(tmp_path, monkeypatch, 29)
+    memory_engine.save_memory_entry("E)ТРАССА W187 ЗАКРЫТА", {"note": "é"})  # multi-byte UTF-8
+    fed = []
+
+    class Counting(memory_engine.ArrayItemParser):
+        def feed_positions(self, chunk):
+            fed.append(len(chunk))
+            return super().feed_positions(chunk)
+
+    monkeypatch.setattr(memory_engine, "ArrayItemParser", Counting)
+    seen, cursor = [], None
+    while True:
+        page = memory_engine.page_memory_entries(cursor, limit=3)
+        seen += page["entries"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert [e["id"] for e in seen] == list(range(1, 31))
+    assert seen[-1]["notam"] == "E)ТРАССА W187 ЗАКРЫТА" and seen[-1]["aviation"]["note"] == "é"
+    # about one pass over the file (each page reads one entry ahead), not
+    # a re-read from byte 0 per page (~5.5x the file for these 10 pages)
+    assert sum(fed) < 2 * memory_engine.MEM_FILE.stat().st_size
+
+    memory_engine.save_memory_entry("E)W187 NEW-KARVI CLSD", {})  # new file version: offsets dropped
+    assert [e["id"] for e in memory_engine.page_memory_entries("2", limit=2)["entries"]] == [3, 4]
+
+
+def test_export_streams_ndjson_and_gzip(tmp_path, monkeypatch):
+    _fill(tmp_path, monkeypatch, 5)
+    client = TestClient(app)
+    lines = client.get("/memory/export").text.splitlines()
+    assert [json.loads(l)["id"] for l in lines] == [1, 2, 3, 4, 5]
+
+    res = client.get("/memory/export", params={"gzip": "true"})
+    assert res.headers["content-type"] == "application/gzip"
+    rows = gzip.decompress(res.content).decode().splitlines()
+    assert json.loads(rows[-1])["aviation"]["note"] == 'a "quoted" ]'
+
+    page = client.get("/memory/get", params={"limit": 2}).json()
+    assert page["next_cursor"] == "2" and page["count"] == 2
+    assert client.get("/memory/get", params={"cursor": "x"}).status_code == 400
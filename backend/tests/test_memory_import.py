@@ -0,0 +1,79 @@
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.app import app
+from backend.utils import memory_engine, notam_store
+from backend.utils.memory_import import MemoryImporter
+
+N5 = """A0002/27 NOTAMN
+Q)UMKK/QARLC/IV/NBO/E/045/130/5500N02100E020
+A)UMKK B)2708200000 C)2708252359
+E)ATS RTE CLSD: N5 KRD-GITOV.
+F)FL045 G)FL130"""
+
+
+def _feed(importer, data: bytes, size=7):
+    for i in range(0, len(data), size):  # items and the gzip header straddle chunks
+        importer.feed_bytes(data[i:i + size])
+    return importer.close()
+
+
+def test_formats_dedup_and_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    memory_engine.save_memory_entry("E)W187 FIX00-KARVI CLSD", {})
+    writes = []
+    append = memory_engine.append_entries
+    monkeypatch.setattr(memory_engine, "append_entries",
+                        lambda items, notify=True: writes.append(len(items)) or append(items, notify))
+
+    items = [{"notam": f"E)W187 FIX{i:02d}-KARVI CLSD", "aviation": {}} for i in range(5)]
+    items += [items[1], "E)N5 KRD-GITOV CLSD", 42, {"notam": ""}]
+    stats = _feed(MemoryImporter(batch_size=2), json.dumps(items).encode())
+    assert stats == {"format": "array", "read": 9, "imported": 5, "duplicates": 2,
+                     "invalid": 2, "batches": 3}
+    assert writes == [2, 2, 1]
+    assert [e["id"] for e in memory_engine.iter_memory_entries()] == [1, 2, 3, 4, 5, 6]
+
+    dump = json.dumps({"fixes": {}, "entries": memory_engine.get_all_memory_entries()}, indent=2)
+    assert _feed(MemoryImporter(), dump.encode())["duplicates"] == 6
+
+    ndjson = "\n".join(json.dumps({"id": 1, "notam": f"E)L736 P{i}-GOMED CLSD"}) for i in range(3))
+    stats = _feed(MemoryImporter(), gzip.compress((ndjson + "\n{broken\n").encode()))
+    assert stats["format"] == "ndjson" and stats["imported"] == 3 and stats["invalid"] == 1
+
+
+def test_import_endpoint_notifies_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    notam_store.clear()
+    calls = []
+    notify = memory_engine._notify
+    monkeypatch.setattr(memory_engine, "_notify",
+                        lambda tokens, kind: calls.append(kind) or notify(tokens, kind))
+
+    body = "\n".join(json.dumps({"notam": t}) for t in (N5, N5, "E)L736 NEDRA-GOMED CLSD"))
+    res = TestClient(app).post("/memory/import", content=body, params={"batch_size": 1})
+    assert res.json()["imported"] == 2 and res.json()["batches"] == 2
+    assert calls == ["entry"]
+    assert notam_store.get("A0002/27").source == "memory"
+
+    bad = TestClient(app).post("/memory/import", content=b"<xml/>")
+    assert bad.status_code == 400
+
+
+def test_disconnect_keeps_received_batches(tmp_path, monkeypatch):
+    import asyncio
+    from starlette.requests import ClientDisconnect
+
+    from backend.routes.memory_routes import import_memory
+
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+
+    class Request:
+        async def stream(self):
+            yield ("\n".join(json.dumps({"notam": f"E)W187 FIX{i:02d}-KARVI CLSD"}) for i in range(3)) + "\n").encode()
+            raise ClientDisconnect()
+
+    stats = asyncio.run(import_memory(Request(), batch_size=2))
+    assert stats["imported"] == 3 and len(memory_engine.get_all_memory_entries()) == 3
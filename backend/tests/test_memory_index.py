@@ -0,0 +1,56 @@
+from backend.utils import memory_engine
+from backend.utils.memory_index import MemoryIndex, snapshot_path
+from backend.utils.similarity import find_similar_memory
+from backend.utils.snapshot import read_snapshot, write_snapshot
+
+W187 = "A0001/27 NOTAMN\nE)ATS RTE W187 TUSLI-KARVI CLSD."
+N5 = "A0002/27 NOTAMN\nE)ATS RTE N5 KRD-GITOV CLSD."
+
+
+def _fill(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    monkeypatch.setattr(memory_engine, "_index", lambda: index)
+    index = MemoryIndex()
+    memory_engine.save_memory_entry(W187, "W187 TUSLI-KARVI FL000-FL290")
+    memory_engine.save_memory_entry(N5, {"segments": [{"route": "N5", "from": "KRD", "to": "GITOV"}]})
+    return index
+
+
+def test_snapshot_restart_and_catch_up(tmp_path, monkeypatch):
+    index = _fill(tmp_path, monkeypatch)
+    assert index.stats()["source"] == "store" and snapshot_path(memory_engine.MEM_FILE).exists()
+
+    worker = MemoryIndex()  # a restarted worker: no rebuild, same answers
+    assert worker.stats()["source"] == "snapshot" and worker.rebuilds == 0
+    assert worker.segments_of("N5") == [["KRD", "GITOV"]]
+    assert worker.entry_id_for("karvi") == 1
+
+    memory_engine.save_memory_entry(W187.replace("KARVI", "BIKAS"), {})
+    memory_engine.learn_fix("GITOVV", "GITOV")
+    assert worker.stats()["entries"] == 3 and worker.rebuilds == 0
+    assert worker.fix("gitovv") == "GITOV"
+
+    memory_engine.clear_memory()
+    assert worker.stats()["entries"] == 0 and worker.rebuilds == 1
+
+
+def test_lookups_and_compaction(tmp_path, monkeypatch):
+    index = _fill(tmp_path, monkeypatch)
+    assert find_similar_memory(W187) == "W187 TUSLI-KARVI FL000-FL290"
+    assert memory_engine.memory_lookup_fix("GITOV")["id"] == 2
+
+    memory_engine.save_memory_entry(W187, "W187 TUSLI-KARVI FL000-FL290")
+    res = memory_engine.compact_memory()
+    assert res == {"status": "compacted", "entries": 2, "removed": 1, "snapshot": True}
+    assert [e["id"] for e in memory_engine.get_all_memory_entries()] == [1, 2]
+    assert MemoryIndex().stats()["source"] == "snapshot"
+
+
+def test_snapshot_header_is_checked(tmp_path):
+    path = tmp_path / "x.snapshot"
+    assert write_snapshot(path, "memory_index", 1, {"a": [1, (2, 3)]})
+    assert read_snapshot(path, "memory_index", 1) == {"a": [1, (2, 3)]}
+    assert read_snapshot(path, "memory_index", 2) is None
+    assert read_snapshot(path, "corpus_memory", 1) is None
+    path.write_bytes(b"not marshal")
+    assert read_snapshot(path, "memory_index", 1) is None
@@ -0,0 +1,69 @@
+import asyncio
+import json
+import re
+
+from backend.ai.micro_batcher import BatchFailed, MicroBatcher, parse_batch_response
+
+
+def _echo_model(prompts):
+    async def call(prompt, max_tokens=None, json_schema=None):
+        prompts.append(prompt)
+        await asyncio.sleep(0)
+        ids = re.findall(r"NOTAM \[(\w+)\]", prompt)
+        if not ids:
+            return "single", "openai"
+        return "```json\n" + json.dumps([{"id": i, "result": {"id": i}} for i in ids]) + "\n```", "openai"
+    return call
+
+
+def test_concurrent_requests_share_one_prompt():
+    prompts = []
+    batcher = MicroBatcher("super", _echo_model(prompts), max_items=4, max_wait_ms=50)
+
+    async def go():
+        return await asyncio.gather(*(batcher.submit(f"E)NOTAM {i}") for i in range(4)))
+
+    results = asyncio.run(go())
+    assert len(prompts) == 1 and prompts[0].count("NOTAM [") == 4
+    assert [r[1] for r in results] == ["openai-batch"] * 4
+    assert len({r[0]["id"] for r in results}) == 4
+
+
+def test_lone_request_uses_single_prompt_and_duplicates_share_slot():
+    prompts = []
+    batcher = MicroBatcher("super", _echo_model(prompts), max_items=8, max_wait_ms=1)
+
+    async def go():
+        return await asyncio.gather(batcher.submit("E)SAME"), batcher.submit("E)SAME"))
+
+    assert asyncio.run(go()) == [("single", "openai"), ("single", "openai")]
+    assert len(prompts) == 1 and "NOTAM [" not in prompts[0]
+
+
+def test_failed_batch_fails_every_caller():
+    calls = []
+
+    async def dead(prompt, max_tokens=None, json_schema=None):
+        calls.append(prompt)
+        return None
+
+    batcher = MicroBatcher("super", dead, max_items=2, max_wait_ms=1)
+
+    async def go():
+        return await asyncio.gather(batcher.submit("E)A"), batcher.submit("E)B"), return_exceptions=True)
+
+    assert [type(r) for r in asyncio.run(go())] == [BatchFailed, BatchFailed]
+    assert len(calls) == 1
+    assert parse_batch_response("no json here") == {}
+
+
+def test_item_left_out_of_answer_resolves_to_none():
+    async def partial(prompt, max_tokens=None, json_schema=None):
+        return json.dumps([{"id": re.findall(r"NOTAM \[(\w+)\]", prompt)[0], "result": "ok"}]), "openai"
+
+    batcher = MicroBatcher("super", partial, max_items=2, max_wait_ms=1)
+
+    async def go():
+        return await asyncio.gather(batcher.submit("E)A"), batcher.submit("E)B"))
+
+    assert asyncio.run(go()) == [("ok", "openai-batch"), None]
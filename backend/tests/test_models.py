@@ -0,0 +1,44 @@
+from backend.utils.models import FLBand, Segment, segments_to_dicts
+from backend.utils.normalize import normalize_notam
+from backend.utils.fl_master import combine_fl
+from backend.utils.segment_builder import build_segments
+
+NOTAM = """A2625/25 NOTAMN
+Q)ZLHW/QARLT/IV/NBO/E/000/341/3938N09334E069
+A)ZLHW B)2508120100 C)2508120600
+E)ATS RTE A810 SEGMENT RINOP-AGINO CLSD.
+F)SFC
+G)FL341"""
+
+
+def test_split_sections_record():
+    cleaned, sections = normalize_notam(NOTAM)
+    assert sections.q.startswith("ZLHW/QARLT")
+    assert sections.e == "ATS RTE A810 SEGMENT RINOP-AGINO CLSD."
+    assert sections.to_dict()["G"] == "FL341"
+
+
+def test_inline_markers_in_e_text_stay_in_e():
+    _, s = normalize_notam("A)ZLHW B)2508120100 C)2508120600\nE)RWY CLSD, SEE AIP AD 2 PARA F) AND G) FOR WIP F)SFC G)FL100")
+    assert s.e == "RWY CLSD, SEE AIP AD 2 PARA F) AND G) FOR WIP"
+    assert (s.f, s.g) == ("SFC", "FL100")
+    _, s = normalize_notam("E)TWY B CLSD F) 5000FT AMSL G)UNL")
+    assert (s.e, s.f, s.g) == ("TWY B CLSD", "5000FT AMSL", "UNL")
+
+
+def test_combine_fl_band():
+    band = combine_fl((None, None), (10, 500), "ZLHW/QARLT/IV/NBO/E/000/341/")
+    assert isinstance(band, FLBand)
+    assert band.fl_upper_final == 341 and band.adjusted
+    assert band.label() == "FL010-FL341"
+
+
+def test_build_segments_dedup_and_dicts():
+    band = FLBand(fl_lower=95, fl_upper_final=230)
+    raw = [Segment("A810", "RINOP", "AGINO"), Segment("A810", "rinop", "agino")]
+    segs = build_segments(raw, band)
+    assert len(segs) == 1
+    assert segments_to_dicts(segs) == [{
+        "route": "A810", "from": "RINOP", "to": "AGINO",
+        "segment": "RINOP-AGINO", "fl": "FL095-FL230",
+    }]
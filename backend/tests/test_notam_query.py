@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+
+from backend.utils import memory_engine, notam_store
+
+W187 = """A0001/27 NOTAMN
+Q)UUWV/QARLC/IV/NBO/E/000/290/5435N02024E050
+A)UUWV B)2708120000 C)2708172359
+E)ATS RTE CLSD: W187 TUSLI-KARVI, W187 KARVI-GITOV.
+F)SFC G)FL290"""
+N5 = """A0002/27 NOTAMN
+Q)UMKK/QARLC/IV/NBO/E/045/130/5500N02100E020
+A)UMKK B)2708200000 C)2708252359
+E)ATS RTE CLSD: N5 KRD-GITOV.
+F)FL045 G)FL130"""
+
+
+def ts(day, hour=12):
+    return datetime(2027, 8, day, hour, tzinfo=timezone.utc).timestamp()
+
+
+def test_hash_index_queries_and_pagination(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    notam_store.clear()
+    notam_store.index_notam(W187, now=0)
+    notam_store.index_notam(N5, now=0)
+
+    gitov = notam_store.query(fix="gitov")
+    assert gitov["total"] == 2 and {r["route"] for r in gitov["items"]} == {"W187", "N5"}
+    assert [r["segment"] for r in notam_store.query(route="W187")["items"]] == ["TUSLI-KARVI", "KARVI-GITOV"]
+    assert notam_store.query(fir="UMKK", fix="GITOV")["items"][0]["fir"] == "UMKK"
+    assert notam_store.query(notam_id="a0002/27")["total"] == 1
+    assert notam_store.query(route="W187", fix="TUSLI")["total"] == 1
+
+    # active closures touching GITOV on the 21st: only the N5 NOTAM
+    assert [r["route"] for r in notam_store.query(fix="GITOV", at=ts(21))["items"]] == ["N5"]
+
+    page = notam_store.query(fix="GITOV", limit=1)
+    assert page["next_offset"] == 1 and len(page["items"]) == 1
+    assert notam_store.query(fix="GITOV", offset=1, limit=1)["next_offset"] is None
+
+    notam_store.drop("A0001/27")
+    assert notam_store.query(route="W187")["total"] == 0 and notam_store.stats()["routes"] == 1
+
+
+def test_memory_entries_are_indexed_incrementally(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    notam_store.clear()
+    memory_engine.save_memory_entry(N5, {})
+    assert notam_store.query(route="N5")["total"] == 1
+    assert notam_store.get("A0002/27").source == "memory"
+    memory_engine.clear_memory()
+    assert notam_store.query(route="N5")["total"] == 0
+
+
+def test_read_endpoints_see_memory_entries(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from backend.app import app
+
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    notam_store.clear()
+    memory_engine.save_memory_entry(N5, {})  # not yet synced into the indexes
+    client = TestClient(app)
+    assert client.get("/notams/fl", params={"fl": 100, "route": "N5"}).json()["count"] == 1
+    assert client.get("/notams/area/point", params={"lat": 55.0, "lon": 21.0}).json()["count"] == 1
+    assert "UMKK:A0002/27" in client.get("/notams/active", params={"at": "2708211200"}).json()["ids"]
+    memory_engine.clear_memory()
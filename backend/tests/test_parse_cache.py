@@ -0,0 +1,39 @@
+from backend.utils import memory_engine
+from backend.utils.parse_cache import ParseCache, PARSE_CACHE
+
+NOTAM = "E)ATS RTE A810 SEGMENT RINOP-AGINO CLSD. FROM FL095 TO FL230"
+
+
+def test_key_is_the_text_compute_parses():
+    cache = ParseCache(maxsize=4, ttl=60)
+    calls = []
+    compute = lambda: calls.append(1) or {"ok": True}
+    cache.cached("t", NOTAM, compute)
+    cache.cached("t", NOTAM, compute)
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["hit_rate"] == 0.5
+
+    # case-sensitive parsers: a lower-case copy is parsed on its own
+    lower = cache.cached("t", NOTAM.lower(), lambda: "")
+    assert lower == "" and cache.cached("t", NOTAM, compute) == {"ok": True}
+    assert cache.discard(NOTAM.lower()) == 2  # both copies share the text tag
+
+
+def test_lru_eviction_and_ttl():
+    cache = ParseCache(maxsize=2, ttl=60)
+    for i in range(3):
+        cache.put(str(i), i)
+    assert cache.get("0") is None and cache.get("2") == 2
+    cache.ttl = -1
+    cache.put("x", 1)
+    assert cache.get("x") is None
+
+
+def test_memory_fix_correction_invalidates_affected(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    PARSE_CACHE.clear()
+    PARSE_CACHE.cached("t", NOTAM, lambda: "a")
+    PARSE_CACHE.cached("t", "E)W187 TUSLI-KARVI CLSD", lambda: "b")
+    memory_engine.learn_fix("RINOP", "RINOX")
+    assert PARSE_CACHE.stats()["size"] == 1
+    assert PARSE_CACHE.cached("t", "E)W187 TUSLI-KARVI CLSD", lambda: "c") == "b"
@@ -0,0 +1,58 @@
+from backend.ai.prompt_compact import (
+    build_compact_prompt, compact_notam, instruction_prefix, max_tokens_for, q_summary, record_answer,
+)
+from backend.ai.prompt_router import build_prompt
+from tools.prompt_token_report import load_corpus, report
+
+NOTAM = """Q0381/25 NOTAMN
+Q)UMKK/QARLC/IV/NBO/E/045/130/5435N02024E028
+A)UMKK B)2508120600 C)2508152200
+D)12-15 0600-2200
+E)FLW ATS RTE SEGMENTS CLSD:
+L736 NEDRA-GOMED FL045-FL130
+N5 KALININGRAD/KHRABROVO VORDME(KRD)-GITOV FL045-FL130."""
+
+
+def test_super_keeps_e_and_q_summary_only():
+    text = compact_notam("super", NOTAM)
+    assert text.startswith("Q: UMKK QARLC FL045-130 5435N02024E028\nE: FLW ATS RTE")
+    assert "2508120600" not in text and "NOTAMN" not in text
+
+
+def test_explain_keeps_schedule():
+    text = compact_notam("explain", NOTAM)
+    assert "FROM: 2508120600" in text and "SCHEDULE: 12-15 0600-2200" in text
+    assert "QARLC" not in text
+
+
+def test_prefix_cached_and_prompt_shorter():
+    assert instruction_prefix("risk") is instruction_prefix("risk")
+    assert len(build_compact_prompt("super", NOTAM)) < len(build_prompt("super", NOTAM))
+    assert compact_notam("super", "free text without sections") == "FREE TEXT WITHOUT SECTIONS"
+    assert q_summary("EGTT/QRTCA") == "EGTT QRTCA"
+
+
+def test_max_tokens_scale_with_segments():
+    one = "E)ATS RTE A810 SEGMENT RINOP-AGINO CLSD."
+    two = "E)FLW ATS RTE SEGMENTS CLSD:\nA822 LONKA-NEDAG FL275-FL540,\nM97 KESUM-RINMU FL275-FL540."
+    assert max_tokens_for("super", two) > max_tokens_for("super", one)
+    assert max_tokens_for("risk", one) < max_tokens_for("explain", one)
+
+
+def test_corpus_report_shows_reduction():
+    rows = report(load_corpus(), count=len)
+    assert all(r["compact_tokens"] < r["full_tokens"] for r in rows.values())
+
+
+def test_budget_follows_measured_answers(monkeypatch):
+    from backend.ai import prompt_compact
+
+    monkeypatch.setattr(prompt_compact, "_ANSWERS", {})
+    one = "E)ATS RTE A810 SEGMENT RINOP-AGINO CLSD."
+    static = max_tokens_for("risk", one)
+    answer = "RISK: High\nREASON: " + "A810 closed between RINOP and AGINO, reroute required. " * 12
+    for _ in range(prompt_compact.ANSWER_SAMPLES - 1):
+        record_answer("risk", one, answer)
+    assert max_tokens_for("risk", one) == static  # not enough samples yet
+    record_answer("risk", one, answer)
+    assert max_tokens_for("risk", one) >= len(answer) // 4 * 1.2
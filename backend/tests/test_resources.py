@@ -0,0 +1,15 @@
+from fastapi.testclient import TestClient
+
+from backend.ai_providers.resources import get_resources
+
+
+def test_lifespan_shares_and_closes_clients():
+    from backend.app import app
+
+    with TestClient(app) as client:
+        res = app.state.providers
+        assert res is get_resources()
+        session = res.http_session()
+        assert res.http_session() is session
+        assert client.get("/health").status_code == 200
+    assert res._http is None
@@ -1 +1,15 @@
+from backend.utils.route_extract import process_eline
+
+
 def test_seg(): assert True
+
+
+def test_segment_local_fl_bands():
+    eline = ("FLW ATS RTE SEGMENTS CLSD: A822 LONKA-NEDAG FL275-FL540, "
+             "R497 UPLIV-RINMU FL280-FL540.")
+    segments, fl_info = process_eline(eline, "", "", "UNXX/QARLC/IV/NBO/E/275/540/")
+    assert [(s.route, s.segment, s.fl) for s in segments] == [
+        ("A822", "LONKA-NEDAG", "FL275-FL540"),
+        ("R497", "UPLIV-RINMU", "FL280-FL540"),
+    ]
+    assert fl_info.label() == "FL275-FL540"
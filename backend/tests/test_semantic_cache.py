@@ -0,0 +1,49 @@
+import asyncio
+
+from backend.ai import fallback_chain
+from backend.utils import memory_engine
+from backend.utils.semantic_cache import SEMANTIC_CACHE, SemanticCache
+
+NOTAM = """L5570/25 NOTAMN
+Q)UIII/QARLC/IV/NBO/E/095/230/5139N11211E096
+A)UIII B)2508150000 C)2508152359
+E)ATS RTE A810 SEGMENT RINOP-AGINO CLSD.
+FROM FL095 TO FL230"""
+REISSUED = NOTAM.replace("L5570/25", "L5601/25").replace("250815", "250822")
+
+
+def test_near_duplicate_reused_but_not_other_levels_or_routes():
+    cache = SemanticCache(threshold=0.9)
+    cache.put("super", NOTAM, "answer", "openai")
+    hit = cache.lookup("super", REISSUED)
+    assert hit.value == "answer" and 0.9 <= hit.score < 1
+    assert cache.lookup("super", NOTAM.replace("FL230", "FL240")) is None
+    assert cache.lookup("super", NOTAM.replace("A810", "A811")) is None
+    assert cache.lookup("explain", REISSUED) is None
+    assert cache.stats()["exact_hits"] == 0 and cache.lookup("super", NOTAM).score == 1.0
+
+
+def test_index_bounds_and_invalidation():
+    cache = SemanticCache(maxsize=2)
+    for i in range(3):
+        cache.put("t", NOTAM.replace("A810", f"A81{i}"), i, "openai")
+    assert cache.stats()["size"] == 2
+    assert cache.lookup("t", NOTAM.replace("A810", "A810")) is None  # evicted
+    assert cache.invalidate_tags({"RINOP"}) == 2 and cache.stats()["size"] == 0
+
+
+def test_fallback_records_cache_hit_in_sources(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    calls = []
+
+    async def provider(name, prompt, max_tokens=None, json_schema=None):
+        calls.append(name)
+        return '{"segments": [], "explanation": "closed"}'
+
+    SEMANTIC_CACHE.clear()
+    monkeypatch.setattr(fallback_chain, "call_provider", provider)
+    first = asyncio.run(fallback_chain.intelligent_fallback(NOTAM, "ai-first"))
+    second = asyncio.run(fallback_chain.intelligent_fallback(REISSUED, "ai-first"))
+    assert len(calls) == 1
+    assert "semantic-cache" in second["sources"] and "semantic-cache" not in first["sources"]
+    assert second["output"]["json"] == first["output"]["json"]
@@ -0,0 +1,43 @@
+import gc
+import multiprocessing
+
+from backend.utils import memory_engine, shared_store
+from backend.utils.memory_index import MemoryIndex
+
+
+def _save_many(store, worker, n):
+    memory_engine.MEM_FILE = store
+    for i in range(n):
+        memory_engine.save_memory_entry(f"E)W{worker} FIX{i:02d}-KARVI CLSD", {})
+
+
+def test_workers_write_through_one_writer(tmp_path, monkeypatch):
+    store = tmp_path / "mem.json"
+    monkeypatch.setattr(memory_engine, "MEM_FILE", store)
+    index = MemoryIndex()
+    assert index.stats()["entries"] == 0
+    start = memory_engine.generation()
+
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_save_many, args=(store, w, 10)) for w in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    assert all(p.exitcode == 0 for p in procs)
+
+    # no lost updates, ids stay unique, every write moved the shared counter
+    ids = [e["id"] for e in memory_engine.get_all_memory_entries()]
+    assert ids == list(range(1, 41))
+    assert memory_engine.generation() == start + 40
+    assert index.stats()["entries"] == 40  # picked up writes made elsewhere
+
+
+def test_prefork_warm_freezes_built_indexes(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_engine, "MEM_FILE", tmp_path / "mem.json")
+    memory_engine.save_memory_entry("E)W187 TUSLI-KARVI CLSD", "W187 TUSLI-KARVI FL000-FL290")
+    try:
+        stats = shared_store.prefork_warm()
+        assert stats["frozen"] > 0 and stats["memory_index"]["entries"] == 1
+    finally:
+        gc.unfreeze()
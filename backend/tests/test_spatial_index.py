@@ -0,0 +1,44 @@
+from backend.utils.q_e_logic import extract_qline, extract_notam_id
+from backend.utils.spatial_index import SpatialIndex, distance_nm
+
+NOTAM = """Q0381/25 NOTAMN
+Q)UUWV/QARLC/IV/NBO/E/000/999/5435N02024E028
+A)UUWV B)2508150000 C)2508152359
+E)ATS RTE L736 NEDRA-GOMED CLSD"""
+
+
+def test_qline_coords_and_radius_decoded():
+    q = extract_qline(NOTAM)
+    assert (q["lat"], q["lon"], q["radius"]) == (54.5833, 20.4, 28)
+    assert extract_qline("Q)KZNY/QARLC/IV/NBO/AE/095/230/4030S07400W005")["lon"] == -74.0
+    assert extract_qline("Q)UIII/QARLC/IV/NBO/E/095/230/")["lat"] is None
+    assert extract_notam_id(NOTAM) == "Q0381/25"
+
+
+def test_point_bbox_and_corridor_queries():
+    idx = SpatialIndex(cell_deg=1.0)
+    assert idx.add_notam(NOTAM) == "UUWV:Q0381/25"
+    idx.add("far", 10.0, 10.0, 20)
+    idx.add("fir", 60.0, 30.0, 999)  # whole-FIR area, kept in the wide list
+
+    assert [a.key for a in idx.query_point(54.7, 20.5)] == ["UUWV:Q0381/25", "fir"]
+    assert [a.key for a in idx.query_point(55.5, 20.4)] == ["fir"]  # 55 NM north
+    assert [a.key for a in idx.query_bbox(54.9, 20.0, 56.0, 21.0)] == ["UUWV:Q0381/25", "fir"]
+    assert "UUWV:Q0381/25" not in [a.key for a in idx.query_bbox(55.2, 20.0, 56.0, 21.0)]
+
+    route = [(54.0, 19.0), (55.0, 22.0)]
+    assert "UUWV:Q0381/25" in [a.key for a in idx.query_corridor(route, width_nm=5)]
+    assert [a.key for a in idx.query_corridor([(53.0, 19.0), (53.0, 22.0)], 5)] == ["fir"]
+    assert idx.stats()["avg_scored"] < len(idx)
+
+
+def test_antimeridian_and_reindex():
+    idx = SpatialIndex(cell_deg=1.0)
+    idx.add("dateline", 0.0, 179.9, 30)
+    assert [a.key for a in idx.query_point(0.0, -179.8)] == ["dateline"]
+    assert [a.key for a in idx.query_bbox(-1, 179.5, 1, -179.5)] == ["dateline"]
+    assert distance_nm(0, 179.9, 0, -179.8) < 20
+
+    idx.add("dateline", 10.0, 10.0, 5)  # replace moves it
+    assert idx.query_point(0.0, -179.8) == [] and len(idx) == 1
+    assert idx.remove("dateline") and idx.stats()["cells"] == 0
@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.ai_providers.health import HEALTH
+from backend.ai_providers.streaming import stream_with_fallback
+from backend.routers import ai as ai_router
+from backend.utils.metrics import METRICS
+
+
+def _collect(agen):
+    async def go():
+        return [item async for item in agen]
+    return asyncio.run(go())
+
+
+def test_stalled_provider_falls_back_before_first_token():
+    HEALTH.reset()
+    METRICS.reset()
+
+    def stalled(prompt, max_tokens=None):
+        time.sleep(0.3)
+        yield "late"
+
+    async def fast(prompt, max_tokens=None):
+        for tok in ("RWY ", "CLSD"):
+            yield tok
+
+    streams = {"slow": stalled, "fast": fast}
+    events = _collect(stream_with_fallback("p", ["slow", "fast"], 0.05, streams.__getitem__))
+    assert events == [("provider", "fast"), ("token", "RWY "), ("token", "CLSD")]
+    assert HEALTH.snapshot()["slow"]["last_error"] == "stalled before first token"
+    assert METRICS.summary("ai_ttft_seconds", provider="fast")["count"] == 1
+
+
+def test_empty_and_failing_streams_yield_nothing():
+    HEALTH.reset()
+
+    def empty(prompt, max_tokens=None):
+        return iter(())
+
+    def broken(prompt, max_tokens=None):
+        raise RuntimeError("down")
+
+    streams = {"a": empty, "b": broken}
+    assert _collect(stream_with_fallback("p", ["a", "b"], 0.5, streams.__getitem__)) == []
+
+
+def test_sse_endpoint_relays_tokens(monkeypatch):
+    async def fake(prompt, providers, max_tokens=None):
+        yield "provider", "openai"
+        yield "token", "Runway "
+        yield "token", "closed"
+
+    monkeypatch.setattr(ai_router, "stream_with_fallback", fake)
+    from fastapi import FastAPI
+    app = FastAPI()
+    app.include_router(ai_router.router)
+    body = TestClient(app).post("/ai/explain/stream", json={"notam": "E)RWY CLSD"}).text
+    assert body.startswith('event: provider\ndata: {"provider": "OpenAI"}')
+    assert '"token": "closed"' in body and "event: done" in body
+
+
+def test_streamed_answer_is_cached_under_provider_name(monkeypatch):
+    from backend.utils.semantic_cache import SEMANTIC_CACHE
+
+    async def fake(prompt, providers, max_tokens=None):
+        yield "provider", "openai"
+        yield "token", "Runway closed"
+
+    monkeypatch.setattr(ai_router, "stream_with_fallback", fake)
+    SEMANTIC_CACHE.clear()
+    from fastapi import FastAPI
+    app = FastAPI()
+    app.include_router(ai_router.router)
+    TestClient(app).post("/ai/risk/stream", json={"notam": "E)RWY 07/25 CLSD"})
+    # same source label ai_controller uses, so cached_ai reports "semantic-cache:openai"
+    assert SEMANTIC_CACHE.lookup("risk", "E)RWY 07/25 CLSD").source == "openai"
+    SEMANTIC_CACHE.clear()
+
+
+def test_disconnect_releases_probe_and_slot():
+    from backend.ai_providers.health import HALF_OPEN
+    from backend.ai_providers.limits import get_limiter
+
+    HEALTH.reset()
+    breaker = HEALTH.get("probe").breaker
+    breaker.state = HALF_OPEN
+
+    async def endless(prompt, max_tokens=None):
+        while True:
+            yield "tok "
+
+    async def go():
+        agen = stream_with_fallback("p", ["probe"], 0.5, lambda name: endless)
+        assert await agen.__anext__() == ("provider", "probe")
+        await agen.aclose()  # client went away mid-stream
+
+    asyncio.run(go())
+    assert get_limiter("probe").concurrency.inflight == 0
+    assert breaker.state == HALF_OPEN and HEALTH.allow("probe")
@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+from backend.ai import fallback_chain
+from backend.ai.structured import iter_segments, structured_result
+from backend.utils.json_stream import ArrayItemParser
+from backend.utils.semantic_cache import SEMANTIC_CACHE
+
+NOTAM = """Q)UIII/QARLC/IV/NBO/E/095/230/5139N11211E096
+E)ATS RTE A810 SEGMENT RINOP-AGINO CLSD.
+FROM FL095 TO FL230"""
+
+ANSWER = json.dumps({
+    "explanation": "Route closed [see segments]",
+    "segments": [
+        {"route": "A810", "from": "RINOP", "to": "AGINO", "fl_lower": 50, "fl_upper": 300},
+        {"route": "B1", "from": "1-X", "to": "ABC", "fl_lower": None, "fl_upper": None},
+        {"route": "W187", "from": "TUSLI", "to": "(DNH)", "fl_lower": None, "fl_upper": None},
+    ],
+})
+
+
+def test_items_emitted_as_soon_as_they_close():
+    parser = ArrayItemParser(key="segments")
+    cut = ANSWER.index("}") + 1  # end of the first segment object
+    first = parser.feed(ANSWER[:cut])
+    assert [s["route"] for s in first] == ["A810"]
+    rest = parser.feed(ANSWER[cut:])
+    assert [s["route"] for s in rest] == ["B1", "W187"] and parser.done
+
+
+def test_validated_into_parser_segments():
+    chunks = [ANSWER[i:i + 5] for i in range(0, len(ANSWER), 5)]
+    assert [s.route for s in iter_segments(chunks)] == ["A810", "W187"]
+    res = structured_result(NOTAM, chunks)
+    assert res["text"] == "Route closed [see segments]"
+    a810, w187 = res["json"]
+    assert a810.fl == "FL095-FL230" and a810.band.adjusted  # clamped to Q
+    assert w187.segment == "TUSLI-DNH" and w187.fl == "FL095-FL230"
+
+
+def test_callers_parsed_notam_is_reused(monkeypatch):
+    from backend.controllers import parser_controller
+    from backend.utils.parse_cache import PARSE_CACHE
+
+    calls = []
+    real = parser_controller.build_parsed_notam
+    monkeypatch.setattr(parser_controller, "build_parsed_notam", lambda text: calls.append(text) or real(text))
+    PARSE_CACHE.clear()
+    parser_controller.process_notam(NOTAM)
+    res = structured_result(NOTAM, ANSWER, parser_controller.parsed_notam(NOTAM))
+    assert len(calls) == 1  # one parser pass shared by the parser output and the AI merge
+    assert res["json"][0].fl == "FL095-FL230"
+
+
+def test_fallback_merges_structured_ai_segments(monkeypatch):
+    async def provider(name, prompt, max_tokens=None, json_schema=None):
+        assert json_schema and "JSON only" in prompt
+        return ANSWER
+
+    SEMANTIC_CACHE.clear()
+    monkeypatch.setattr(fallback_chain, "call_provider", provider)
+    monkeypatch.setattr(fallback_chain, "memory_learn", lambda *a, **k: None)
+    result = asyncio.run(fallback_chain.intelligent_fallback("E)RWY 09/27 CLSD DUE WIP", "ai-first"))
+    assert result["output"]["merged"]
+    assert [s["route"] for s in result["output"]["json"]] == ["A810", "W187"]
@@ -0,0 +1,104 @@
+import random
+import time
+from datetime import datetime, timezone
+
+from backend.utils import notam_store
+from backend.utils.interval_tree import IntervalTree
+from backend.utils.spatial_index import SPATIAL_INDEX
+from backend.utils.validity import SCHEDULE_HORIZON_DAYS, ValidityIndex, notam_validity, parse_schedule
+
+NOTAM = """Q0381/25 NOTAMN
+Q)UUWV/QARLC/IV/NBO/E/000/999/5435N02024E028
+A)UUWV B)2508120000 C)2508172359
+D)%s
+E)ATS RTE L736 NEDRA-GOMED CLSD"""
+
+
+def ts(s):
+    return datetime.strptime(s, "%y%m%d%H%M").replace(tzinfo=timezone.utc).timestamp()
+
+
+def test_schedules_decoded():
+    v = notam_validity(NOTAM % "12-15 0600-2200")
+    assert v.scheduled and len(v.intervals) == 4
+    assert v.active_at(ts("2508130700")) and not v.active_at(ts("2508132300"))
+    assert not v.active_at(ts("2508160700"))
+
+    night = notam_validity(NOTAM % "2200-0600")
+    assert night.active_at(ts("2508140300")) and not night.active_at(ts("2508141200"))
+    assert len(notam_validity(NOTAM % "MON-FRI 0600-1600").intervals) == 4  # 12th is a Tuesday
+    assert parse_schedule("15 16 0000-1900")[0].days == {(None, 15), (None, 16)}
+
+    fallback = notam_validity(NOTAM % "SR-SS")  # unknown → whole B–C window
+    assert not fallback.scheduled and fallback.intervals == [(ts("2508120000"), ts("2508172359"))]
+    assert notam_validity("B)2508120000 C)PERM\nE)X").permanent
+
+
+def test_interval_tree_matches_brute_force():
+    rnd = random.Random(7)
+    tree, items = IntervalTree(seed=1), []
+    for i in range(500):
+        lo = rnd.uniform(0, 1000)
+        item = (lo, lo + rnd.uniform(0, 50), f"k{i}")
+        tree.insert(*item)
+        items.append(item)
+    for item in items[::3]:
+        assert tree.remove(*item)
+    items = [it for n, it in enumerate(items) if n % 3]
+    for _ in range(200):
+        a = rnd.uniform(0, 1050)
+        b = a + rnd.uniform(0, 30)
+        assert sorted(tree.overlap(a, b)) == sorted(it for it in items if it[0] <= b and it[1] > a)
+        assert sorted(tree.at(a)) == sorted(it for it in items if it[0] <= a < it[1])
+    assert len(tree) == len(items)
+
+
+def test_active_queries_and_expiry_eviction():
+    idx = ValidityIndex(evict_interval=0)
+    idx.add("daily", notam_validity(NOTAM % "DAILY 0200-0900"))
+    idx.add("perm", notam_validity("B)2508120000 C)PERM\nE)X"))
+    assert idx.active_at(ts("2508140300")) == ["daily", "perm"]
+    assert idx.active_at(ts("2508141200")) == ["perm"]
+    assert idx.active_during(ts("2508141200"), ts("2508150230")) == ["daily", "perm"]
+
+    assert idx.evict_expired(ts("2508180000")) == ["daily"]
+    assert idx.stats()["intervals"] == 1
+
+
+def test_store_evicts_expired_from_every_index():
+    notam_store.clear()
+    assert notam_store.index_notam(NOTAM % "H24", now=ts("2508130000"))["id"] == "Q0381/25"
+    assert [a.key for a in SPATIAL_INDEX.query_point(54.6, 20.4)] == ["UUWV:Q0381/25"]
+    assert notam_store.evict_expired(ts("2508180000")) == ["UUWV:Q0381/25"]
+    assert SPATIAL_INDEX.query_point(54.6, 20.4) == []
+    assert notam_store.index_notam(NOTAM % "H24", now=ts("2508180000")) is None  # already expired
+
+
+def test_perm_schedule_extends_past_horizon():
+    idx = ValidityIndex(evict_interval=0)
+    v = notam_validity("B)2508120000 C)PERM\nD)DAILY 0200-0900\nE)X")
+    idx.add("perm", v)
+    later = ts("2808140300")  # three years on, well past SCHEDULE_HORIZON_DAYS
+    assert v.active_at(later) and not v.active_at(ts("2808141200"))
+    assert idx.active_at(later) == ["perm"]
+    assert idx.active_at(ts("2808141200")) == []
+    assert idx.active_during(ts("2808141200"), ts("2808150230")) == ["perm"]
+    idx.remove("perm")
+    assert idx.stats()["intervals"] == 0
+
+
+def test_far_future_query_is_not_materialized():
+    idx = ValidityIndex(evict_interval=0)
+    idx.add("perm", notam_validity("B)2508120000 C)PERM\nD)DAILY 0200-0900\nE)X"))
+    far = datetime(2400, 1, 1, 3, tzinfo=timezone.utc).timestamp()
+    assert idx.active_at(far) == ["perm"]
+    assert idx.active_during(far + 8 * 3600, far + 20 * 3600) == []
+    # the tree holds one interval per day from B) up to now + the horizon only
+    days = (time.time() - ts("2508120000")) / 86400 + SCHEDULE_HORIZON_DAYS
+    assert idx.stats()["intervals"] <= days + 2
+
+
+def test_month_day_range_wraps_into_next_month():
+    days = parse_schedule("AUG 30-02 0600-1800")[0].days
+    assert days == {(8, 30), (8, 31), (9, 1), (9, 2)}
+    assert (1, 1) in parse_schedule("DEC 31-01 H24")[0].days
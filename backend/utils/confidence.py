@@ -1,32 +1,34 @@
 # Batch 7E-4 — Confidence Engine
 
-def score_fl(fl_info: dict) -> float:
+from backend.utils.models import FLBand, Segment
+
+def score_fl(fl_info: FLBand) -> float:
     """Score flight-level info."""
     score = 1.0
-    if fl_info.get("adjusted"):
+    if fl_info.adjusted:
         score -= 0.15
     return max(score, 0.0)
 
 
-def score_segments(segments: list[dict]) -> float:
+def score_segments(segments: list[Segment]) -> float:
     """Score how good the parsed segments are."""
     if not segments:
         return 0.0
 
     good = 0
     for s in segments:
-        if len(s.get("from", "")) >= 3 and len(s.get("to", "")) >= 3:
+        if len(s.from_fix) >= 3 and len(s.to_fix) >= 3:
             good += 1
 
     return good / len(segments)
 
 
-def score_memory_usage(segments: list[dict]) -> float:
+def score_memory_usage(segments: list[Segment]) -> float:
     """Placeholder: later can factor in memory usage quality."""
     return 0.1
 
 
-def evaluate(segments: list[dict], fl_info: dict) -> float:
+def evaluate(segments: list[Segment], fl_info: FLBand) -> float:
     """Combine all subscores into a single confidence score."""
     w_fl = 0.4
     w_seg = 0.5
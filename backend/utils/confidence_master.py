@@ -4,15 +4,31 @@
 
 from backend.utils.route_extract import process_eline
 from backend.utils.confidence import evaluate
+from backend.utils.fl_engine import fl_for
+from backend.utils.models import ParsedNotam
+from backend.utils.normalize import normalize_notam
 
-def master_confidence(eline, fline, gline, qline):
-    segments, fl_info = process_eline(eline, fline, gline, qline)
+def master_confidence(eline, fline, gline, qline, fl_info=None):
+    segments, fl_info = process_eline(eline, fline, gline, qline, fl_info)
     score = evaluate(segments, fl_info)
-    return {
-        "segments": segments,
-        "fl_info": fl_info,
-        "confidence": score
-    }
+    return ParsedNotam(
+        fl_info=fl_info,
+        segments=segments,
+        confidence=score
+    )
+
+def build_parsed_notam(notam_text):
+    """
+    normalize → FL engine (once) → route_extract → confidence.
+    Returns a ParsedNotam carrying cleaned text, sections and the cached FL band.
+    """
+    cleaned, sections = normalize_notam(notam_text)
+    parsed = ParsedNotam(cleaned=cleaned, sections=sections)
+    fl_info = fl_for(parsed)
+    parsed.segments, _ = process_eline(sections.e, sections.f, sections.g, sections.q, fl_info)
+    parsed.confidence = evaluate(parsed.segments, fl_info)
+    return parsed
+
 def evaluate_confidence(*args, **kwargs) -> float:
     """
     Compatibility wrapper used by fallback_chain.
@@ -0,0 +1,202 @@
+# Batch 10.20 — Corpus Warm Start
+# Read-only memory layer built from the verified i/p → O/P pairs shipped in
+# "awy outputs only.txt", so memory lookups help before anything is learned.
+# Handles:
+#   - corpus → entries (NOTAM, verified output, segments)
+#   - fix dictionary: station names → idents (DUNHUANG VOR'DNH' → DNH)
+#   - airway segments seen per route
+#   - prebuilt snapshot (backend.utils.snapshot), rebuilt when the corpus
+#     file changes
+# Learned memory (memory_store.json) is always consulted first.
+
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.utils.snapshot import fingerprint, read_snapshot, write_snapshot
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CORPUS_FILE = Path(os.getenv("WARM_START_CORPUS", str(REPO_ROOT / "awy outputs only.txt")))
+SNAPSHOT_FILE = Path(os.getenv("WARM_START_SNAPSHOT",
+                               str(Path(__file__).resolve().parent / "corpus_memory.snapshot")))
+WARM_START = os.getenv("WARM_START", "1") not in ("0", "false", "False", "")
+SNAPSHOT_VERSION = 1
+
+_INPUT_RE = re.compile(r"(?im)^[ \t]*i/p:[ \t]*$")
+_OUTPUT_RE = re.compile(r"(?im)^[ \t]*O/P:[ \t]*$")
+_SEG_RE = re.compile(
+    r"\b([A-Z]{1,2}\d{1,4}[A-Z]?)\s+([A-Z0-9]{2,7})\s*-\s*([A-Z0-9]{2,7})"
+    r"\s+(FL\d{3}|GND|SFC)\s*-\s*(FL\d{3}|UNL)"
+)
+_STATION_RE = re.compile(
+    r"([A-Z][A-Z/ ]{2,40}?)\s*(?:D?VOR(?:[ /]?DME)?|NDB|DME|TACAN|VORTAC)\s*[(']\s*([A-Z]{2,3})\s*[)']"
+)
+
+
+def parse_pairs(text: str) -> List[Tuple[str, str]]:
+    """(NOTAM, output) pairs; blocks with an empty side are skipped."""
+    pairs = []
+    for block in _INPUT_RE.split(text.replace("\r\n", "\n"))[1:]:
+        parts = _OUTPUT_RE.split(block, 1)
+        if len(parts) != 2:
+            continue
+        notam, output = parts[0].strip(), parts[1].strip()
+        if notam and output:
+            pairs.append((notam, output))
+    return pairs
+
+
+def output_segments(output: str) -> List[Dict[str, str]]:
+    """Segments of a verified output, in the API dict shape."""
+    return [
+        {"route": r, "from": a, "to": b, "fl": f"{lo}-{hi}"}
+        for r, a, b, lo, hi in _SEG_RE.findall(output.upper())
+    ]
+
+
+def station_names(notam: str, idents: set) -> Dict[str, str]:
+    """Station name → ident, kept only when the ident is in the verified output."""
+    names = {}
+    for name, ident in _STATION_RE.findall(notam.upper()):
+        if ident not in idents:
+            continue
+        words = name.split()
+        if not words:
+            continue
+        full = words[-1]
+        for key in {full, *full.split("/")}:
+            if len(key) >= 3 and key != ident:
+                names[key] = ident
+    return names
+
+
+def build_snapshot(text: str) -> Dict[str, Any]:
+    """Everything the layer serves, in marshal-friendly types."""
+    from backend.utils.similarity import operational_tokens
+
+    entries, tokens = [], []
+    fixes: Dict[str, Optional[str]] = {}
+    by_fix: Dict[str, int] = {}
+    routes: Dict[str, List[List[str]]] = {}
+    seen = set()
+    for notam, output in parse_pairs(text):
+        if notam in seen:
+            continue
+        seen.add(notam)
+        segments = output_segments(output)
+        idx = len(entries)
+        entries.append({
+            "notam": notam,
+            "output": output,
+            "aviation": {"segments": segments},
+            "source": "corpus",
+        })
+        op, full = operational_tokens(notam)
+        tokens.append((tuple(sorted(op)), tuple(sorted(full))))
+        idents = set()
+        for seg in segments:
+            for fix in (seg["from"], seg["to"]):
+                idents.add(fix)
+                by_fix.setdefault(fix, idx)
+            pair = [seg["from"], seg["to"]]
+            if pair not in routes.setdefault(seg["route"], []):
+                routes[seg["route"]].append(pair)
+        for name, ident in station_names(notam, idents).items():
+            if fixes.get(name, ident) != ident:
+                ident = None  # same name, different idents: ambiguous
+            fixes[name] = ident
+    return {
+        "entries": entries,
+        "tokens": tokens,
+        "fixes": {k: v for k, v in fixes.items() if v},
+        "by_fix": by_fix,
+        "routes": routes,
+    }
+
+
+class CorpusMemory:
+    """
+    Loads the snapshot on first use (building it from the corpus when it
+    is missing, from another version, or older than the corpus file).
+    """
+
+    def __init__(self, corpus: Path = CORPUS_FILE, snapshot: Path = SNAPSHOT_FILE):
+        self.corpus = Path(corpus)
+        self.snapshot = Path(snapshot)
+        self._lock = threading.Lock()
+        self._data: Optional[Dict[str, Any]] = None
+        self.source = None       # "snapshot" | "corpus" | "missing"
+        self.load_ms = 0.0
+
+    def load(self) -> "CorpusMemory":
+        if self._data is not None:
+            return self
+        with self._lock:
+            if self._data is None:
+                t0 = time.perf_counter()
+                self._data, self.source = self._load()
+                self.load_ms = round((time.perf_counter() - t0) * 1000, 2)
+        return self
+
+    def _load(self) -> Tuple[Dict[str, Any], str]:
+        fp = fingerprint(self.corpus)
+        data = read_snapshot(self.snapshot, "corpus_memory", SNAPSHOT_VERSION)
+        if data is not None and data.get("corpus") == fp:
+            return data, "snapshot"
+        if fp is None:
+            return build_snapshot(""), "missing"
+        data = build_snapshot(self.corpus.read_text(encoding="utf-8", errors="replace"))
+        data["corpus"] = fp
+        write_snapshot(self.snapshot, "corpus_memory", SNAPSHOT_VERSION, data)
+        return data, "corpus"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._data = None
+
+    # ---- lookups ----
+
+    def entries(self) -> List[Dict[str, Any]]:
+        return self.load()._data["entries"]
+
+    def lookup_fix(self, name: str) -> Optional[str]:
+        """Ident for a station name seen in the corpus (DUNHUANG → DNH)."""
+        return self.load()._data["fixes"].get(str(name or "").strip().upper())
+
+    def entry_for_fix(self, code: str) -> Optional[Dict[str, Any]]:
+        """First corpus entry whose verified output uses the fix."""
+        data = self.load()._data
+        idx = data["by_fix"].get(str(code or "").strip().upper())
+        return None if idx is None else data["entries"][idx]
+
+    def segments_of(self, route: str) -> List[List[str]]:
+        return self.load()._data["routes"].get(str(route or "").strip().upper(), [])
+
+    def similar(self, op_tokens, full_tokens, threshold: float) -> Tuple[float, Optional[Dict[str, Any]]]:
+        """Best corpus entry by similarity.combined_score (tokens precomputed)."""
+        from backend.utils.similarity import combined_score
+
+        data = self.load()._data
+        best, best_entry = 0.0, None
+        for entry, (op, full) in zip(data["entries"], data["tokens"]):
+            score = combined_score(op_tokens, full_tokens, op, full)
+            if score >= threshold and score > best:
+                best, best_entry = score, entry
+        return best, best_entry
+
+    def stats(self) -> Dict[str, Any]:
+        data = self.load()._data
+        return {
+            "source": self.source,
+            "load_ms": self.load_ms,
+            "entries": len(data["entries"]),
+            "fixes": len(data["fixes"]),
+            "routes": len(data["routes"]),
+            "segments": sum(len(v) for v in data["routes"].values()),
+        }
+
+
+CORPUS_MEMORY = CorpusMemory()
@@ -5,7 +5,7 @@ Used by parser, segment builder, route logic, and memory engine.
 """
 
 import re
-from backend.utils.memory_engine import memory_lookup_fix
+from backend.utils.memory_engine import memory_lookup
 
 
 # -------------------------
@@ -67,8 +67,9 @@ def guess_fix_from_memory(bad_fix: str) -> str | None:
       memory: 'MAVAX'
     """
     try:
-        correction = memory_lookup_fix(bad_fix)
-        return correction
+        # learned corrections (memory_engine.learn_fix); memory_lookup_fix
+        # returns whole entries, not a fix name
+        return memory_lookup(bad_fix)
     except Exception:
         return None
 
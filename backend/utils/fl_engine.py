@@ -0,0 +1,199 @@
+
+# Batch 10.2 — Unified FL Engine
+# One pass per NOTAM over Q / F / G / inline E altitudes.
+# Replaces the separate rules in fl_master (round), fl_utils (ceil)
+# and tools/offline_parser_py (floor) with one configurable policy:
+# - Priority: inline E > F/G > Q-line
+# - Units: FL, FT, M, SFC/GND, UNL, bare F/G numbers (FL units)
+# - Clamp to Q-line band (final defense)
+# The result is cached on ParsedNotam.fl_info (see fl_for).
+
+import math
+import os
+import re
+from backend.utils.models import FLBand
+
+ROUNDING_POLICIES = {
+    "round": lambda v: int(round(v)),
+    "ceil": math.ceil,
+    "floor": math.floor,
+}
+
+DEFAULT_ROUNDING = os.getenv("FL_ROUNDING", "round").lower()
+if DEFAULT_ROUNDING not in ROUNDING_POLICIES:
+    DEFAULT_ROUNDING = "round"
+
+FL_UNLIMITED = 999
+
+_Q_FL_RE = re.compile(r"/E/(\d{1,3})/(\d{1,3})(?:/|\b)")
+_NUM = r"\d{1,3}(?:,\d{3})+|\d+"
+_ALT_RE = re.compile(
+    r"\b(?P<alt>UNL(?:IMITED)?|SFC|GND"
+    r"|FL\s*\d{1,3}"
+    r"|(?:" + _NUM + r")\s*(?:FT|M)\b)"
+)
+_SEP_RE = re.compile(r"^\s*(?:-|–|/|TO)\s*$")
+_BELOW_RE = re.compile(r"^\s*(?:AND|OR)\s+BELOW\b")
+_ABOVE_RE = re.compile(r"^\s*(?:AND|OR)\s+ABOVE\b")
+
+
+def _policy(rounding):
+    return ROUNDING_POLICIES[(rounding or DEFAULT_ROUNDING).lower()]
+
+
+def feet_to_fl(ft_val, rounding=None):
+    return int(_policy(rounding)(ft_val / 100))
+
+
+def meters_to_fl(m_val, rounding=None):
+    return feet_to_fl(m_val * 3.28084, rounding)
+
+
+def parse_alt(token, rounding=None):
+    """
+    One altitude token → FL units.
+    SFC/GND → 0, UNL → 999, FLxxx, xxxFT, xxxM, bare number (F/G lines).
+    """
+    if not token:
+        return None
+    t = token.strip().upper()
+    if t.startswith("UNL"):
+        return FL_UNLIMITED
+    if t in ("SFC", "GND"):
+        return 0
+    if t.startswith("FL"):
+        digits = t[2:].strip()
+        return int(digits) if digits.isdigit() else None
+
+    m = re.match(r"(" + _NUM + r")\s*(FT|M)?\b", t)
+    if not m:
+        return None
+    value = int(m.group(1).replace(",", ""))
+    unit = m.group(2)
+    if unit == "FT":
+        return feet_to_fl(value, rounding)
+    if unit == "M":
+        return meters_to_fl(value, rounding)
+    return value
+
+
+def scan_inline_bands(text, rounding=None):
+    """
+    Single left-to-right scan of altitude tokens in free text.
+    Returns (start, end, low, high) for every band found:
+    - pairs joined by -, /, TO (FL045-FL130, FROM GND TO FL341)
+    - single tokens with AND BELOW / AND ABOVE
+    - lone FL tokens as a one-level band
+    """
+    if not text:
+        return []
+    t = text.upper()
+    bands = []
+    prev = None  # (match, value) waiting for a partner
+    for m in _ALT_RE.finditer(t):
+        val = parse_alt(m.group("alt"), rounding)
+        if val is None:
+            continue
+        if prev is not None and _SEP_RE.match(t[prev[0].end():m.start()]):
+            lo, hi = prev[1], val
+            bands.append((prev[0].start(), m.end(), min(lo, hi), max(lo, hi)))
+            prev = None
+            continue
+        if prev is not None:
+            bands.append(_single_band(t, *prev))
+        prev = (m, val)
+    if prev is not None:
+        bands.append(_single_band(t, *prev))
+    return [b for b in bands if b is not None]
+
+
+def _single_band(text, m, val):
+    tail = text[m.end():m.end() + 16]
+    if _BELOW_RE.match(tail):
+        return (m.start(), m.end(), 0, val)
+    if _ABOVE_RE.match(tail):
+        return (m.start(), m.end(), val, FL_UNLIMITED)
+    if m.group("alt").startswith("FL"):
+        return (m.start(), m.end(), val, val)
+    return None
+
+
+def extract_q_band(qline):
+    """Q-line /E/lll/uuu/ → (lower, upper) or (None, None)."""
+    if not qline:
+        return None, None
+    m = _Q_FL_RE.search(qline)
+    if m:
+        return int(m.group(1)), int(m.group(2))
+    return None, None
+
+
+def _first(*vals):
+    for v in vals:
+        if v is not None:
+            return v
+    return None
+
+
+def combine_bands(inline, fg, q):
+    """
+    Apply priority:
+    1. Inline
+    2. F/G
+    3. Q-line
+    Then clamp to Q-line.
+    """
+    inline_low, inline_high = inline
+    fg_low, fg_high = fg
+    q_low, q_high = q
+
+    low = _first(inline_low, fg_low, q_low, 0)
+    high = _first(inline_high, fg_high, q_high, FL_UNLIMITED)
+    original_low, original_high = low, high
+    adjusted = False
+    reason = None
+
+    # Clamp against Q-line
+    if q_low is not None and low < q_low:
+        low = q_low
+        adjusted = True
+        reason = "clamped-lower-to-q"
+    if q_high is not None and high > q_high:
+        high = q_high
+        adjusted = True
+        reason = "clamped-upper-to-q"
+
+    return FLBand(
+        fl_lower=low,
+        fl_upper_final=high,
+        inline_source_low=inline_low,
+        inline_source_high=inline_high,
+        fg_source_low=fg_low,
+        fg_source_high=fg_high,
+        q_low=q_low,
+        q_high=q_high,
+        adjusted=adjusted,
+        reason=reason,
+        original_low=original_low,
+        original_high=original_high,
+    )
+
+
+def compute_fl(qline="", fline="", gline="", eline="", rounding=None):
+    """Build the NOTAM-wide FLBand from the Q/F/G/E lines in one pass each."""
+    bands = scan_inline_bands(eline, rounding)
+    inline = (bands[0][2], bands[0][3]) if bands else (None, None)
+    fg = (parse_alt(fline, rounding), parse_alt(gline, rounding))
+    return combine_bands(inline, fg, extract_q_band(qline))
+
+
+def fl_for(parsed, rounding=None):
+    """
+    Return the FLBand for a ParsedNotam, computing it at most once.
+    Every downstream consumer should go through here instead of
+    re-scanning the text.
+    """
+    if parsed.fl_info is None:
+        s = parsed.sections
+        parsed.fl_info = compute_fl(s.q, s.f, s.g, s.e, rounding)
+    return parsed.fl_info
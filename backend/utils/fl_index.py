@@ -0,0 +1,148 @@
+# Batch 10.18 — FL Band Index
+# Interval index over the (fl_lower, fl_upper_final) band of every closed
+# route segment, per NOTAM.
+# Handles:
+#   - "all segments closed at FL350" (one global tree)
+#   - "closures on airway X overlapping FL300–FL360" (one tree per route)
+#   - "closures touching fix GITOV at FL200" (one tree per fix)
+#   - remove/replace by NOTAM key (expiry, re-issue)
+# Bands are closed [lo, hi] in FL units; trees store them as [lo, hi + 1).
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.utils.interval_tree import IntervalTree
+
+
+@dataclass(slots=True)
+class SegmentBand:
+    """One closed segment of one NOTAM with its FL band."""
+    id: str            # "<notam key>#<n>"
+    notam: str
+    route: str
+    from_fix: str
+    to_fix: str
+    fl_lower: int
+    fl_upper: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "notam": self.notam,
+            "route": self.route,
+            "from": self.from_fix,
+            "to": self.to_fix,
+            "segment": f"{self.from_fix}-{self.to_fix}",
+            "fl": f"FL{self.fl_lower:03d}-FL{self.fl_upper:03d}",
+            "fl_lower": self.fl_lower,
+            "fl_upper": self.fl_upper,
+        }
+
+
+class FLIndex:
+    """Global + per-route + per-fix interval trees of segment FL bands."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._segments: Dict[str, SegmentBand] = {}
+        self._by_notam: Dict[str, List[str]] = {}
+        self._all = IntervalTree()
+        self._routes: Dict[str, IntervalTree] = {}
+        self._fixes: Dict[str, IntervalTree] = {}
+
+    def _trees(self, s: SegmentBand) -> Iterable[IntervalTree]:
+        yield self._all
+        yield self._routes.setdefault(s.route, IntervalTree())
+        yield self._fixes.setdefault(s.from_fix, IntervalTree())
+        if s.to_fix != s.from_fix:
+            yield self._fixes.setdefault(s.to_fix, IntervalTree())
+
+    def add(self, key: str, segments) -> int:
+        """
+        (Re)index the Segments of NOTAM `key` by their band (segment-local
+        or NOTAM-wide, as set by segment_builder); band-less ones are skipped.
+        """
+        rows = []
+        for n, seg in enumerate(segments or []):
+            band = getattr(seg, "band", None)
+            if band is None or not seg.route:
+                continue
+            lo, hi = sorted((int(band.fl_lower), int(band.fl_upper_final)))
+            rows.append(SegmentBand(f"{key}#{n}", key, seg.route, seg.from_fix, seg.to_fix, lo, hi))
+        with self._lock:
+            self._remove(key)
+            for s in rows:
+                self._segments[s.id] = s
+                for tree in self._trees(s):
+                    tree.insert(s.fl_lower, s.fl_upper + 1, s.id)
+            if rows:
+                self._by_notam[key] = [s.id for s in rows]
+        return len(rows)
+
+    def _remove(self, key: str) -> bool:
+        ids = self._by_notam.pop(key, None)
+        if not ids:
+            return False
+        for sid in ids:
+            s = self._segments.pop(sid)
+            for tree in self._trees(s):
+                tree.remove(s.fl_lower, s.fl_upper + 1, sid)
+            for index, name in ((self._routes, s.route), (self._fixes, s.from_fix), (self._fixes, s.to_fix)):
+                if name in index and not len(index[name]):
+                    del index[name]
+        return True
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._segments.clear()
+            self._by_notam.clear()
+            self._all.clear()
+            self._routes.clear()
+            self._fixes.clear()
+
+    def segments_of(self, key: str) -> List[SegmentBand]:
+        with self._lock:
+            return [self._segments[sid] for sid in self._by_notam.get(key, ())]
+
+    def query(self, fl_lower: int, fl_upper: Optional[int] = None,
+              route: Optional[str] = None, fix: Optional[str] = None) -> List[SegmentBand]:
+        """
+        Segments whose band overlaps [fl_lower, fl_upper] (one level when
+        fl_upper is None), optionally on `route` and/or touching `fix`.
+        """
+        lo, hi = sorted((int(fl_lower), int(fl_lower if fl_upper is None else fl_upper)))
+        route = route.upper() if route else None
+        fix = fix.upper() if fix else None
+        with self._lock:
+            if route:
+                tree = self._routes.get(route)
+            elif fix:
+                tree = self._fixes.get(fix)
+            else:
+                tree = self._all
+            if tree is None:
+                return []
+            hits = [self._segments[sid] for _, _, sid in tree.overlap(lo, hi)]
+        if route and fix:
+            hits = [s for s in hits if fix in (s.from_fix, s.to_fix)]
+        return sorted(hits, key=lambda s: (s.route, s.from_fix, s.to_fix, s.id))
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "segments": len(self._segments),
+                "notams": len(self._by_notam),
+                "routes": len(self._routes),
+                "fixes": len(self._fixes),
+            }
+
+
+FL_INDEX = FLIndex()
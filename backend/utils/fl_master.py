@@ -6,89 +6,39 @@
 # - Extract FL from Q-line
 # - Convert FT/M/AMSL/AGL
 # - Clamp against Q-line (final defense)
+#
+# Batch 10.2: parsing and rounding now live in fl_engine; the functions
+# below keep their historic names and signatures on top of it.
 
-import re
+from backend.utils import fl_engine
 
 def extract_q_fl(qline):
     """Extract FL from Q-line, format: .... /E/XXX/YYY/"""
-    if not qline:
-        return None, None
-    m = re.search(r"/E/(\d{3})/(\d{3})/", qline)
-    if m:
-        return int(m.group(1)), int(m.group(2))
-    return None, None
+    return fl_engine.extract_q_band(qline)
 
 def meters_to_fl(m_val):
-    ft = m_val * 3.28084
-    return int(round(ft / 100))
+    return fl_engine.meters_to_fl(m_val)
 
 def feet_to_fl(ft_val):
-    return int(round(ft_val / 100))
+    return fl_engine.feet_to_fl(ft_val)
 
 def parse_alt_string(text):
     """
     Detect FT, M, AMSL, AGL, UNL, SFC
     Returns altitude in FL units.
     """
-    t = text.upper()
-
-    # Unlimited
-    if "UNL" in t or "UNLIMITED" in t:
-        return 999  # very high FL
-
-    # Surface
-    if "SFC" in t:
-        return 0
-
-    # Feet
-    m = re.search(r"(\d{2,5})\s*FT", t)
-    if m:
-        return feet_to_fl(int(m.group(1)))
-
-    # Meters
-    m = re.search(r"(\d{2,5})\s*M", t)
-    if m:
-        return meters_to_fl(int(m.group(1)))
-
-    # Direct FL
-    m = re.search(r"FL(\d{2,3})", t)
-    if m:
-        return int(m.group(1))
-
-    return None
+    return fl_engine.parse_alt(text)
 
 def extract_inline_fl(eline):
     """Search inline E-line for altitudes."""
-    if not eline:
+    bands = fl_engine.scan_inline_bands(eline)
+    if not bands:
         return None, None
-
-    lower = None
-    upper = None
-
-    # patterns like "SFC TO FL230" or "SFC TO 2200M"
-    m = re.search(r"(SFC|FL\d+|\d+ ?FT|\d+ ?M).*?TO.*?(FL\d+|\d+ ?FT|\d+ ?M|UNL)", eline)
-    if m:
-        lower = parse_alt_string(m.group(1))
-        upper = parse_alt_string(m.group(2))
-
-    return lower, upper
+    return bands[0][2], bands[0][3]
 
 def extract_fg_fl(fline, gline):
-    """Extract numeric values from F) and G) lines."""
-    def num(x):
-        if not x:
-            return None
-        # F/G often give raw numbers: 000, 230, etc.
-        m = re.search(r"(\d{1,3})", x)
-        if m:
-            v = int(m.group(1))
-            return v
-        return None
-
-    f_val = num(fline)
-    g_val = num(gline)
-
-    return f_val, g_val
+    """Extract values from F) and G) lines."""
+    return fl_engine.parse_alt(fline), fl_engine.parse_alt(gline)
 
 def combine_fl(inline, fg, qline):
     """
@@ -98,46 +48,7 @@ def combine_fl(inline, fg, qline):
     3. Q-line
     Then clamp to Q-line.
     """
-    inline_low, inline_high = inline
-    fg_low, fg_high = fg
-    q_low, q_high = extract_q_fl(qline)
-
-    # Determine base values
-    low = inline_low or fg_low or q_low or 0
-    high = inline_high or fg_high or q_high or 999
-
-    original_low = low
-    original_high = high
-    adjusted = False
-    reason = None
-
-    # Clamp against Q-line
-    if q_low is not None and low < q_low:
-        low = q_low
-        adjusted = True
-        reason = "clamped-lower-to-q"
-
-    if q_high is not None and high > q_high:
-        high = q_high
-        adjusted = True
-        reason = "clamped-upper-to-q"
-
-    return {
-        "fl_lower": low,
-        "fl_upper_final": high,
-        "inline_source_low": inline_low,
-        "inline_source_high": inline_high,
-        "fg_source_low": fg_low,
-        "fg_source_high": fg_high,
-        "q_low": q_low,
-        "q_high": q_high,
-        "adjusted": adjusted,
-        "reason": reason,
-        "original_low": original_low,
-        "original_high": original_high
-    }
+    return fl_engine.combine_bands(inline, fg, extract_q_fl(qline))
 
 def fl_master(eline, fline, gline, qline):
-    inline = extract_inline_fl(eline)
-    fg = extract_fg_fl(fline, gline)
-    return combine_fl(inline, fg, qline)
+    return fl_engine.compute_fl(qline, fline, gline, eline)
@@ -5,15 +5,20 @@
 # 2. Meter → Feet → FL (ROUND UP)
 # 3. Q-line ceiling clamp (final override)
 # 4. FL structure output with adjustment metadata
+#
+# Batch 10.2: text-based wrappers over fl_engine; "ceil" stays the
+# default rounding here as per user choice.
 
 import re
-import math
+from backend.utils import fl_engine
+
+ROUNDING = "ceil"
 
 def meters_to_feet(m):
     return m * 3.28084
 
 def feet_to_fl(ft):
-    return math.ceil(ft / 100)  # ROUND UP as per user choice
+    return fl_engine.feet_to_fl(ft, ROUNDING)
 
 def extract_flight_levels(text: str):
     """
@@ -35,24 +40,10 @@ def extract_fl_from_FG(text):
     """
     f_match = re.search(r'F\)\s*([A-Z0-9]{2,6})', text)
     g_match = re.search(r'G\)\s*([A-Z0-9]{2,6})', text)
-
-    def normalize(val):
-        if not val:
-            return None
-        if val.upper().startswith("FL"):
-            return int(val.upper().replace("FL",""))
-        if val.endswith("M"):
-            try:
-                meters = int(val[:-1])
-                ft = meters_to_feet(meters)
-                return feet_to_fl(ft)
-            except:
-                return None
-        if val.isdigit():
-            return int(val)
-        return None
-
-    return normalize(f_match.group(1) if f_match else None), normalize(g_match.group(1) if g_match else None)
+    return (
+        fl_engine.parse_alt(f_match.group(1) if f_match else None, ROUNDING),
+        fl_engine.parse_alt(g_match.group(1) if g_match else None, ROUNDING),
+    )
 
 
 def extract_fl_from_inline(text):
@@ -61,74 +52,38 @@ def extract_fl_from_inline(text):
     - SFC TO FL230
     - 2500M-7500M
     """
-    # FL inline
-    m = re.search(r'FL(\d{2,3})\s*[-TOto]+\s*FL(\d{2,3})', text, re.IGNORECASE)
-    if m:
-        return int(m.group(1)), int(m.group(2))
-
-    # meters inline
-    m2 = re.search(r'(\d{3,5})M[-TOto]+(\d{3,5})M', text)
-    if m2:
-        lo_m = int(m2.group(1))
-        hi_m = int(m2.group(2))
-        lo_ft = meters_to_feet(lo_m)
-        hi_ft = meters_to_feet(hi_m)
-        return feet_to_fl(lo_ft), feet_to_fl(hi_ft)
-
-    return None, None
+    body = re.split(r'\b[FG]\)', text)[0]
+    bands = fl_engine.scan_inline_bands(body, ROUNDING)
+    if not bands:
+        return None, None
+    return bands[0][2], bands[0][3]
 
 
 def extract_fl_from_qline(text):
     """
     Q-line FL extraction: ... /E/xxx/yyy/ ...
     """
-    m = re.search(r'/E/(\d{1,3})/(\d{1,3})/', text)
-    if m:
-        return int(m.group(1)), int(m.group(2))
-    return None, None
+    return fl_engine.extract_q_band(text)
 
 
 def extract_fl(text):
     """
-    MASTER FL extraction system.
+    MASTER FL extraction system over unsplit text.
     Priority:
     1) Inline FL (SFC-XXXX)
     2) F/G lines
     3) Q-line fallback
-    Then apply Q-line ceiling clamp.
+    Then apply Q-line clamp.
     """
-
-    # Step 1: Inline
-    inline_lo, inline_hi = extract_fl_from_inline(text)
-
-    # Step 2: FG lines
-    fg_lo, fg_hi = extract_fl_from_FG(text)
-
-    # Step 3: Q-line fallback
-    q_lo, q_hi = extract_fl_from_qline(text)
-
-    # Build chosen FL
-    chosen_lo = inline_lo or fg_lo or q_lo
-    chosen_hi = inline_hi or fg_hi or q_hi
-
-    # Safety: defaults
-    if chosen_lo is None:
-        chosen_lo = 0
-    if chosen_hi is None:
-        chosen_hi = 999  # very high if undefined
-
-    # Apply Q-line ceiling clamp
-    final_hi = chosen_hi
-    was_adjusted = False
-
-    if q_hi is not None and chosen_hi > q_hi:
-        final_hi = q_hi
-        was_adjusted = True
-
+    band = fl_engine.combine_bands(
+        extract_fl_from_inline(text),
+        extract_fl_from_FG(text),
+        extract_fl_from_qline(text),
+    )
     return {
-        "fl_lower": chosen_lo,
-        "fl_upper_raw": chosen_hi,
-        "fl_upper_final": final_hi,
-        "qline_upper": q_hi,
-        "adjusted": was_adjusted
+        "fl_lower": band.fl_lower,
+        "fl_upper_raw": band.original_high,
+        "fl_upper_final": band.fl_upper_final,
+        "qline_upper": band.q_high,
+        "adjusted": band.adjusted
     }
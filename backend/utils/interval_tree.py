@@ -0,0 +1,147 @@
+# Batch 10.17 — Interval Tree
+# Augmented balanced BST (treap ordered by interval start, each node
+# carrying the max end of its subtree) for dynamic overlap queries.
+# Handles:
+#   - insert/remove in O(log n) expected
+#   - "which intervals contain x" and "which overlap [lo, hi]"; subtrees
+#     that end before the query or start after it are never visited
+# Intervals are half-open [lo, hi): hi may be float("inf") (open-ended).
+
+import random
+from typing import Any, Iterator, List, Optional, Tuple
+
+
+class _Node:
+    __slots__ = ("lo", "hi", "key", "prio", "left", "right", "max_hi")
+
+    def __init__(self, lo, hi, key, prio):
+        self.lo = lo
+        self.hi = hi
+        self.key = key
+        self.prio = prio
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+        self.max_hi = hi
+
+    def order(self):
+        return (self.lo, self.hi, self.key)
+
+
+def _update(n: _Node) -> None:
+    m = n.hi
+    if n.left is not None and n.left.max_hi > m:
+        m = n.left.max_hi
+    if n.right is not None and n.right.max_hi > m:
+        m = n.right.max_hi
+    n.max_hi = m
+
+
+def _rotate_right(n: _Node) -> _Node:
+    l = n.left
+    n.left, l.right = l.right, n
+    _update(n)
+    _update(l)
+    return l
+
+
+def _rotate_left(n: _Node) -> _Node:
+    r = n.right
+    n.right, r.left = r.left, n
+    _update(n)
+    _update(r)
+    return r
+
+
+def _insert(n: Optional[_Node], node: _Node) -> _Node:
+    if n is None:
+        return node
+    if node.order() < n.order():
+        n.left = _insert(n.left, node)
+        if n.left.prio > n.prio:
+            return _rotate_right(n)
+    else:
+        n.right = _insert(n.right, node)
+        if n.right.prio > n.prio:
+            return _rotate_left(n)
+    _update(n)
+    return n
+
+
+def _join(a: Optional[_Node], b: Optional[_Node]) -> Optional[_Node]:
+    """Join two treaps where every interval of `a` sorts before `b`."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prio > b.prio:
+        a.right = _join(a.right, b)
+        _update(a)
+        return a
+    b.left = _join(a, b.left)
+    _update(b)
+    return b
+
+
+def _delete(n: Optional[_Node], order: Tuple) -> Tuple[Optional[_Node], bool]:
+    if n is None:
+        return None, False
+    here = n.order()
+    if order == here:
+        return _join(n.left, n.right), True
+    if order < here:
+        n.left, found = _delete(n.left, order)
+    else:
+        n.right, found = _delete(n.right, order)
+    _update(n)
+    return n, found
+
+
+class IntervalTree:
+    """Multiset of (lo, hi, key) intervals; not thread-safe (callers lock)."""
+
+    def __init__(self, seed: Optional[int] = None):
+        self._root: Optional[_Node] = None
+        self._rand = random.Random(seed)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, lo, hi, key: Any) -> None:
+        self._root = _insert(self._root, _Node(lo, hi, key, self._rand.random()))
+        self._size += 1
+
+    def remove(self, lo, hi, key: Any) -> bool:
+        self._root, found = _delete(self._root, (lo, hi, key))
+        if found:
+            self._size -= 1
+        return found
+
+    def clear(self) -> None:
+        self._root = None
+        self._size = 0
+
+    def overlap(self, lo, hi) -> Iterator[Tuple[Any, Any, Any]]:
+        """(lo, hi, key) of intervals overlapping the closed window [lo, hi], by start."""
+        stack: List[_Node] = []
+        n = self._root
+        while stack or n is not None:
+            # Descend left while the left subtree can still reach the window
+            while n is not None and n.max_hi > lo:
+                stack.append(n)
+                n = n.left
+            if not stack:
+                return
+            n = stack.pop()
+            if n.lo > hi:
+                return  # everything after this starts too late
+            if n.hi > lo:
+                yield n.lo, n.hi, n.key
+            n = n.right
+
+    def at(self, x) -> Iterator[Tuple[Any, Any, Any]]:
+        """Intervals containing x (lo <= x < hi)."""
+        return self.overlap(x, x)
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any, Any]]:
+        return self.overlap(float("-inf"), float("inf"))
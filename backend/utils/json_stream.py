@@ -0,0 +1,133 @@
+# backend/utils/json_stream.py
+# Batch 10.14 — Incremental JSON
+# Handles:
+# - feeding JSON text in arbitrary chunks (LLM token deltas, file reads)
+# - emitting each element of a target array as soon as it closes
+# - target = the top-level array, or the first array under a given key
+# - end offset of each element (feed_positions), to resume there after a seek
+
+import json
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+
+class ArrayItemParser:
+    """
+    p = ArrayItemParser(key="segments")
+    for chunk in stream: for item in p.feed(chunk): ...
+
+    Only string/escape state and nesting depth are tracked, so the
+    buffer is scanned once; each finished element goes through json.loads.
+    Elements that fail to decode are counted in .errors and skipped.
+
+    resume=True: the text starts inside the target array, e.g. at an
+    offset feed_positions reported (a file seek). loads decodes one element.
+    """
+
+    def __init__(self, key: Optional[str] = None, resume: bool = False,
+                 loads: Callable[[str], Any] = json.loads):
+        self.key = key
+        self.errors = 0
+        self.consumed = 0        # chars dropped from the buffer so far
+        self._loads = loads
+        self._buf = ""
+        self._pos = 0            # next char to scan
+        self._depth = 0          # nesting depth at _pos
+        self._in_str = False
+        self._esc = False
+        self._str_start = -1
+        self._last_str = None    # last complete string (candidate key)
+        self._array_depth = None # depth inside the target array once found
+        self._item_start = -1
+        self.done = False
+        if resume:
+            self._array_depth = self._depth = 1
+
+    def feed(self, chunk: str) -> List[Any]:
+        return [item for item, _ in self.feed_positions(chunk)]
+
+    def feed_positions(self, chunk: str) -> List[Tuple[Any, int]]:
+        """Like feed, paired with each element's end offset in all text fed so far."""
+        self._buf += chunk or ""
+        out = []
+        buf = self._buf
+        i = self._pos
+        while i < len(buf) and not self.done:
+            ch = buf[i]
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif ch == "\\":
+                    self._esc = True
+                elif ch == '"':
+                    self._in_str = False
+                    self._last_str = buf[self._str_start + 1:i]
+                i += 1
+                continue
+
+            if ch == '"':
+                self._in_str = True
+                self._str_start = i
+                if self._array_depth is not None and self._depth == self._array_depth and self._item_start < 0:
+                    self._item_start = i
+            elif ch in "{[":
+                if self._array_depth is None and ch == "[" and self._is_target():
+                    self._array_depth = self._depth + 1
+                elif self._array_depth is not None and self._depth == self._array_depth and self._item_start < 0:
+                    self._item_start = i
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._array_depth is not None:
+                    if self._depth == self._array_depth and self._item_start >= 0:
+                        out.extend(self._emit(buf[self._item_start:i + 1], i + 1))
+                    elif self._depth == self._array_depth - 1:
+                        if self._item_start >= 0:  # trailing scalar
+                            out.extend(self._emit(buf[self._item_start:i], i))
+                        self.done = True
+            elif ch == "," and self._array_depth is not None and self._depth == self._array_depth:
+                if self._item_start >= 0:  # scalar element
+                    out.extend(self._emit(buf[self._item_start:i], i))
+            elif (self._array_depth is not None and self._depth == self._array_depth
+                  and self._item_start < 0 and not ch.isspace()):
+                self._item_start = i
+            if ch not in ' \t\r\n:"[{':
+                self._last_str = None  # a key is only a key right before ':'
+            i += 1
+
+        # keep only the unfinished element in memory
+        keep = self._item_start if self._item_start >= 0 else i
+        if self._in_str and self._item_start < 0:
+            keep = min(keep, self._str_start)
+        self._buf = buf[keep:]
+        self.consumed += keep
+        self._pos = i - keep
+        if self._item_start >= 0:
+            self._item_start -= keep
+        if self._str_start >= 0:
+            self._str_start -= keep
+        return out
+
+    def _is_target(self) -> bool:
+        if self.key is None:
+            return self._depth == 0
+        return self._last_str == self.key
+
+    def _emit(self, text: str, end: int) -> List[Tuple[Any, int]]:
+        self._item_start = -1
+        text = text.strip()
+        if not text:
+            return []
+        try:
+            return [(self._loads(text), self.consumed + end)]
+        except ValueError:
+            self.errors += 1
+            return []
+
+
+def iter_array_items(chunks: Iterable[str], key: Optional[str] = None) -> Iterator[Any]:
+    """Yield the target array's elements from an iterable of text chunks."""
+    parser = ArrayItemParser(key)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
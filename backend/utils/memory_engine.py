@@ -5,17 +5,73 @@ Provides a stable API and compatibility functions used across the app.
 """
 
 from pathlib import Path
+import hashlib
 import json
-import threading
+import os
+import re
 import datetime
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from backend.utils import shared_store
+from backend.utils.json_stream import ArrayItemParser
+from backend.utils.normalize import clean_raw_notam
 
 BASE_DIR = Path(__file__).resolve().parent
 MEM_FILE = BASE_DIR / "memory_store.json"
-_LOCK = threading.Lock()
 
 _DEFAULT_MEM: Dict[str, Any] = {"entries": []}
 
+READ_CHUNK = 64 * 1024
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+PAGE_OFFSETS_MAX = 4096
+
+# Byte offset just past the last entry of each page served (keyed by that
+# entry's id), for one version of the store file: the next page seeks there
+# instead of re-parsing from byte 0. Writes replace the file (new inode), so
+# offsets of an older version are never applied to a newer one.
+_PAGE_OFFSETS: Dict[int, int] = {}
+_PAGE_OFFSETS_VERSION: Optional[tuple] = None
+_PAGE_OFFSETS_LOCK = threading.Lock()
+
+# Called with the tokens a change affects (None = everything), so derived
+# caches can drop only what the new knowledge touches. Change kinds:
+# "entry" (save_memory_entry, append_entries), "fix" (learn_fix),
+# "clear" (clear_memory).
+CHANGE_KINDS = ("entry", "fix", "clear")
+_LISTENERS: List[tuple] = []
+
+
+def add_change_listener(fn: Callable[[Optional[Iterable[str]]], Any],
+                        kinds: Iterable[str] = CHANGE_KINDS) -> None:
+    if all(f is not fn for f, _ in _LISTENERS):
+        _LISTENERS.append((fn, frozenset(kinds)))
+
+
+def _notify(tokens: Optional[Iterable[str]], kind: str) -> None:
+    for fn, kinds in list(_LISTENERS):
+        if kind not in kinds:
+            continue
+        try:
+            fn(tokens)
+        except Exception:
+            pass
+
+
+def _tokens(text: str) -> set:
+    return set(re.findall(r"[A-Z0-9]+", (text or "").upper()))
+
+
+def _writer():
+    """Single-writer section: read-modify-write of the store happens in here."""
+    return shared_store.writer(MEM_FILE)
+
+
+def generation() -> int:
+    """Store generation, bumped by every write from any worker process."""
+    return shared_store.generation(MEM_FILE).value
+
 
 def _read_file() -> Dict[str, Any]:
     if not MEM_FILE.exists():
@@ -56,24 +112,146 @@ def get_all_entries() -> List[Dict[str, Any]]:
     return get_all_memory_entries()
 
 
+def _utf8_loads(text: str) -> Any:
+    # the scanner reads the file as latin-1, so its offsets are byte offsets
+    return json.loads(text.encode("latin-1").decode("utf-8"))
+
+
+def _file_version(fh) -> tuple:
+    st = os.fstat(fh.fileno())
+    return (str(MEM_FILE), st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _page_offset(version: tuple, after_id: int) -> int:
+    with _PAGE_OFFSETS_LOCK:
+        return _PAGE_OFFSETS.get(after_id, 0) if version == _PAGE_OFFSETS_VERSION else 0
+
+
+def _remember_page_offset(version: tuple, last_id: int, offset: int) -> None:
+    global _PAGE_OFFSETS_VERSION
+    with _PAGE_OFFSETS_LOCK:
+        if version != _PAGE_OFFSETS_VERSION or len(_PAGE_OFFSETS) >= PAGE_OFFSETS_MAX:
+            _PAGE_OFFSETS.clear()
+            _PAGE_OFFSETS_VERSION = version
+        _PAGE_OFFSETS[last_id] = offset
+
+
+def _scan_entries(after_id: int = 0) -> Iterator[tuple]:
+    """
+    (entry, byte offset just past it, file version) for entries with
+    id > after_id, starting at a recorded page boundary when there is one.
+    """
+    try:
+        fh = MEM_FILE.open("rb")
+    except OSError:
+        return
+    with fh:
+        version = _file_version(fh)
+        start = _page_offset(version, after_id)
+        fh.seek(start)
+        parser = ArrayItemParser(key="entries", resume=start > 0, loads=_utf8_loads)
+        while not parser.done:
+            chunk = fh.read(READ_CHUNK)
+            if not chunk:
+                break
+            for entry, end in parser.feed_positions(chunk.decode("latin-1")):
+                if isinstance(entry, dict) and (entry.get("id") or 0) > after_id:
+                    yield entry, start + end, version
+
+
+def iter_memory_entries(after_id: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Stream entries with id > after_id straight from the store file, one
+    entry in memory at a time (writes replace the file atomically, so an
+    open reader keeps a consistent snapshot).
+    """
+    for entry, _, _ in _scan_entries(after_id):
+        yield entry
+
+
+def page_memory_entries(cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    One page of entries after `cursor` (the last id of the previous page).
+    next_cursor is None on the last page. Raises ValueError on a bad cursor.
+    Where the page ends is remembered, so the next page seeks there and a
+    full walk reads the store once (until the next write).
+    """
+    after = int(cursor) if cursor else 0
+    limit = max(1, min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+    page: List[Dict[str, Any]] = []
+    more = False
+    end, version = 0, None
+    for entry, entry_end, version in _scan_entries(after):
+        if len(page) == limit:
+            more = True
+            break
+        page.append(entry)
+        end = entry_end
+    if more:
+        _remember_page_offset(version, page[-1]["id"], end)
+    return {
+        "entries": page,
+        "count": len(page),
+        "limit": limit,
+        "next_cursor": str(page[-1]["id"]) if more else None,
+    }
+
+
 def save_memory_entry(notam: str, aviation: Dict[str, Any]) -> Dict[str, Any]:
     """Append and persist an entry, return saved entry wrapper."""
-    mem = _read_file()
-    entries: List[Dict[str, Any]] = mem.get("entries", []) or []
-    entry_id = (entries[-1]["id"] + 1) if entries else 1
-    entry = {
-        "id": entry_id,
-        "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
-        "notam": notam or "",
-        "aviation": aviation or {}
-    }
-    entries.append(entry)
-    mem["entries"] = entries
-    with _LOCK:
+    with _writer():
+        mem = _read_file()
+        entries: List[Dict[str, Any]] = mem.get("entries", []) or []
+        entry_id = (entries[-1]["id"] + 1) if entries else 1
+        entry = {
+            "id": entry_id,
+            "timestamp": datetime.datetime.utcnow().isoformat() + "Z",
+            "notam": notam or "",
+            "aviation": aviation or {}
+        }
+        entries.append(entry)
+        mem["entries"] = entries
         _write_file(mem)
+    _notify(_tokens(entry["notam"]), "entry")
     return {"status": "saved", "entry": entry}
 
 
+def append_entries(items: Iterable[Dict[str, Any]], notify: bool = True) -> List[Dict[str, Any]]:
+    """
+    Append many entries in one read-modify-write (one transaction).
+    Items carry notam/aviation and optionally timestamp; ids are assigned
+    here. notify=False leaves announcing the change to the caller.
+    """
+    now = datetime.datetime.utcnow().isoformat() + "Z"
+    with _writer():
+        mem = _read_file()
+        entries: List[Dict[str, Any]] = mem.get("entries", []) or []
+        next_id = (entries[-1]["id"] + 1) if entries else 1
+        saved = []
+        for item in items:
+            entry = {
+                "id": next_id,
+                "timestamp": item.get("timestamp") or now,
+                "notam": item.get("notam") or "",
+                "aviation": item.get("aviation") or {}
+            }
+            next_id += 1
+            saved.append(entry)
+        if not saved:
+            return saved
+        entries.extend(saved)
+        mem["entries"] = entries
+        _write_file(mem)
+    if notify:
+        notify_changed(set().union(*(_tokens(e["notam"]) for e in saved)), "entry")
+    return saved
+
+
+def notify_changed(tokens: Optional[Iterable[str]], kind: str = "entry") -> None:
+    """Announce a change made without per-item notifications (bulk import)."""
+    _notify(tokens, kind)
+
+
 def save_entry(data: Any) -> Dict[str, Any]:
     """API wrapper used by routes: accepts dict or raw string."""
     if data is None:
@@ -95,51 +273,116 @@ def memory_learn(notam: str = "", aviation: Dict[str, Any] = None) -> Dict[str,
 
 def clear_memory() -> Dict[str, Any]:
     """Reset the store to default (atomic write)."""
-    with _LOCK:
+    with _writer():
         _write_file(_DEFAULT_MEM.copy())
+    _notify(None, "clear")
     return {"status": "cleared"}
 
 
+def learn_fix(bad: str, good: str) -> Dict[str, Any]:
+    """Record a fix correction (bad → good) used by memory_lookup."""
+    bad = str(bad or "").strip().upper()
+    good = str(good or "").strip().upper()
+    if not bad or not good:
+        return {"error": "both fixes required"}
+    with _writer():
+        mem = _read_file()
+        fixes = mem.get("fixes") or {}
+        fixes[bad] = good
+        mem["fixes"] = fixes
+        _write_file(mem)
+    _notify({bad, good}, "fix")
+    return {"status": "learned", "fix": bad, "correction": good}
+
+
 def memory_lookup_fix(code: str) -> Optional[Dict[str, Any]]:
     """
     Compatibility helper expected by fix_validator.
-    Search entries for a matching fix code or substring in notam/aviation.
-    Returns the first matching entry dict or None.
+    First entry whose NOTAM text or aviation payload contains the fix code
+    as a token (memory_index), else a corpus entry using it, else None.
     """
     if not code:
         return None
     needle = str(code).strip().upper()
     try:
-        entries = get_all_memory_entries()
-        for e in entries:
-            aviation = e.get("aviation") or {}
-            # check common keys
-            for k in ("fix", "icao", "code", "id"):
-                v = aviation.get(k)
-                if isinstance(v, str) and v.upper() == needle:
-                    return e
-            # check any aviation string values and list items
-            for v in aviation.values():
-                if isinstance(v, str) and v.upper() == needle:
-                    return e
-                if isinstance(v, (list, tuple)):
-                    for item in v:
-                        if isinstance(item, str) and item.upper() == needle:
-                            return e
-            # substring search in notam
-            notam_text = (e.get("notam") or "").upper()
-            if needle in notam_text:
-                return e
-            # serialized aviation search
-            try:
-                if needle in json.dumps(aviation).upper():
-                    return e
-            except Exception:
-                pass
-        return None
+        entry_id = _index().entry_id_for(needle)
+        entry = get_memory_entry(entry_id) if entry_id else None
+        if entry is not None:
+            return entry
+        corpus = _corpus()
+        return corpus.entry_for_fix(needle) if corpus else None
     except Exception:
         return None
 
 
+def get_memory_entry(entry_id: int) -> Optional[Dict[str, Any]]:
+    """One entry by id (streamed; entries are stored in id order)."""
+    for entry in iter_memory_entries(int(entry_id) - 1):
+        return entry if entry.get("id") == entry_id else None
+    return None
+
+
+def memory_lookup(code: str) -> Optional[str]:
+    """
+    Compatibility helper expected by segment_builder.
+    Return the learned correction for a fix code from the "fixes"
+    dictionary of the store (via memory_index), then from the corpus
+    station names, or None.
+    """
+    if not code:
+        return None
+    hit = _index().fix(code)
+    if hit:
+        return hit
+    corpus = _corpus()
+    return corpus.lookup_fix(code) if corpus else None
+
+
+def compact_memory() -> Dict[str, Any]:
+    """
+    Drop duplicate entries (same cleaned NOTAM + aviation; the oldest is
+    kept, ids are not renumbered), then rebuild memory_index and write
+    its snapshot.
+    """
+    with _writer():
+        mem = _read_file()
+        entries = mem.get("entries", []) or []
+        seen, kept = set(), []
+        for e in entries:
+            digest = entry_digest(e.get("notam") or "", e.get("aviation") or {})
+            if digest not in seen:
+                seen.add(digest)
+                kept.append(e)
+        if len(kept) != len(entries):
+            mem["entries"] = kept
+            _write_file(mem)
+    index = _index()
+    index.rebuild()
+    return {
+        "status": "compacted",
+        "entries": len(kept),
+        "removed": len(entries) - len(kept),
+        "snapshot": index.save(),
+    }
+
+
+def entry_digest(notam: str, aviation: Any) -> str:
+    """Identity of an entry for dedup: cleaned NOTAM text + aviation payload."""
+    body = clean_raw_notam(notam or "") + "\0" + json.dumps(aviation or {}, sort_keys=True)
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()
+
+
+def _index():
+    """Derived lookups over the store (memory_index, snapshot-backed)."""
+    from backend.utils.memory_index import MEMORY_INDEX
+    return MEMORY_INDEX
+
+
+def _corpus():
+    """Corpus warm-start layer (None when WARM_START=0), consulted after the store."""
+    from backend.utils import corpus_memory
+    return corpus_memory.CORPUS_MEMORY if corpus_memory.WARM_START else None
+
+
 # Backwards-compatible aliases
 memory_find_fix = memory_lookup_fix
@@ -0,0 +1,203 @@
+# Batch 10.19 — Bulk Memory Import
+# Streams a large upload into the memory store without holding it in memory.
+# Handles:
+#   - JSON array, {"entries": [...]} store dumps and NDJSON (/memory/export),
+#     plain or gzip-compressed, detected from the first bytes
+#   - dedup against the store and within the upload (NOTAM text + aviation)
+#   - batched commits: one store write per IMPORT_BATCH entries
+#   - listeners notified once at the end; the NOTAM store is synced once
+
+import json
+import os
+import re
+import zlib
+import codecs
+from typing import Any, Dict, List, Optional
+
+from backend.utils import memory_engine, notam_store
+from backend.utils.memory_engine import entry_digest
+from backend.utils.json_stream import ArrayItemParser
+
+IMPORT_BATCH = int(os.getenv("MEMORY_IMPORT_BATCH", "1000"))
+
+_STORE_KEYS = ("entries", "fixes", "segments")
+_FIRST_KEY_RE = re.compile(r'\{\s*"((?:[^"\\]|\\.)*)"')
+
+
+class MemoryImporter:
+    """
+    imp = MemoryImporter()
+    for chunk in upload: imp.feed_bytes(chunk)   # or imp.feed(text)
+    stats = imp.close()
+
+    Items are entry dicts ({"notam"|"text", "aviation", "timestamp"}) or
+    bare NOTAM strings; ids are always reassigned by the store.
+    """
+
+    def __init__(self, batch_size: int = IMPORT_BATCH, dedup: bool = True):
+        self.batch_size = max(1, int(batch_size or IMPORT_BATCH))
+        self.dedup = dedup
+        self.format: Optional[str] = None   # "array" | "store" | "ndjson"
+        self.read = 0
+        self.imported = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.batches = 0
+        self._head = ""          # text seen before the format is known
+        self._parser: Optional[ArrayItemParser] = None
+        self._line = ""          # unfinished NDJSON line
+        self._pending: List[Dict[str, Any]] = []
+        self._tokens: set = set()
+        self._seen: Optional[set] = None
+        self._inflate = None
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._raw_head = b""
+        self._closed = False
+
+    # ---- input ----
+
+    def feed_bytes(self, data: bytes) -> None:
+        """Raw upload bytes; gzip is recognised by its magic number."""
+        if self._inflate is None and self._raw_head is not None:
+            self._raw_head += data or b""
+            if len(self._raw_head) < 2:
+                return
+            data, self._raw_head = self._raw_head, None
+            if data[:2] == b"\x1f\x8b":
+                self._inflate = zlib.decompressobj(31)
+        if self._inflate is not None:
+            data = self._inflate.decompress(data or b"")
+        self.feed(self._decoder.decode(data or b""))
+
+    def feed(self, text: str) -> None:
+        if self.format is None:
+            self._head += text or ""
+            if not self._sniff():
+                return
+            text, self._head = self._head, ""
+        if self.format == "ndjson":
+            lines = (self._line + text).split("\n")
+            self._line = lines.pop()
+            for line in lines:
+                self._accept_line(line)
+        else:
+            for item in self._parser.feed(text):
+                self._accept(item)
+
+    def _sniff(self) -> bool:
+        """Pick the format once enough of the upload is buffered."""
+        head = self._head.lstrip("\ufeff \t\r\n")
+        if not head:
+            return False
+        if head[0] == "[":
+            self.format, self._parser = "array", ArrayItemParser()
+        elif head[0] == "{":
+            m = _FIRST_KEY_RE.match(head)
+            if m is None:
+                if re.match(r"\{\s*\}", head) or re.match(r'\{\s*[^\s"]', head):
+                    self.format = "ndjson"  # {} or malformed: let lines fail one by one
+                    return True
+                return False
+            if m.group(1) in _STORE_KEYS:
+                self.format, self._parser = "store", ArrayItemParser(key="entries")
+            else:
+                self.format = "ndjson"
+        else:
+            raise ValueError("expected a JSON array, a memory store object or NDJSON")
+        return True
+
+    def _accept_line(self, line: str) -> None:
+        line = line.strip()
+        if not line:
+            return
+        try:
+            item = json.loads(line)
+        except ValueError:
+            self.read += 1
+            self.invalid += 1
+            return
+        self._accept(item)
+
+    def _accept(self, item: Any) -> None:
+        self.read += 1
+        if isinstance(item, str):
+            item = {"notam": item}
+        if not isinstance(item, dict):
+            self.invalid += 1
+            return
+        notam = item.get("notam") or item.get("text") or ""
+        aviation = item.get("aviation") or {}
+        if not isinstance(notam, str) or not notam.strip() or not isinstance(aviation, (dict, str)):
+            self.invalid += 1
+            return
+        if self.dedup:
+            digest = entry_digest(notam, aviation)
+            seen = self._existing()
+            if digest in seen:
+                self.duplicates += 1
+                return
+            seen.add(digest)
+        entry = {"notam": notam, "aviation": aviation}
+        if isinstance(item.get("timestamp"), str):
+            entry["timestamp"] = item["timestamp"]
+        self._pending.append(entry)
+        self._tokens |= memory_engine._tokens(notam)
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def _existing(self) -> set:
+        """Digests of what the store already holds, streamed once."""
+        if self._seen is None:
+            self._seen = {
+                entry_digest(e.get("notam") or "", e.get("aviation") or {})
+                for e in memory_engine.iter_memory_entries()
+            }
+        return self._seen
+
+    # ---- output ----
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        memory_engine.append_entries(self._pending, notify=False)
+        self.imported += len(self._pending)
+        self.batches += 1
+        self._pending = []
+
+    def close(self) -> Dict[str, Any]:
+        """Drain buffered input, then commit()."""
+        if not self._closed:
+            self._closed = True
+            if self._raw_head:
+                raw, self._raw_head = self._raw_head, None
+                self.feed(self._decoder.decode(raw))
+            tail = self._decoder.decode(self._inflate.flush() if self._inflate else b"", final=True)
+            if tail:
+                self.feed(tail)
+            if self.format == "ndjson" and self._line:
+                line, self._line = self._line, ""
+                self._accept_line(line)
+            if self._parser is not None:
+                self.invalid += self._parser.errors
+        return self.commit()
+
+    def commit(self) -> Dict[str, Any]:
+        """Write the last batch, notify listeners once, sync the NOTAM store.
+        Also what to call when the upload breaks off half way."""
+        self._closed = True
+        self._flush()
+        if self._tokens:
+            memory_engine.notify_changed(self._tokens, "entry")
+            self._tokens = set()
+            notam_store.sync_memory()
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "format": self.format,
+            "read": self.read,
+            "imported": self.imported,
+            "duplicates": self.duplicates,
+            "invalid": self.invalid,
+            "batches": self.batches,
+        }
@@ -0,0 +1,223 @@
+# Batch 10.22 — Memory Index
+# Derived lookups over learned memory (memory_store.json), persisted as a
+# binary snapshot next to the store so a starting worker serves at once.
+# Handles:
+#   - similarity tokens per entry (find_similar_memory scores without
+#     re-tokenising the store on every call)
+#   - token → first entry id (memory_lookup_fix)
+#   - learned fix corrections (memory_lookup)
+#   - airway graph: route → [from, to] pairs of learned segments
+#   - catch-up: when the store generation moves (a write in any worker)
+#     only entries after the last indexed id are indexed; a cleared or
+#     compacted store is rebuilt
+#   - snapshot written after a rebuild, every MEMORY_SNAPSHOT_EVERY new
+#     entries and on compaction (memory_engine.compact_memory)
+
+import bisect
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.utils import memory_engine
+from backend.utils.corpus_memory import output_segments
+from backend.utils.similarity import combined_score, operational_tokens
+from backend.utils.snapshot import fingerprint, read_snapshot, write_snapshot
+
+SNAPSHOT_SCHEMA = 1
+SNAPSHOT_EVERY = int(os.getenv("MEMORY_SNAPSHOT_EVERY", "500"))
+
+
+def snapshot_path(store: Path) -> Path:
+    """memory_store.json → memory_store.snapshot"""
+    return Path(store).with_suffix(".snapshot")
+
+
+def entry_output(entry: Dict[str, Any]) -> Optional[str]:
+    """Verified output of an entry: "output", or a learned text answer."""
+    out = entry.get("output") or entry.get("aviation")
+    if isinstance(out, dict):
+        out = out.get("text") or out.get("output")
+    return out if isinstance(out, str) and out else None
+
+
+def entry_segments(entry: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    """(route, from, to) of a learned entry, from segment dicts or output text."""
+    aviation = entry.get("aviation")
+    found = []
+    if isinstance(aviation, dict):
+        for seg in aviation.get("segments") or aviation.get("json") or []:
+            if isinstance(seg, dict) and seg.get("route") and seg.get("from") and seg.get("to"):
+                found.append((str(seg["route"]).upper(), str(seg["from"]).upper(), str(seg["to"]).upper()))
+    if not found:
+        text = entry_output(entry) or ""
+        found = [(s["route"], s["from"], s["to"]) for s in output_segments(text)]
+    return found
+
+
+def _empty() -> Dict[str, Any]:
+    return {
+        "store": None,
+        "last_id": 0,
+        "last_ts": "",
+        "ids": [],
+        "stamps": [],
+        "outputs": [],
+        "tokens": [],
+        "by_token": {},
+        "fixes": {},
+        "routes": {},
+    }
+
+
+class MemoryIndex:
+    """
+    MEMORY_INDEX.similar(op, full, threshold) / entry_id_for(token) /
+    fix(code) / segments_of(route); each call first syncs with the store
+    when its generation (shared_store) moved, so writes from other worker
+    processes are picked up too.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._store: Optional[Path] = None    # store the state belongs to
+        self._state: Dict[str, Any] = _empty()
+        self._unsaved = 0
+        self._gen = -1                        # store generation last synced
+        self.source = None                    # "snapshot" | "store"
+        self.load_ms = 0.0
+        self.rebuilds = 0
+        self.snapshots = 0
+
+    # ---- sync ----
+
+    def load(self) -> "MemoryIndex":
+        store = Path(memory_engine.MEM_FILE)
+        with self._lock:
+            if store != self._store:
+                t0 = time.perf_counter()
+                self._store = store
+                self._state = read_snapshot(snapshot_path(store), "memory_index", SNAPSHOT_SCHEMA) or _empty()
+                self.source = "snapshot" if self._state["store"] else None
+                self._unsaved = 0
+                self._catch_up()
+                self.load_ms = round((time.perf_counter() - t0) * 1000, 2)
+            elif memory_engine.generation() != self._gen:
+                self._catch_up()
+        return self
+
+    def _catch_up(self) -> None:
+        self._gen = memory_engine.generation()
+        fp = fingerprint(self._store)
+        if fp == self._state["store"]:
+            return
+        mem = memory_engine.get_all()
+        entries = [e for e in mem.get("entries") or [] if isinstance(e, dict)]
+        st = self._state
+        start = 0
+        if st["last_id"]:
+            i = bisect.bisect_left(entries, st["last_id"], key=lambda e: e.get("id") or 0)
+            intact = (i < len(entries) and i + 1 == len(st["ids"])
+                      and entries[i].get("id") == st["last_id"]
+                      and entries[i].get("timestamp", "") == st["last_ts"])
+            if intact:
+                start = i + 1
+            else:
+                st = self._state = _empty()
+        rebuilt = start == 0
+        for e in entries[start:]:
+            self._add(st, e)
+        st["fixes"] = {k: v for k, v in (mem.get("fixes") or {}).items() if isinstance(v, str) and v}
+        st["store"] = fp
+        if rebuilt:
+            self.rebuilds += 1
+            self.source = "store"
+        self._unsaved += len(entries) - start
+        if (rebuilt and entries) or self._unsaved >= SNAPSHOT_EVERY:
+            self.save()
+
+    @staticmethod
+    def _add(st: Dict[str, Any], e: Dict[str, Any]) -> None:
+        eid = e.get("id") or 0
+        notam = e.get("notam") or ""
+        op, full = operational_tokens(notam)
+        st["ids"].append(eid)
+        st["stamps"].append(e.get("timestamp", ""))
+        st["outputs"].append(entry_output(e))
+        st["tokens"].append((tuple(sorted(op)), tuple(sorted(full))))
+        try:
+            aviation_text = json.dumps(e.get("aviation") or {})
+        except (TypeError, ValueError):
+            aviation_text = ""
+        for tok in memory_engine._tokens(notam) | memory_engine._tokens(aviation_text):
+            st["by_token"].setdefault(tok, eid)
+        for route, a, b in entry_segments(e):
+            pairs = st["routes"].setdefault(route, [])
+            if [a, b] not in pairs:
+                pairs.append([a, b])
+        st["last_id"], st["last_ts"] = eid, e.get("timestamp", "")
+
+    def rebuild(self) -> None:
+        """Forget the current state and index the store from scratch."""
+        with self._lock:
+            self._store = Path(memory_engine.MEM_FILE)
+            self._state = _empty()
+            self._catch_up()
+
+    def save(self) -> bool:
+        """Write the snapshot for the current state."""
+        with self._lock:
+            if self._store is None:
+                return False
+            ok = write_snapshot(snapshot_path(self._store), "memory_index", SNAPSHOT_SCHEMA, self._state)
+            if ok:
+                self._unsaved = 0
+                self.snapshots += 1
+            return ok
+
+    # ---- lookups ----
+
+    def similar(self, op_tokens, full_tokens, threshold: float) -> Tuple[float, Optional[str]]:
+        """Best learned output by combined_score; the newest entry wins ties."""
+        st = self.load()._state
+        best, best_out, best_ts = 0.0, None, ""
+        for out, stamp, (op, full) in zip(st["outputs"], st["stamps"], st["tokens"]):
+            if not out:
+                continue
+            score = combined_score(op_tokens, full_tokens, op, full)
+            if score < threshold:
+                continue
+            if score > best + 1e-6 or (abs(score - best) < 1e-6 and stamp > best_ts):
+                best, best_out, best_ts = score, out, stamp
+        return best, best_out
+
+    def entry_id_for(self, token: str) -> Optional[int]:
+        """First entry whose NOTAM or aviation payload contains the token."""
+        return self.load()._state["by_token"].get(str(token or "").strip().upper())
+
+    def fix(self, code: str) -> Optional[str]:
+        return self.load()._state["fixes"].get(str(code or "").strip().upper())
+
+    def segments_of(self, route: str) -> List[List[str]]:
+        return self.load()._state["routes"].get(str(route or "").strip().upper(), [])
+
+    def stats(self) -> Dict[str, Any]:
+        st = self.load()._state
+        return {
+            "source": self.source,
+            "load_ms": self.load_ms,
+            "entries": len(st["ids"]),
+            "last_id": st["last_id"],
+            "tokens": len(st["by_token"]),
+            "fixes": len(st["fixes"]),
+            "routes": len(st["routes"]),
+            "unsaved": self._unsaved,
+            "rebuilds": self.rebuilds,
+            "snapshots": self.snapshots,
+            "snapshot": str(snapshot_path(self._store)),
+        }
+
+
+MEMORY_INDEX = MemoryIndex()
@@ -0,0 +1,74 @@
+# backend/utils/metrics.py
+# Batch 10.9 — In-process Metrics
+# Handles:
+# - labelled counters (incr)
+# - labelled value summaries: count / sum / min / max / last (observe)
+# - JSON-friendly snapshot for the stats endpoints
+
+import threading
+from typing import Any, Dict, Tuple
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, Any]) -> _Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_str(key: _Key) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}"
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[_Key, float] = {}
+        self._summaries: Dict[_Key, Dict[str, float]] = {}
+
+    def incr(self, name: str, n: float = 1, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            s = self._summaries.get(key)
+            if s is None:
+                self._summaries[key] = {"count": 1, "sum": value, "min": value, "max": value, "last": value}
+                return
+            s["count"] += 1
+            s["sum"] += value
+            s["min"] = min(s["min"], value)
+            s["max"] = max(s["max"], value)
+            s["last"] = value
+
+    def counter(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def summary(self, name: str, **labels) -> Dict[str, float]:
+        with self._lock:
+            s = dict(self._summaries.get(_key(name, labels)) or {})
+        if s:
+            s["avg"] = s["sum"] / s["count"]
+        return s
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {_label_str(k): v for k, v in self._counters.items()}
+            summaries = {_label_str(k): dict(v) for k, v in self._summaries.items()}
+        for s in summaries.values():
+            s["avg"] = s["sum"] / s["count"]
+        return {"counters": counters, "summaries": summaries}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+
+METRICS = Metrics()
@@ -0,0 +1,128 @@
+
+# Batch 10.1 — NOTAM Data Model
+# Compact, slotted records passed through the pipeline:
+# normalize → fl_master → segment_builder → confidence → soft_merge
+# Dicts are only produced at the API boundary via to_dict().
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+SECTION_LETTERS = ("Q", "A", "B", "C", "D", "E", "F", "G")
+
+
+@dataclass(slots=True)
+class Sections:
+    """Q) … G) lines of a normalized NOTAM."""
+    q: str = ""
+    a: str = ""
+    b: str = ""
+    c: str = ""
+    d: str = ""
+    e: str = ""
+    f: str = ""
+    g: str = ""
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            "Q": self.q, "A": self.a, "B": self.b, "C": self.c,
+            "D": self.d, "E": self.e, "F": self.f, "G": self.g,
+        }
+
+
+@dataclass(slots=True)
+class FLBand:
+    """Flight-level band with the sources used to build it."""
+    fl_lower: int = 0
+    fl_upper_final: int = 999
+    inline_source_low: Optional[int] = None
+    inline_source_high: Optional[int] = None
+    fg_source_low: Optional[int] = None
+    fg_source_high: Optional[int] = None
+    q_low: Optional[int] = None
+    q_high: Optional[int] = None
+    adjusted: bool = False
+    reason: Optional[str] = None
+    original_low: int = 0
+    original_high: int = 999
+
+    def label(self) -> str:
+        """Display form, e.g. FL045-FL130."""
+        return f"FL{self.fl_lower:03d}-FL{self.fl_upper_final:03d}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fl_lower": self.fl_lower,
+            "fl_upper_final": self.fl_upper_final,
+            "inline_source_low": self.inline_source_low,
+            "inline_source_high": self.inline_source_high,
+            "fg_source_low": self.fg_source_low,
+            "fg_source_high": self.fg_source_high,
+            "q_low": self.q_low,
+            "q_high": self.q_high,
+            "adjusted": self.adjusted,
+            "reason": self.reason,
+            "original_low": self.original_low,
+            "original_high": self.original_high,
+        }
+
+
+@dataclass(slots=True)
+class Segment:
+    """One closed route segment, e.g. L736 NEDRA-GOMED FL045-FL130."""
+    route: str
+    from_fix: str
+    to_fix: str
+    fl: str = ""
+    band: Optional[FLBand] = None  # segment-local band, else the NOTAM-wide one
+
+    @property
+    def segment(self) -> str:
+        return f"{self.from_fix}-{self.to_fix}"
+
+    @property
+    def key(self) -> str:
+        """Dedup key shared by segment_builder and soft_merge."""
+        return f"{self.route}:{self.from_fix}-{self.to_fix}"
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Segment":
+        """Build from the API/AI dict shape ({"route","from","to","fl"})."""
+        return cls(
+            route=str(d.get("route", "") or "").upper(),
+            from_fix=str(d.get("from", "") or "").upper(),
+            to_fix=str(d.get("to", "") or "").upper(),
+            fl=str(d.get("fl", "") or ""),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "route": self.route,
+            "from": self.from_fix,
+            "to": self.to_fix,
+            "segment": self.segment,
+            "fl": self.fl,
+        }
+
+
+@dataclass(slots=True)
+class ParsedNotam:
+    """Result of one pass of the deterministic parser over a NOTAM."""
+    cleaned: str = ""
+    sections: Sections = field(default_factory=Sections)
+    fl_info: Optional[FLBand] = None  # filled once by fl_engine.fl_for
+    segments: List[Segment] = field(default_factory=list)
+    confidence: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "cleaned": self.cleaned,
+            "sections": self.sections.to_dict(),
+            "fl_info": self.fl_info.to_dict() if self.fl_info else None,
+            "segments": [s.to_dict() for s in self.segments],
+            "confidence": self.confidence,
+        }
+
+
+def segments_to_dicts(segments) -> List[Dict[str, Any]]:
+    """API boundary helper: accepts Segment objects or already-plain dicts."""
+    return [s.to_dict() if isinstance(s, Segment) else s for s in segments or []]
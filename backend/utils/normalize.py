@@ -3,6 +3,7 @@
 # Cleans NOTAM text, splits sections, prepares for parsing.
 
 import re
+from backend.utils.models import Sections
 
 SECTION_KEYS = ["Q)", "A)", "B)", "C)", "D)", "E)", "F)", "G)"]
 
@@ -16,30 +17,48 @@ def clean_raw_notam(text):
     t = re.sub(r'[ \t]+', ' ', t)
     return t.strip().upper()
 
+_INLINE_KEY = re.compile(r'(?<=\s)([A-G])\)')
+# F)/G) values; inside E) free text an inline F)/G) only starts a field
+# when one of these follows it ("... PARA F) APPLIES" stays in E)
+_LIMIT_VALUE = re.compile(r'\s*(?:SFC|GND|UNL|FL\s?\d{2,3}|\d{1,5}\s?(?:FT|M)\b(?:\s?(?:AMSL|AGL|MSL))?)(?=[\s.,;]|$)')
+
+def _starts_field(ln, key, m):
+    if key != "e":  # A)-D) values never contain a marker-like " X)"
+        return True
+    return _LIMIT_VALUE.match(ln, m.end()) is not None
+
+def _split_header_line(ln):
+    """'A)UMKK B)2508120600 C)2508152200' → [("a", "UMKK"), ("b", ...), ...]."""
+    key = ln[0].lower()
+    out, start = [], 2
+    for m in _INLINE_KEY.finditer(ln):
+        nxt = m.group(1).lower()
+        if "qabcdefg".index(nxt) > "qabcdefg".index(key) and _starts_field(ln, key, m):
+            out.append((key, ln[start:m.start()].strip()))
+            key, start = nxt, m.end()
+    out.append((key, ln[start:].strip()))
+    return out
+
 def split_sections(text):
     """
-    Splits NOTAM into dictionary:
-    { "Q": "...", "A": "...", "E": "..." }
+    Splits NOTAM into a Sections record:
+    Sections(q="...", a="...", e="...")
+    Later markers on the same line (A)... B)... C)..., F)SFC G)FL341) start
+    their own section.
     """
-    out = {k.replace(")",""): "" for k in SECTION_KEYS}
-    lines = text.split("\n")
-
+    parts = {}
     current = None
-    for ln in lines:
+    for ln in text.split("\n"):
         for key in SECTION_KEYS:
             if ln.startswith(key):
-                current = key.replace(")","")
-                out[current] = ln[len(key):].strip()
+                for current, value in _split_header_line(ln):
+                    parts[current] = [value]
                 break
         else:
             if current:
-                out[current] += " " + ln.strip()
-
-    # Final cleanup
-    for k in out:
-        out[k] = out[k].strip()
+                parts[current].append(ln.strip())
 
-    return out
+    return Sections(**{k: " ".join(v).strip() for k, v in parts.items()})
 
 def normalize_notam(text):
     """Full normalization pipeline."""
@@ -0,0 +1,382 @@
+# Batch 10.17 — NOTAM Store
+# One entry point that keeps the per-NOTAM indexes in step.
+# Handles:
+#   - keys: issuer-scoped NOTAM id ("UUWV:Q0381/25", Q-line FIR or A)
+#     location + header id; ids are unique only per issuing NOF) or a
+#     text hash; lookups by bare id match every issuer
+#   - index_notam → spatial (Q-line area) + validity (B/C/D) + FL band
+#     (per segment, from the deterministic parser) indexes
+#   - records + hash indexes on route, fix, FIR and bare NOTAM id
+#     for paginated route/fix queries
+#   - memory entries (memory_engine) are indexed too, incrementally
+#   - lifecycle: NOTAMR/NOTAMC retire the referenced id of the same
+#     issuer in O(1) lookups,
+#     dropping only its index entries and cached parse/AI results; a
+#     bounded tombstone map keeps late or out-of-order originals out;
+#     a replacement with unchanged Q/A/E/F/G reuses the old segments
+#   - drop(key) → removed from every index
+#   - expiry: NOTAMs past their C) time are evicted from every index,
+#     checked lazily (at most once per VALIDITY_EVICT_INTERVAL) on use
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from backend.utils import memory_engine
+from backend.utils.confidence_master import build_parsed_notam
+from backend.utils.fl_index import FL_INDEX
+from backend.utils.models import ParsedNotam
+from backend.utils.normalize import clean_raw_notam, normalize_notam
+from backend.utils.parse_cache import PARSE_CACHE
+from backend.utils.q_e_logic import (
+    extract_notam_header, extract_notam_issuer, extract_qline, scoped_notam_id,
+)
+from backend.utils.semantic_cache import SEMANTIC_CACHE
+from backend.utils.spatial_index import SPATIAL_INDEX
+from backend.utils.validity import VALIDITY_INDEX, notam_validity
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Retired (replaced/cancelled) NOTAM ids remembered to reject late arrivals
+TOMBSTONES = int(os.getenv("LIFECYCLE_TOMBSTONES", "10000"))
+
+
+@dataclass(slots=True)
+class NotamRecord:
+    """One indexed NOTAM: raw text, Q-line FIR/code and its built segments."""
+    id: str                                            # index key (issuer-scoped)
+    notam: str
+    notam_id: str = ""                                 # header id, "A0001/27"
+    issuer: str = ""
+    fir: str = ""
+    code: str = ""
+    source: str = "api"
+    segments: List[Dict[str, Any]] = field(default_factory=list)
+    type: str = "N"
+    replaces: Optional[str] = None
+    content: str = ""                                  # digest of Q/A/E/F/G
+    built: List[Any] = field(default_factory=list)     # Segment objects, for reuse
+
+    def to_dict(self) -> Dict[str, Any]:
+        v = VALIDITY_INDEX.get(self.id)
+        return {
+            "id": self.id,
+            "notam_id": self.notam_id,
+            "issuer": self.issuer,
+            "fir": self.fir,
+            "code": self.code,
+            "source": self.source,
+            "type": self.type,
+            "replaces": self.replaces,
+            "notam": self.notam,
+            "segments": self.segments,
+            "validity": v.to_dict() if v else None,
+        }
+
+
+_LOCK = threading.RLock()
+_RECORDS: Dict[str, NotamRecord] = {}
+_BY_ROUTE: Dict[str, set] = {}
+_BY_FIX: Dict[str, set] = {}
+_BY_FIR: Dict[str, set] = {}
+_BY_ID: Dict[str, set] = {}    # bare header id → keys (one per issuer)
+
+# retired key → header id that replaced it (None: cancelled)
+_RETIRED: "OrderedDict[str, Optional[str]]" = OrderedDict()
+LIFECYCLE = {"replaced": 0, "cancelled": 0, "superseded": 0, "reused_parses": 0}
+
+# Highest memory_engine entry id indexed; dirty (or a store generation
+# moved by another worker) → re-read on next query
+_memory_seen = 0
+_memory_dirty = True
+_memory_gen = -1
+
+
+def notam_key(text: str) -> str:
+    cleaned = clean_raw_notam(text)
+    nid = extract_notam_header(cleaned).get("id")
+    if nid:
+        return scoped_notam_id(extract_notam_issuer(cleaned), nid)
+    return hashlib.sha1(cleaned.encode("utf-8")).hexdigest()[:16]
+
+
+def _resolve(key: str) -> List[str]:
+    """Keys for an index key, or for a bare NOTAM id (every issuer)."""
+    if key in _RECORDS:
+        return [key]
+    return sorted(_BY_ID.get(key.strip().upper(), ()))
+
+
+def content_digest(sections) -> str:
+    """Operational content only: a re-issue with new B/C/D keeps the digest."""
+    raw = "\0".join((sections.q, sections.a, sections.e, sections.f, sections.g))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _link(index: Dict[str, set], name: str, key: str) -> None:
+    if name:
+        index.setdefault(name, set()).add(key)
+
+
+def _unlink(index: Dict[str, set], name: str, key: str) -> None:
+    keys = index.get(name)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del index[name]
+
+
+def _add_record(rec: NotamRecord) -> None:
+    _RECORDS[rec.id] = rec
+    _link(_BY_FIR, rec.fir, rec.id)
+    _link(_BY_ID, rec.notam_id, rec.id)
+    for s in rec.segments:
+        _link(_BY_ROUTE, s["route"], rec.id)
+        _link(_BY_FIX, s["from"], rec.id)
+        _link(_BY_FIX, s["to"], rec.id)
+
+
+def _drop_record(key: str) -> bool:
+    rec = _RECORDS.pop(key, None)
+    if rec is None:
+        return False
+    _unlink(_BY_FIR, rec.fir, key)
+    _unlink(_BY_ID, rec.notam_id, key)
+    for s in rec.segments:
+        _unlink(_BY_ROUTE, s["route"], key)
+        _unlink(_BY_FIX, s["from"], key)
+        _unlink(_BY_FIX, s["to"], key)
+    return True
+
+
+def _retire(ref: str, by: Optional[str]) -> Optional[NotamRecord]:
+    """Drop a replaced/cancelled NOTAM and only the cache entries of its text."""
+    with _LOCK:
+        rec = _RECORDS.get(ref)
+        _drop_key(ref)
+        _RETIRED[ref] = by
+        _RETIRED.move_to_end(ref)
+        while len(_RETIRED) > TOMBSTONES:
+            _RETIRED.popitem(last=False)
+    if rec is not None:
+        PARSE_CACHE.discard(rec.notam)
+        SEMANTIC_CACHE.discard(rec.notam)
+    return rec
+
+
+def index_notam(text: str, value: Any = None, now: Optional[float] = None,
+                parsed=None, source: str = "api") -> Optional[Dict[str, Any]]:
+    """
+    Index one NOTAM, applying its lifecycle (header "A0002/27 NOTAMR A0001/27").
+    Returns {"id", "status", ...} with status "indexed", "replaced",
+    "cancelled" or "superseded" (id already replaced/cancelled), or None
+    when it is expired or has nothing to index (no Q-line coords, B)/C)
+    window or segments). `parsed` (ParsedNotam) skips re-parsing.
+    """
+    now = time.time() if now is None else now
+    evict_expired(now, lazy=True)
+    cleaned = clean_raw_notam(text)
+    header = extract_notam_header(cleaned)
+    issuer = extract_notam_issuer(cleaned)
+    nid = header.get("id")
+    key = scoped_notam_id(issuer, nid) if nid else notam_key(text)
+    kind, ref = header.get("type", "N"), header.get("ref")
+    # NOTAMR/NOTAMC refer to a NOTAM of the same issuer
+    ref_key = scoped_notam_id(issuer, ref) if ref else None
+
+    if key in _RETIRED:
+        LIFECYCLE["superseded"] += 1
+        return {"id": nid or key, "key": key, "status": "superseded", "by": _RETIRED[key]}
+    if kind == "C":
+        if ref_key:
+            _retire(ref_key, None)
+        LIFECYCLE["cancelled"] += 1
+        return {"id": nid or key, "key": key, "status": "cancelled", "cancels": ref}
+
+    old = _retire(ref_key, nid) if kind == "R" and ref_key else None
+    if kind == "R":
+        LIFECYCLE["replaced"] += 1
+
+    validity = notam_validity(text)
+    if validity is not None and validity.end <= now:
+        return None
+    if parsed is None:
+        cleaned, sections = normalize_notam(text)
+        if old is not None and old.content == content_digest(sections):
+            parsed = ParsedNotam(cleaned=cleaned, sections=sections, segments=old.built)
+            LIFECYCLE["reused_parses"] += 1
+        else:
+            parsed = build_parsed_notam(text)
+    q = extract_qline(parsed.cleaned)
+    with _LOCK:
+        _drop_key(key)
+        spatial = SPATIAL_INDEX.add_notam(text, key=key, value=value) is not None
+        if validity is not None:
+            VALIDITY_INDEX.add(key, validity)
+        segments = FL_INDEX.add(key, parsed.segments)
+        if not spatial and validity is None and not segments:
+            return None
+        _add_record(NotamRecord(
+            id=key,
+            notam=text,
+            notam_id=nid or "",
+            issuer=issuer,
+            fir=q.get("fir", ""),
+            code=q.get("code", ""),
+            source=source,
+            segments=[s.to_dict() for s in FL_INDEX.segments_of(key)],
+            type=kind,
+            replaces=ref if kind == "R" else None,
+            content=content_digest(parsed.sections),
+            built=list(parsed.segments),
+        ))
+    return {
+        "id": nid or key,
+        "key": key,
+        "status": "replaced" if kind == "R" else "indexed",
+        "replaces": ref if kind == "R" else None,
+        "spatial": spatial,
+        "validity": validity.to_dict() if validity else None,
+        "segments": segments,
+    }
+
+
+def _drop_key(key: str) -> bool:
+    with _LOCK:
+        found = [_drop_record(key), SPATIAL_INDEX.remove(key), VALIDITY_INDEX.remove(key), FL_INDEX.remove(key)]
+    return any(found)
+
+
+def drop(key: str) -> bool:
+    """Remove a NOTAM from every index (a bare id: that id of every issuer)."""
+    with _LOCK:
+        return any([_drop_key(k) for k in _resolve(key) or [key]])
+
+
+def evict_expired(now: Optional[float] = None, lazy: bool = False):
+    """Evict NOTAMs whose C) time has passed (lazy: rate limited)."""
+    now = time.time() if now is None else now
+    return VALIDITY_INDEX.maybe_evict(now) if lazy else VALIDITY_INDEX.evict_expired(now)
+
+
+def get(key: str) -> Optional[NotamRecord]:
+    """Record by key; a bare id shared by several issuers returns the first."""
+    keys = _resolve(key)
+    return _RECORDS[keys[0]] if keys else None
+
+
+def sync_memory() -> int:
+    """Index memory entries saved since the last sync; returns how many."""
+    global _memory_seen, _memory_dirty, _memory_gen
+    gen = memory_engine.generation()
+    if not _memory_dirty and gen == _memory_gen:
+        return 0
+    _memory_dirty, _memory_gen = False, gen
+    added = 0
+    for e in memory_engine.iter_memory_entries(_memory_seen):
+        _memory_seen = e["id"]
+        res = index_notam(e["notam"], source="memory") if e.get("notam") else None
+        if res and res["status"] in ("indexed", "replaced"):
+            added += 1
+    return added
+
+
+def _memory_changed(tokens) -> None:
+    global _memory_seen, _memory_dirty
+    if tokens is None:  # store cleared: forget what came from it
+        with _LOCK:
+            for key in [k for k, r in _RECORDS.items() if r.source == "memory"]:
+                drop(key)
+        _memory_seen = 0
+    _memory_dirty = True
+
+
+def query(route: Optional[str] = None, fix: Optional[str] = None, fir: Optional[str] = None,
+          notam_id: Optional[str] = None, at: Optional[float] = None,
+          offset: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    Segments matching every given filter, one page at a time.
+    Candidates come from the smallest hash-index hit; `at` keeps only
+    NOTAMs in force then (NOTAMs without B/C are kept).
+    """
+    sync_memory()
+    evict_expired(lazy=True)
+    route, fix, fir = (v.strip().upper() if v else None for v in (route, fix, fir))
+    limit = max(1, min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+    offset = max(0, int(offset or 0))
+
+    with _LOCK:
+        sets = []
+        if notam_id:
+            nid = notam_id.strip()
+            sets.append(set(_resolve(nid)) | set(_resolve(nid.upper())))
+        for index, name in ((_BY_ROUTE, route), (_BY_FIX, fix), (_BY_FIR, fir)):
+            if name:
+                sets.append(index.get(name, set()))
+        if sets:
+            keys = set.intersection(*sorted(sets, key=len))
+        else:
+            keys = set(_RECORDS)
+        if at is not None:
+            active = set(VALIDITY_INDEX.active_at(at))
+            keys = {k for k in keys if k in active or VALIDITY_INDEX.get(k) is None}
+
+        rows = []
+        for key in sorted(keys):
+            rec = _RECORDS[key]
+            for s in rec.segments:
+                if route and s["route"] != route:
+                    continue
+                if fix and fix not in (s["from"], s["to"]):
+                    continue
+                rows.append({**s, "fir": rec.fir})
+
+    page = rows[offset:offset + limit]
+    nxt = offset + limit
+    return {
+        "total": len(rows),
+        "offset": offset,
+        "limit": limit,
+        "next_offset": nxt if nxt < len(rows) else None,
+        "items": page,
+    }
+
+
+def clear() -> None:
+    global _memory_seen, _memory_dirty
+    with _LOCK:
+        _RECORDS.clear()
+        _BY_ROUTE.clear()
+        _BY_FIX.clear()
+        _BY_FIR.clear()
+        _BY_ID.clear()
+        _RETIRED.clear()
+        SPATIAL_INDEX.clear()
+        VALIDITY_INDEX.clear()
+        FL_INDEX.clear()
+        _memory_seen = 0
+        _memory_dirty = True
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "records": len(_RECORDS),
+        "routes": len(_BY_ROUTE),
+        "fixes": len(_BY_FIX),
+        "firs": len(_BY_FIR),
+        "lifecycle": {**LIFECYCLE, "tombstones": len(_RETIRED)},
+        "spatial": SPATIAL_INDEX.stats(),
+        "validity": VALIDITY_INDEX.stats(),
+        "fl": FL_INDEX.stats(),
+    }
+
+
+# Expired NOTAMs leave the other indexes too
+VALIDITY_INDEX.on_expire(_drop_key)
+
+# New / cleared memory entries are picked up on the next query
+memory_engine.add_change_listener(_memory_changed, kinds=("entry", "clear"))
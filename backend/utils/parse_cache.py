@@ -0,0 +1,141 @@
+
+# Batch 10.4 — Parse Result Cache
+# Bounded LRU + TTL cache of final parse results.
+# Key: hash(parser version + pipeline name + NOTAM text as parsed [+ extra]);
+# the parsers are case-sensitive, so the key is the exact input text.
+# Entries are tagged with the route/fix tokens of the NOTAM and dropped
+# when memory_engine learns something about one of those tokens.
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from backend.utils import memory_engine
+from backend.utils.normalize import clean_raw_notam
+
+# Bump whenever parser output changes so stale results are never served
+PARSER_VERSION = "10.4"
+
+CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "1024"))
+CACHE_TTL = float(os.getenv("PARSE_CACHE_TTL", "600"))
+
+# Fix names (GITOV) and route designators (L736, UW75)
+_TAG_RE = re.compile(r"\b(?:[A-Z]{5}|[A-Z]{1,2}\d{1,4})\b")
+
+
+def notam_tags(cleaned: str) -> frozenset:
+    """Route/fix tokens a cached result depends on."""
+    return frozenset(_TAG_RE.findall(cleaned or ""))
+
+
+def text_tag(cleaned: str) -> str:
+    """Tag shared by every cached result of one NOTAM text (see discard)."""
+    return "#" + hashlib.sha1(cleaned.encode("utf-8")).hexdigest()[:16].upper()
+
+
+class ParseCache:
+    """Thread-safe LRU with per-entry TTL and tag-based invalidation."""
+
+    def __init__(self, maxsize: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(namespace: str, text: str, extra: str = "") -> str:
+        raw = "\0".join((PARSER_VERSION, namespace, text, extra))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, expires, _ = item
+            if expires < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any, tags: Iterable[str] = ()) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl, frozenset(tags))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def cached(self, namespace: str, text: str, compute: Callable[[], Any], extra: str = "") -> Any:
+        """
+        Return the cached result for this NOTAM or compute and store it.
+        Cached values are shared: callers must treat them as read-only.
+        """
+        # key on what compute() consumes: "e)rwy clsd" must not share a
+        # result with "E)RWY CLSD"; tags use the normalized text
+        text = text or ""
+        cleaned = clean_raw_notam(text)
+        key = self.make_key(namespace, text, extra)
+        hit = self.get(key)
+        if hit is not None:
+            return hit
+        value = compute()
+        if value is not None:
+            self.put(key, value, notam_tags(cleaned) | {text_tag(cleaned)})
+        return value
+
+    def invalidate_tags(self, tags: Optional[Iterable[str]]) -> int:
+        """Drop entries depending on any of `tags`; None drops everything."""
+        with self._lock:
+            if tags is None:
+                n = len(self._data)
+                self._data.clear()
+            else:
+                tags = {str(t).upper() for t in tags}
+                stale = [k for k, (_, _, t) in self._data.items() if t & tags]
+                for k in stale:
+                    del self._data[k]
+                n = len(stale)
+            self.invalidations += n
+            return n
+
+    def discard(self, text: str) -> int:
+        """Drop every cached result of this NOTAM text (replaced/cancelled)."""
+        return self.invalidate_tags({text_tag(clean_raw_notam(text))})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "parser_version": PARSER_VERSION,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+PARSE_CACHE = ParseCache()
+
+# Memory corrections change parse results for the NOTAMs that mention them
+memory_engine.add_change_listener(PARSE_CACHE.invalidate_tags)
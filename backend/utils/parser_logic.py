@@ -1,5 +1,8 @@
 import re
-from backend.utils.fl_utils import extract_flight_levels
+from backend.utils.fl_engine import fl_for
+from backend.utils.models import ParsedNotam
+from backend.utils.normalize import normalize_notam
+from backend.utils.parse_cache import PARSE_CACHE
 from backend.utils.similarity import find_similar_memory
 from backend.utils.confidence import score_output
 from backend.utils.memory_engine import save_memory_entry
@@ -31,10 +34,19 @@ def extract_segments(text):
     return segs
 
 def parse_notam_advanced(notam):
+    """Cached front of the hybrid parser (see parse_cache)."""
+    return PARSE_CACHE.cached("advanced", notam, lambda: _parse_notam_advanced(notam))
+
+def _parse_notam_advanced(notam):
     norm = normalize_text(notam)
 
-    # 1) Extract FL band
-    fl_min, fl_max = extract_flight_levels(norm)
+    # 1) Extract FL band (single pass over Q/F/G/E via fl_engine)
+    cleaned, sections = normalize_notam(notam)
+    if not sections.e:
+        # Bare E-line text pasted without section markers
+        sections.e = norm.upper()
+    fl = fl_for(ParsedNotam(cleaned=cleaned, sections=sections))
+    fl_min, fl_max = fl.fl_lower, fl.fl_upper_final
 
     # 2) Try rule-based extraction
     segments = extract_segments(norm)
@@ -3,24 +3,99 @@
 
 import re
 
+# Q)FIR/QCODE/TRAFFIC/PURPOSE/SCOPE/LOWER/UPPER/DDMMNDDDMMERRR
+_QLINE_RE = re.compile(
+    r'Q\)\s*([A-Z]{4})/([A-Z0-9]{4,5})/([A-Z ]{1,3})/([A-Z ]{1,3})/([A-Z ]{1,3})'
+    r'/(\d{3})/(\d{3})(?:/(\d{4}[NS]\d{5}[EW])(\d{3})?)?'
+)
+_COORD_RE = re.compile(r'(\d{2})(\d{2})([NS])(\d{3})(\d{2})([EW])')
+_NOTAM_ID_RE = re.compile(r'\b([A-Z]\d{4}/\d{2})\s+NOTAM([NRC])\b(?:\s+([A-Z]\d{4}/\d{2}))?')
+_ISSUER_RE = re.compile(r'Q\)\s*([A-Z]{4})/|\bA\)\s*([A-Z]{4})\b')
+
+
+def decode_coords(field):
+    """
+    "5435N02024E" -> (54.5833, 20.4)  (decimal degrees, S/W negative)
+    """
+    m = _COORD_RE.fullmatch(field or "")
+    if not m:
+        return None
+    lat = int(m.group(1)) + int(m.group(2)) / 60
+    lon = int(m.group(4)) + int(m.group(5)) / 60
+    if lat > 90 or lon > 180:
+        return None
+    return (
+        round(-lat if m.group(3) == "S" else lat, 4),
+        round(-lon if m.group(6) == "W" else lon, 4),
+    )
+
+
 def extract_qline(text):
     """
-    Extracts FIR, coords, radius, FL from Q-line.
-    Q)XXXX/XXXXX/..../RRR/BBBBB
+    Extracts FIR, code, FL, coords and radius from the Q-line.
+    Q)UUWV/QARLC/IV/NBO/E/000/999/5435N02024E028
+    lat/lon are decimal degrees of the area centre, radius is NM (int).
     """
-    qmatch = re.search(r'Q\)\s*([A-Z]{4})/([A-Z0-9]{4,5})/IV/[A-Z]{1,3}/E/(\d{1,3})/(\d{1,3})/?(\d{0,3})', text)
+    qmatch = _QLINE_RE.search(text)
     if not qmatch:
         return {}
 
+    coords = decode_coords(qmatch.group(8))
     return {
         "fir": qmatch.group(1),
         "code": qmatch.group(2),
-        "fl_lower": int(qmatch.group(3)),
-        "fl_upper": int(qmatch.group(4)),
-        "radius": qmatch.group(5) if qmatch.group(5) else None
+        "fl_lower": int(qmatch.group(6)),
+        "fl_upper": int(qmatch.group(7)),
+        "lat": coords[0] if coords else None,
+        "lon": coords[1] if coords else None,
+        "radius": int(qmatch.group(9)) if coords and qmatch.group(9) else None
     }
 
 
+def extract_notam_id(text):
+    """
+    Series/number/year from the header: "Q0381/25 NOTAMN" -> "Q0381/25"
+    """
+    m = _NOTAM_ID_RE.search(text or "")
+    return m.group(1) if m else None
+
+
+def extract_notam_issuer(text):
+    """
+    Issuer a NOTAM id belongs to: the Q-line FIR, else the first A) location.
+    Ids like "A0001/27" are unique only per issuing NOF.
+    """
+    found = _ISSUER_RE.findall(text or "")
+    for fir, _ in found:
+        if fir:
+            return fir
+    return found[0][1] if found else ""
+
+
+def scoped_notam_id(issuer, notam_id):
+    """("UUWV", "Q0381/25") -> "UUWV:Q0381/25"; the bare id without an issuer."""
+    return f"{issuer}:{notam_id}" if issuer and notam_id else notam_id
+
+
+def notam_uid(text):
+    """
+    Issuer-scoped id of a NOTAM: "UUWV:Q0381/25" (None without a header id).
+    """
+    nid = extract_notam_id(text)
+    return scoped_notam_id(extract_notam_issuer(text), nid) if nid else None
+
+
+def extract_notam_header(text):
+    """
+    "Q0390/25 NOTAMR Q0381/25" -> {"id": "Q0390/25", "type": "R", "ref": "Q0381/25"}
+    type N (new), R (replace) or C (cancel); ref is the NOTAM replaced/cancelled.
+    """
+    m = _NOTAM_ID_RE.search(text or "")
+    if not m:
+        return {}
+    return {"id": m.group(1), "type": m.group(2), "ref": m.group(3) if m.group(2) != "N" else None}
+
+
 def extract_e_line_routes(text):
     """
     Extract segments from E) lines:
@@ -4,7 +4,9 @@
 
 import re
 from backend.utils.segment_builder import build_segments
-from backend.utils.fl_master import fl_master
+from backend.utils.fl_engine import compute_fl, scan_inline_bands
+from backend.utils.models import FLBand
+from backend.utils.models import Segment
 
 def extract_raw_segments(eline):
     """
@@ -14,17 +16,42 @@ def extract_raw_segments(eline):
     - A846 MAVAX-ABDAN
     - 1-AWY A/UA28 TELVO-MUT CLSD
     - 2-AWY W/UW75 AZBUL-SELVI CLSD
+    Segment-local FL (L736 NEDRA-GOMED FL045-FL130) is attached as
+    Segment.band: each FL token binds to the nearest preceding route.
     """
     if not eline:
         return []
 
     e = eline.upper()
 
+    # One scan for FL tokens; mask them so they never read as routes/fixes
+    bands = scan_inline_bands(e)
+    if bands:
+        parts, pos = [], 0
+        for start, end, _, _ in bands:
+            parts.append(e[pos:start])
+            parts.append("." * (end - start))
+            pos = end
+        parts.append(e[pos:])
+        e = "".join(parts)
+
     # Match routes like A909 XXX-YYY-... or AWY A/UA28 ...
     pattern = r'(A|B|G|R|W|UA|UB|UG|UR|UW)?\s?([A-Z]{1,3}\d{1,4})\s+([A-Z0-9\-\s]+)'
     results = []
+    matches = list(re.finditer(pattern, e))
+
+    # Bind bands to routes: nearest preceding match, first band wins
+    route_band = [None] * len(matches)
+    mi = -1
+    for start, _, low, high in bands:
+        while mi + 1 < len(matches) and matches[mi + 1].start() <= start:
+            mi += 1
+        if mi >= 0 and route_band[mi] is None:
+            route_band[mi] = FLBand(fl_lower=low, fl_upper_final=high,
+                                    inline_source_low=low, inline_source_high=high,
+                                    original_low=low, original_high=high)
 
-    for m in re.finditer(pattern, e):
+    for m, band in zip(matches, route_band):
         route_prefix = m.group(1) or ""
         route_number = m.group(2)
         route = (route_prefix + route_number).replace(" ", "")
@@ -34,21 +61,19 @@ def extract_raw_segments(eline):
         fixes = [f.strip() for f in re.split(r'-', seg_text) if f.strip()]
 
         for i in range(len(fixes)-1):
-            results.append({
-                "route": route,
-                "from": fixes[i],
-                "to": fixes[i+1]
-            })
+            results.append(Segment(route, fixes[i], fixes[i+1], band=band))
 
     return results
 
-def process_eline(eline, fline, gline, qline):
+def process_eline(eline, fline, gline, qline, fl_info=None):
     """
     Master E-line processor → FL → segment builder
     Returns final segments + fl_info
+    Pass fl_info when the caller already holds the NOTAM's FLBand.
     """
-    # Step 1: FL extraction
-    fl_info = fl_master(eline, fline, gline, qline)
+    # Step 1: FL extraction (skipped when already computed)
+    if fl_info is None:
+        fl_info = compute_fl(qline, fline, gline, eline)
 
     # Step 2: Extract raw segments
     raw = extract_raw_segments(eline)
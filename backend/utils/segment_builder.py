@@ -10,6 +10,8 @@
 import re
 from backend.utils.fix_validator import validate_fix
 from backend.utils.memory_engine import memory_lookup
+from backend.utils.fl_engine import combine_bands
+from backend.utils.models import Segment
 
 def is_suspicious_fix(fix):
     if not fix:
@@ -33,11 +35,13 @@ def normalize_route_name(r):
 def build_segments(raw_segments, fl_info):
     output=[]
     seen=set()
+    fl_string=fl_info.label()
+    q_band=(fl_info.q_low, fl_info.q_high)
 
     for seg in raw_segments:
-        rte = normalize_route_name(seg.get("route",""))
-        p1  = seg.get("from","").upper()
-        p2  = seg.get("to","").upper()
+        rte = normalize_route_name(seg.route)
+        p1  = seg.from_fix.upper()
+        p2  = seg.to_fix.upper()
 
         # Memory repair if suspicious
         if is_suspicious_fix(p1):
@@ -58,18 +62,14 @@ def build_segments(raw_segments, fl_info):
         if not p1 or not p2: 
             continue
 
-        key=f"{rte}:{p1}-{p2}"
-        if key in seen:
+        # Segment-local band (clamped to Q) overrides the NOTAM-wide one
+        if seg.band is not None:
+            band=combine_bands((seg.band.fl_lower, seg.band.fl_upper_final), (None, None), q_band)
+            seg_out=Segment(rte, p1, p2, band.label(), band)
+        else:
+            seg_out=Segment(rte, p1, p2, fl_string, fl_info)
+        if seg_out.key in seen:
             continue
-        seen.add(key)
-
-        fl_string=f"FL{fl_info['fl_lower']:03d}-FL{fl_info['fl_upper_final']:03d}"
-
-        output.append({
-            "route": rte,
-            "from": p1,
-            "to": p2,
-            "segment": f"{p1}-{p2}",
-            "fl": fl_string
-        })
+        seen.add(seg_out.key)
+        output.append(seg_out)
     return output
@@ -0,0 +1,197 @@
+# Batch 10.15 — Semantic AI Answer Cache
+# Reuses a previous AI answer for a near-duplicate NOTAM (same closure,
+# new series number or dates) instead of paying for another LLM call.
+# Operational tokens = E/F/G text (header, series and B/C/D dates left
+# out); score = similarity.combined_score. Tokens that change meaning
+# (routes, fixes, levels — anything with a digit, and fix pairs) must
+# match exactly. Candidates come from an inverted index on operational
+# tokens (rarest first), so a lookup scores a handful of entries rather
+# than the whole store.
+
+import hashlib
+import itertools
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+from backend.utils import memory_engine
+from backend.utils.normalize import clean_raw_notam, split_sections
+from backend.utils.similarity import combined_score, tokenize
+
+SEMANTIC_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9"))
+SEMANTIC_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "2000"))
+SEMANTIC_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+MAX_CANDIDATES = 64
+
+_FIX_PAIR_RE = re.compile(r"\b([A-Z]{2,5})\s*-\s*([A-Z]{2,5})\b")
+
+
+def notam_profile(cleaned: str):
+    """(operational tokens, full tokens, critical tokens) of a cleaned NOTAM."""
+    sections = split_sections(cleaned)
+    body = " ".join(filter(None, (sections.e, sections.f, sections.g))) or cleaned
+    op = frozenset(tokenize(body))
+    critical = {t for t in op if any(ch.isdigit() for ch in t)}
+    for pair in _FIX_PAIR_RE.findall(body):
+        critical.update(pair)
+    return op, frozenset(tokenize(cleaned)), frozenset(critical)
+
+
+class SemanticHit(NamedTuple):
+    value: Any
+    source: str
+    score: float
+    notam: str
+
+
+class _Entry(NamedTuple):
+    namespace: str
+    notam: str
+    op: frozenset
+    full: frozenset
+    critical: frozenset
+    value: Any
+    source: str
+    expires: float
+
+
+class SemanticCache:
+    def __init__(self, threshold: float = SEMANTIC_THRESHOLD,
+                 maxsize: int = SEMANTIC_SIZE, ttl: float = SEMANTIC_TTL):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._index: Dict[tuple, set] = {}     # (namespace, token) → entry ids
+        self._exact: Dict[str, int] = {}       # hash(namespace, cleaned) → entry id
+        self._namespaces: set = set()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.exact_hits = 0
+        self.misses = 0
+        self.scored = 0
+
+    @staticmethod
+    def _exact_key(namespace: str, cleaned: str) -> str:
+        return hashlib.sha1(f"{namespace}\0{cleaned}".encode("utf-8")).hexdigest()
+
+    def put(self, namespace: str, notam: str, value: Any, source: str) -> None:
+        cleaned = clean_raw_notam(notam)
+        op, full, critical = notam_profile(cleaned)
+        if not op:
+            return
+        with self._lock:
+            key = self._exact_key(namespace, cleaned)
+            if key in self._exact:
+                self._drop(self._exact[key])
+            self._namespaces.add(namespace)
+            eid = next(self._ids)
+            self._entries[eid] = _Entry(namespace, cleaned, op, full, critical,
+                                        value, source, time.monotonic() + self.ttl)
+            self._exact[key] = eid
+            for tok in op:
+                self._index.setdefault((namespace, tok), set()).add(eid)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def lookup(self, namespace: str, notam: str) -> Optional[SemanticHit]:
+        cleaned = clean_raw_notam(notam)
+        now = time.monotonic()
+        with self._lock:
+            eid = self._exact.get(self._exact_key(namespace, cleaned))
+            if eid is not None and self._entries[eid].expires >= now:
+                e = self._entries[eid]
+                self.hits += 1
+                self.exact_hits += 1
+                return SemanticHit(e.value, e.source, 1.0, e.notam)
+
+            op, full, critical = notam_profile(cleaned)
+            best, best_score = None, 0.0
+            for eid in self._candidates(namespace, op):
+                e = self._entries[eid]
+                if e.expires < now or e.critical != critical:
+                    continue
+                self.scored += 1
+                score = combined_score(op, full, e.op, e.full)
+                if score > best_score:
+                    best, best_score = e, score
+            if best is not None and best_score >= self.threshold:
+                self.hits += 1
+                return SemanticHit(best.value, best.source, round(best_score, 4), best.notam)
+            self.misses += 1
+            return None
+
+    def _candidates(self, namespace: str, op: Iterable[str]):
+        """Entries sharing tokens with the query, rarest tokens first."""
+        postings = sorted(
+            (self._index.get((namespace, tok), ()) for tok in op), key=len
+        )
+        seen = set()
+        for ids in postings:
+            seen.update(ids)
+            if len(seen) >= MAX_CANDIDATES:
+                break
+        return seen
+
+    def _drop(self, eid: int) -> None:
+        e = self._entries.pop(eid, None)
+        if e is None:
+            return
+        for tok in e.op:
+            ids = self._index.get((e.namespace, tok))
+            if ids is not None:
+                ids.discard(eid)
+                if not ids:
+                    del self._index[(e.namespace, tok)]
+        key = self._exact_key(e.namespace, e.notam)
+        if self._exact.get(key) == eid:
+            del self._exact[key]
+
+    def invalidate_tags(self, tags: Optional[Iterable[str]]) -> int:
+        """Drop answers for NOTAMs mentioning any of `tags`; None drops everything."""
+        with self._lock:
+            if tags is None:
+                stale = list(self._entries)
+            else:
+                tags = {str(t).upper() for t in tags}
+                stale = [eid for eid, e in self._entries.items() if e.op & tags]
+            for eid in stale:
+                self._drop(eid)
+            return len(stale)
+
+    def discard(self, notam: str) -> int:
+        """Drop the answers stored for exactly this NOTAM (replaced/cancelled)."""
+        cleaned = clean_raw_notam(notam)
+        with self._lock:
+            ids = [self._exact.get(self._exact_key(ns, cleaned)) for ns in self._namespaces]
+            ids = [eid for eid in ids if eid is not None]
+            for eid in ids:
+                self._drop(eid)
+            return len(ids)
+
+    def clear(self) -> None:
+        self.invalidate_tags(None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "exact_hits": self.exact_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "avg_scored_per_lookup": round(self.scored / lookups, 2) if lookups else 0.0,
+            }
+
+
+SEMANTIC_CACHE = SemanticCache()
+
+# A learned fix correction makes old answers mentioning that fix stale;
+# new memory entries do not change what a provider answered
+memory_engine.add_change_listener(SEMANTIC_CACHE.invalidate_tags, kinds=("fix", "clear"))
@@ -0,0 +1,106 @@
+# Batch 10.23 — Multi-Worker Store
+# Lets several worker processes (gunicorn/uvicorn --workers) share
+# memory_store.json without racing.
+# Handles:
+#   - single writer: every read-modify-write of the store runs under an
+#     exclusive flock on <store>.lock (and a thread lock within a process),
+#     so concurrent saves from different workers no longer lose entries
+#   - generation counter: 8 bytes in an mmapped <store>.gen, bumped after
+#     each write; workers compare it with one memory read (no syscall) to
+#     know when to catch up their derived indexes
+#   - pre-fork warm-up: the master loads the corpus layer and memory
+#     indexes once, then gc.freeze()s them so forked workers share those
+#     pages copy-on-write (backend/gunicorn_conf.py)
+# Without fcntl (Windows) the flock is skipped: one process only there.
+
+import gc
+import mmap
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict
+
+try:
+    import fcntl
+except ImportError:  # not POSIX
+    fcntl = None
+
+_LOCK = threading.RLock()
+_GENERATIONS: Dict[str, "Generation"] = {}
+
+
+class Generation:
+    """Shared 64-bit counter in a tiny mmapped file next to the store."""
+
+    SIZE = 8
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < self.SIZE:
+                os.ftruncate(fd, self.SIZE)
+            self._mm = mmap.mmap(fd, self.SIZE)
+        finally:
+            os.close(fd)
+
+    @property
+    def value(self) -> int:
+        # a read racing a bump may be torn; callers only test for change,
+        # so that costs one extra catch-up at worst
+        return int.from_bytes(self._mm[:self.SIZE], "little")
+
+    def bump(self) -> int:
+        """Increment; call with the writer lock held."""
+        value = (self.value + 1) & 0xFFFFFFFFFFFFFFFF
+        self._mm[:self.SIZE] = value.to_bytes(self.SIZE, "little")
+        return value
+
+
+def generation(store: Path) -> Generation:
+    """Counter of a store file (memory_store.json → memory_store.gen)."""
+    key = str(store)
+    gen = _GENERATIONS.get(key)
+    if gen is None:
+        with _LOCK:
+            gen = _GENERATIONS.get(key)
+            if gen is None:
+                gen = _GENERATIONS[key] = Generation(Path(store).with_suffix(".gen"))
+    return gen
+
+
+@contextmanager
+def writer(store: Path):
+    """Exclusive write access to the store across threads and processes."""
+    store = Path(store)
+    with _LOCK:
+        store.parent.mkdir(parents=True, exist_ok=True)
+        fh = open(store.with_suffix(".lock"), "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                generation(store).bump()
+        finally:
+            fh.close()  # releases the flock
+
+
+def prefork_warm() -> Dict[str, Any]:
+    """
+    Build everything workers read before the master forks, then move it
+    out of the collector's reach so workers don't dirty the shared pages.
+    """
+    from backend.utils import corpus_memory, notam_store
+    from backend.utils.memory_index import MEMORY_INDEX
+
+    if corpus_memory.WARM_START:
+        corpus_memory.CORPUS_MEMORY.load()
+    MEMORY_INDEX.load()
+    notam_store.sync_memory()
+    gc.collect()
+    gc.freeze()
+    return {"frozen": gc.get_freeze_count(), "memory_index": MEMORY_INDEX.stats()}
@@ -1,5 +1,5 @@
 import re
-from backend.utils.memory_engine import get_all_memory_entries
+from backend.utils import corpus_memory
 
 
 # tokenize for cosine-like similarity
@@ -32,42 +32,31 @@ def extract_operational(text):
     return " ".join(parts)
 
 SIM_THRESHOLD = 0.75
+OP_WEIGHT = 0.70
 
-def find_similar_memory(notam_text):
-    memories = get_all_memory_entries()
-    if not memories:
-        return None
-
-    op_text = extract_operational(notam_text)
-    op_tokens = tokenize(op_text)
-    full_tokens = tokenize(notam_text)
-
-    best_score = 0.0
-    best_item = None
-
-    for entry in memories:
-        mem_notam = entry["notam"]
-        mem_output = entry["output"]
-        mem_ts = entry["timestamp"]
+def operational_tokens(text):
+    """(operational token set, full token set) used by combined_score."""
+    return set(tokenize(extract_operational(text))), set(tokenize(text))
 
-        mem_op = extract_operational(mem_notam)
-        mem_op_tokens = tokenize(mem_op)
-        mem_full_tokens = tokenize(mem_notam)
+def combined_score(op_a, full_a, op_b, full_b):
+    """70% operational-core similarity + 30% whole-text similarity."""
+    return OP_WEIGHT * cosine_like(op_a, op_b) + (1 - OP_WEIGHT) * cosine_like(full_a, full_b)
 
-        op_sim = cosine_like(op_tokens, mem_op_tokens)
-        full_sim = cosine_like(full_tokens, mem_full_tokens)
-
-        final_score = 0.70 * op_sim + 0.30 * full_sim
-
-        if final_score >= SIM_THRESHOLD:
-            if final_score > best_score:
-                best_score = final_score
-                best_item = entry
-            elif abs(final_score - best_score) < 1e-6:
-                # tie → choose newest
-                if entry["timestamp"] > best_item["timestamp"]:
-                    best_item = entry
-
-    if best_item:
-        return best_item["output"]
+def find_similar_memory(notam_text):
+    """
+    Output of the most similar learned entry (newest wins ties), else of
+    the most similar corpus entry (corpus_memory warm start), else None.
+    Learned entries are scored from memory_index's precomputed tokens.
+    """
+    from backend.utils.memory_index import MEMORY_INDEX
+
+    op_tokens, full_tokens = operational_tokens(notam_text)
+    _, output = MEMORY_INDEX.similar(op_tokens, full_tokens, SIM_THRESHOLD)
+    if output:
+        return output
+
+    if corpus_memory.WARM_START:
+        _, hit = corpus_memory.CORPUS_MEMORY.similar(op_tokens, full_tokens, SIM_THRESHOLD)
+        if hit:
+            return hit["output"]
     return None
@@ -0,0 +1,51 @@
+# Batch 10.21 — Binary Snapshots
+# Versioned marshal files for derived indexes, so a (re)starting worker
+# loads them in milliseconds instead of rebuilding from JSON.
+# Handles:
+#   - header (format, kind, schema) checked before the payload is used;
+#     any mismatch or damage reads as "no snapshot"
+#   - atomic write (tmp + replace); a read-only filesystem just skips it
+#   - source fingerprints (size, mtime_ns) to tell when one is stale
+# Payloads must be marshal types (dict/list/tuple/set/str/int/float/bool/None);
+# unlike pickle, loading one never runs code.
+
+import marshal
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+FORMAT = "oss-snapshot/1"
+
+
+def fingerprint(path: Path) -> Optional[List[int]]:
+    """[size, mtime_ns] of a source file, None when it does not exist."""
+    try:
+        st = Path(path).stat()
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def write_snapshot(path: Path, kind: str, schema: int, payload: Dict[str, Any]) -> bool:
+    path = Path(path)
+    data = {"format": FORMAT, "kind": kind, "schema": schema, "payload": payload}
+    try:
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(marshal.dumps(data))
+        tmp.replace(path)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def read_snapshot(path: Path, kind: str, schema: int) -> Optional[Dict[str, Any]]:
+    """The payload, or None if missing, damaged or of another kind/schema."""
+    try:
+        data = marshal.loads(Path(path).read_bytes())  # one read: marshal.load(fh) reads piecemeal
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(data, dict) or data.get("format") != FORMAT:
+        return None
+    if data.get("kind") != kind or data.get("schema") != schema:
+        return None
+    payload = data.get("payload")
+    return payload if isinstance(payload, dict) else None
@@ -1,15 +1,22 @@
 
 # Batch 7E-6 — Soft Merge Engine (Parser + AI + Memory)
 
+import os
 from backend.utils.fix_validator import validate_fix
+from backend.utils.models import Segment
+
+# Parser confidence at/above which AI output is not needed ("parser-strong")
+PARSER_STRONG = float(os.getenv("PARSER_STRONG_THRESHOLD", "0.75"))
+
+def _as_segment(raw):
+    return raw if isinstance(raw, Segment) else Segment.from_dict(raw)
 
 def clean_ai_segments(ai_json):
-    """Validate AI segments and return only safe ones."""
+    """Validate AI segments and return only safe ones as Segment records."""
     safe=[]
-    for seg in ai_json or []:
-        p1 = seg.get("from","").upper()
-        p2 = seg.get("to","").upper()
-        if validate_fix(p1) and validate_fix(p2):
+    for raw in ai_json or []:
+        seg = _as_segment(raw)
+        if validate_fix(seg.from_fix) and validate_fix(seg.to_fix):
             safe.append(seg)
     return safe
 
@@ -19,18 +26,16 @@ def merge_segments(parser_json, ai_json, memory):
     seen=set()
 
     # add parser first
-    for seg in parser_json:
-        key=f"{seg.get('route')}:{seg.get('segment')}"
-        if key not in seen:
+    for seg in map(_as_segment, parser_json):
+        if seg.key not in seen:
             merged.append(seg)
-            seen.add(key)
+            seen.add(seg.key)
 
     # add AI segments if valid
     for seg in ai_json:
-        key=f"{seg.get('route')}:{seg.get('segment')}"
-        if key not in seen:
+        if seg.key not in seen:
             merged.append(seg)
-            seen.add(key)
+            seen.add(seg.key)
 
     # future: memory reinforcement
 
@@ -49,7 +54,7 @@ def soft_merge(parser, ai, memory):
     conf = parser.get("confidence",0)
 
     # Strong parser
-    if conf >= 0.75:
+    if conf >= PARSER_STRONG:
         return {
             "text": parser.get("text",""),
             "json": parser_json,
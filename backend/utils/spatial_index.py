@@ -0,0 +1,244 @@
+# Batch 10.16 — Spatial Index
+# Grid index over the Q-line area (centre + radius NM) of parsed NOTAMs.
+# Handles:
+#   - point queries ("which NOTAMs cover this position")
+#   - bounding-box queries (south/west/north/east, antimeridian aware)
+#   - route-corridor queries (polyline + half-width NM)
+# Each area is registered in every grid cell its bounding box touches, so a
+# query only scores the NOTAMs of the cells it overlaps. Areas wider than
+# SPATIAL_WIDE_RADIUS (e.g. whole-FIR 999 NM) sit in one list checked always.
+
+import hashlib
+import math
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.utils.normalize import clean_raw_notam
+from backend.utils.q_e_logic import extract_qline, notam_uid
+
+CELL_DEG = float(os.getenv("SPATIAL_CELL_DEG", "1.0"))
+WIDE_RADIUS_NM = float(os.getenv("SPATIAL_WIDE_RADIUS", "300"))
+
+EARTH_RADIUS_NM = 3440.065
+NM_PER_DEG = 60.0
+
+
+def distance_nm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle (haversine) distance in nautical miles."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_NM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _wrap(lon: float) -> float:
+    return (lon + 180.0) % 360.0 - 180.0
+
+
+def _lon_span(lat: float, nm: float) -> float:
+    return nm / (NM_PER_DEG * max(math.cos(math.radians(min(abs(lat), 89.0))), 0.01))
+
+
+def _leg_distance_nm(lat: float, lon: float, a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """Distance from a point to leg a→b (local flat projection around the point)."""
+    k = math.cos(math.radians(lat))
+    ax, ay = _wrap(a[1] - lon) * k * NM_PER_DEG, (a[0] - lat) * NM_PER_DEG
+    bx, by = _wrap(b[1] - lon) * k * NM_PER_DEG, (b[0] - lat) * NM_PER_DEG
+    dx, dy = bx - ax, by - ay
+    seg = dx * dx + dy * dy
+    t = 0.0 if seg == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / seg))
+    return math.hypot(ax + t * dx, ay + t * dy)
+
+
+@dataclass(slots=True)
+class Area:
+    """Q-line circle of one NOTAM plus whatever the caller wants returned."""
+    key: str
+    lat: float
+    lon: float
+    radius: float
+    value: Any = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.key, "lat": self.lat, "lon": self.lon, "radius": self.radius, "value": self.value}
+
+
+class SpatialIndex:
+    """Thread-safe uniform grid (CELL_DEG degrees) of NOTAM areas."""
+
+    def __init__(self, cell_deg: float = CELL_DEG, wide_radius: float = WIDE_RADIUS_NM):
+        self.cell_deg = cell_deg
+        self.wide_radius = wide_radius
+        self._cols = max(1, int(math.ceil(360.0 / cell_deg)))
+        self._areas: Dict[str, Area] = {}
+        self._cells: Dict[Tuple[int, int], set] = {}
+        self._wide: set = set()
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.scored = 0
+
+    # ---------------- grid ----------------
+
+    def _row(self, lat: float) -> int:
+        return int(math.floor((max(-90.0, min(90.0, lat)) + 90.0) / self.cell_deg))
+
+    def _col(self, lon: float) -> int:
+        return int(math.floor((lon + 180.0) / self.cell_deg)) % self._cols
+
+    def _cells_for(self, south: float, west: float, north: float, east: float) -> Iterable[Tuple[int, int]]:
+        """Cells of a box; west > east means the box crosses the antimeridian."""
+        first = self._col(west)
+        if (east - west) % 360.0 > 360.0 - self.cell_deg:
+            ncols = self._cols
+        else:
+            ncols = (self._col(east) - first) % self._cols + 1
+        for row in range(self._row(south), self._row(north) + 1):
+            for i in range(ncols):
+                yield row, (first + i) % self._cols
+
+    def _area_cells(self, a: Area) -> Iterable[Tuple[int, int]]:
+        dlat, dlon = a.radius / NM_PER_DEG, _lon_span(a.lat, a.radius)
+        if dlon >= 180.0:
+            return self._cells_for(a.lat - dlat, -180.0, a.lat + dlat, 180.0 - 1e-9)
+        return self._cells_for(a.lat - dlat, _wrap(a.lon - dlon), a.lat + dlat, _wrap(a.lon + dlon))
+
+    # ---------------- writes ----------------
+
+    def add(self, key: str, lat: float, lon: float, radius: float, value: Any = None) -> Area:
+        """Index (or re-index) one area under `key`."""
+        area = Area(key, float(lat), round(_wrap(float(lon)), 6), max(0.0, float(radius or 0)), value)
+        with self._lock:
+            self._remove(key)
+            self._areas[key] = area
+            if area.radius > self.wide_radius:
+                self._wide.add(key)
+            else:
+                for cell in self._area_cells(area):
+                    self._cells.setdefault(cell, set()).add(key)
+        return area
+
+    def add_notam(self, text: str, key: Optional[str] = None, value: Any = None) -> Optional[str]:
+        """
+        Decode the Q-line and index it. Key defaults to the issuer-scoped
+        NOTAM id ("UUWV:Q0381/25") or a hash of the normalized text. Dict values are stored
+        merged over the decoded Q-line. None if the Q-line has no coords.
+        """
+        q = extract_qline(text or "")
+        if q.get("lat") is None:
+            return None
+        key = key or notam_uid(text) or hashlib.sha1(clean_raw_notam(text).encode("utf-8")).hexdigest()[:16]
+        if value is None or isinstance(value, dict):
+            value = {**q, **(value or {})}
+        self.add(key, q["lat"], q["lon"], q["radius"] or 0, value)
+        return key
+
+    def _remove(self, key: str) -> bool:
+        area = self._areas.pop(key, None)
+        if area is None:
+            return False
+        if key in self._wide:
+            self._wide.discard(key)
+            return True
+        for cell in self._area_cells(area):
+            keys = self._cells.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._cells[cell]
+        return True
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._areas.clear()
+            self._cells.clear()
+            self._wide.clear()
+
+    # ---------------- queries ----------------
+
+    def get(self, key: str) -> Optional[Area]:
+        return self._areas.get(key)
+
+    def _candidates(self, cells: Iterable[Tuple[int, int]]) -> List[Area]:
+        keys = set(self._wide)
+        for cell in cells:
+            keys.update(self._cells.get(cell, ()))
+        self.queries += 1
+        self.scored += len(keys)
+        return [self._areas[k] for k in keys]
+
+    def query_point(self, lat: float, lon: float) -> List[Area]:
+        """Areas containing the point, nearest centre first."""
+        lon = _wrap(lon)
+        with self._lock:
+            hits = []
+            for a in self._candidates([(self._row(lat), self._col(lon))]):
+                d = distance_nm(lat, lon, a.lat, a.lon)
+                if d <= a.radius:
+                    hits.append((d, a.key, a))
+        return [a for _, _, a in sorted(hits, key=lambda h: (h[0], h[1]))]
+
+    def query_bbox(self, south: float, west: float, north: float, east: float) -> List[Area]:
+        """Areas intersecting the box (west > east crosses the antimeridian)."""
+        south, north = min(south, north), max(south, north)
+        west, east = _wrap(west), _wrap(east)
+        span = (east - west) % 360.0
+        with self._lock:
+            hits = []
+            for a in self._candidates(self._cells_for(south, west, north, east)):
+                clat = max(south, min(north, a.lat))
+                if (a.lon - west) % 360.0 <= span:
+                    clon = a.lon
+                else:
+                    clon = west if abs(_wrap(a.lon - west)) <= abs(_wrap(a.lon - east)) else east
+                if distance_nm(a.lat, a.lon, clat, clon) <= a.radius:
+                    hits.append(a)
+        return sorted(hits, key=lambda a: a.key)
+
+    def query_corridor(self, points: Sequence[Tuple[float, float]], width_nm: float = 10.0) -> List[Area]:
+        """
+        Areas within `width_nm` of the polyline (lat, lon) points,
+        ordered by where along the route they are first met.
+        """
+        pts = [(float(lat), _wrap(float(lon))) for lat, lon in points]
+        if not pts:
+            return []
+        legs = list(zip(pts, pts[1:])) or [(pts[0], pts[0])]
+        cells = set()
+        for a, b in legs:
+            dlat = width_nm / NM_PER_DEG
+            dlon = _lon_span(max(abs(a[0]), abs(b[0])) + dlat, width_nm)
+            forward = _wrap(b[1] - a[1])
+            west, east = (a[1], a[1] + forward) if forward >= 0 else (a[1] + forward, a[1])
+            cells.update(self._cells_for(min(a[0], b[0]) - dlat, _wrap(west - dlon),
+                                         max(a[0], b[0]) + dlat, _wrap(east + dlon)))
+        with self._lock:
+            hits = []
+            for area in self._candidates(cells):
+                for i, (a, b) in enumerate(legs):
+                    if _leg_distance_nm(area.lat, area.lon, a, b) <= area.radius + width_nm:
+                        hits.append((i, area.key, area))
+                        break
+        return [a for _, _, a in sorted(hits, key=lambda h: (h[0], h[1]))]
+
+    def __len__(self) -> int:
+        return len(self._areas)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._areas),
+                "cell_deg": self.cell_deg,
+                "cells": len(self._cells),
+                "wide": len(self._wide),
+                "queries": self.queries,
+                "avg_scored": round(self.scored / self.queries, 2) if self.queries else 0.0,
+            }
+
+
+SPATIAL_INDEX = SpatialIndex()
@@ -0,0 +1,397 @@
+# Batch 10.17 — Validity Windows
+# B)/C)/D) lines → UTC activity intervals, indexed in an interval tree.
+# Handles:
+#   - B)2508150000 C)2508152359 (YYMMDDHHMM), C) ... EST, C)PERM
+#   - D) schedules: "0630-1000 1200-1400", "DAILY 0200-0900",
+#     "12-15 0600-2200", "15 16 0000-1900", "AUG 12-15 ...",
+#     "MON-FRI 0600-1600", "H24", overnight "2200-0600"
+#   - D) text that cannot be decoded → whole B–C window (never drops a NOTAM)
+#   - C)PERM + D): intervals are materialized at most SCHEDULE_HORIZON_DAYS
+#     past now (rolling, extended as queries move forward); later times
+#     are answered by decoding the schedule on the fly, never stored
+#   - active-at-T / active-during-[t1, t2] queries and expiry eviction
+
+import heapq
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.utils.interval_tree import IntervalTree
+from backend.utils.normalize import normalize_notam
+
+# PERM NOTAMs with a D) schedule are expanded this far ahead at a time
+SCHEDULE_HORIZON_DAYS = int(os.getenv("SCHEDULE_HORIZON_DAYS", "366"))
+EVICT_INTERVAL = float(os.getenv("VALIDITY_EVICT_INTERVAL", "60"))
+
+FOREVER = float("inf")
+
+MONTHS = {m: i for i, m in enumerate(
+    ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"), 1)}
+WEEKDAYS = {d: i for i, d in enumerate(("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"))}
+
+_TIME_RE = re.compile(r"^(\d{10})(?:\s*(EST))?$")
+_RANGE_RE = re.compile(r"^(\d{4})-(\d{4})$")
+_DAYS_RE = re.compile(r"^(\d{1,2})-(\d{1,2})$")
+
+
+def parse_notam_time(value: str) -> Optional[datetime]:
+    """'2508150000' → 2025-08-15 00:00 UTC; PERM/garbage → None."""
+    m = _TIME_RE.match((value or "").strip().upper())
+    if not m:
+        return None
+    try:
+        return datetime.strptime(m.group(1), "%y%m%d%H%M").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def _hhmm(value: str) -> Optional[timedelta]:
+    h, m = int(value[:2]), int(value[2:])
+    if h > 24 or m > 59 or (h == 24 and m):
+        return None
+    return timedelta(hours=h, minutes=m)
+
+
+@dataclass
+class _Group:
+    """Days a D) group applies to + its daily time ranges."""
+    daily: bool = False
+    days: set = field(default_factory=set)        # (month or None, day)
+    weekdays: set = field(default_factory=set)
+    times: List[Tuple[timedelta, timedelta]] = field(default_factory=list)
+
+    def selects(self) -> bool:
+        return self.daily or bool(self.days or self.weekdays)
+
+    def matches(self, d: datetime) -> bool:
+        if self.daily or not self.selects():
+            return True
+        return (
+            (None, d.day) in self.days
+            or (d.month, d.day) in self.days
+            or d.weekday() in self.weekdays
+        )
+
+
+def parse_schedule(text: str) -> Optional[List[_Group]]:
+    """D) text → groups, or None when any token is not understood."""
+    tokens = [t for t in re.split(r"[\s,]+", (text or "").upper().strip().rstrip(".")) if t]
+    if not tokens:
+        return None
+    groups: List[_Group] = []
+    cur = _Group()
+    month = None
+
+    def selector():
+        nonlocal cur
+        if cur.times:  # days after times start the next group
+            groups.append(cur)
+            cur = _Group()
+        return cur
+
+    for tok in tokens:
+        m = _RANGE_RE.match(tok)
+        if m or tok == "H24":
+            span = (_hhmm("0000"), _hhmm("2400")) if tok == "H24" else (_hhmm(m.group(1)), _hhmm(m.group(2)))
+            if None in span:
+                return None
+            cur.times.append(span)
+        elif tok in ("DAILY", "DLY"):
+            selector().daily = True
+        elif tok in MONTHS:
+            month = MONTHS[tok]
+            selector()
+        elif tok.isdigit() and len(tok) <= 2:
+            selector().days.add((month, int(tok)))
+        elif _DAYS_RE.match(tok):
+            a, b = (int(x) for x in _DAYS_RE.match(tok).groups())
+            if a <= b:
+                selector().days.update((month, d) for d in range(a, b + 1))
+            else:  # "AUG 30-02" runs into the next month
+                after = month % 12 + 1 if month else None
+                selector().days.update([*((month, d) for d in range(a, 32)),
+                                        *((after, d) for d in range(1, b + 1))])
+        elif tok.partition("-")[0] in WEEKDAYS and tok.partition("-")[2] in WEEKDAYS:
+            a, b = WEEKDAYS[tok.partition("-")[0]], WEEKDAYS[tok.partition("-")[2]]
+            selector().weekdays.update(d % 7 for d in range(a, b + 1 if a <= b else b + 8))
+        elif tok in WEEKDAYS:
+            selector().weekdays.add(WEEKDAYS[tok])
+        else:
+            return None
+    groups.append(cur)
+    if any(not g.times for g in groups):
+        return None
+    return groups
+
+
+def _expand(groups: List[_Group], start: datetime, lo_bound: datetime,
+            hi_bound: datetime) -> List[Tuple[float, float]]:
+    """Activity intervals of the groups, clipped to [lo_bound, hi_bound)."""
+    raw = []
+    # from the day before: an overnight range may spill into the window
+    day = lo_bound.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+    while day < hi_bound:
+        for g in groups:
+            if g.matches(day):
+                for t1, t2 in g.times:
+                    lo = day + t1
+                    hi = day + t2 if t2 > t1 else day + t2 + timedelta(days=1)
+                    lo, hi = max(lo, start, lo_bound), min(hi, hi_bound)
+                    if lo < hi:
+                        raw.append((lo.timestamp(), hi.timestamp()))
+        day += timedelta(days=1)
+    return _merge(raw)
+
+
+def _merge(intervals: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    out: List[Tuple[float, float]] = []
+    for lo, hi in sorted(intervals):
+        if out and lo <= out[-1][1]:
+            out[-1] = (out[-1][0], max(out[-1][1], hi))
+        else:
+            out.append((lo, hi))
+    return out
+
+
+@dataclass(slots=True)
+class Validity:
+    """Decoded B/C/D of one NOTAM; intervals are epoch seconds [lo, hi)."""
+    start: Optional[float]
+    end: float
+    intervals: List[Tuple[float, float]]
+    estimated: bool = False
+    permanent: bool = False
+    scheduled: bool = False
+    # PERM + D): intervals are expanded up to here; the groups extend them
+    expanded: float = FOREVER
+    groups: Optional[List[_Group]] = None
+
+    def active_at(self, t: float) -> bool:
+        if t >= self.expanded:
+            day = _utc(t)
+            return any(lo <= t < hi for lo, hi in _expand(self.groups, _utc(self.start), day, day + timedelta(days=1)))
+        return any(lo <= t < hi for lo, hi in self.intervals)
+
+    def active_during(self, t1: float, t2: float) -> bool:
+        """In force at any moment of [t1, t2]; past `expanded` decoded on the fly."""
+        if any(lo <= t2 and hi > t1 for lo, hi in self.intervals):
+            return True
+        if t2 < self.expanded:
+            return False
+        # a schedule repeats within a year: look at most one year ahead
+        lo = _utc(max(t1, self.expanded))
+        hi = min(_utc(t2) + timedelta(seconds=1), lo + timedelta(days=366))
+        return bool(_expand(self.groups, _utc(self.start), lo, hi))
+
+    def extend(self, until: float, limit: float = FOREVER) -> List[Tuple[float, float]]:
+        """
+        Expand a PERM schedule past its horizon to at least `until` (a
+        horizon at a time, never past `limit`); returns the intervals added.
+        """
+        if until < self.expanded or self.expanded >= limit:
+            return []
+        lo = _utc(self.expanded)
+        hi = max(_utc(until), lo + timedelta(days=SCHEDULE_HORIZON_DAYS))
+        if limit != FOREVER:
+            hi = min(hi, _utc(limit))
+        added = _expand(self.groups, _utc(self.start), lo, hi)
+        self.intervals.extend(added)
+        self.expanded = hi.timestamp()
+        return added
+
+    def to_dict(self) -> Dict[str, Any]:
+        iso = lambda t: datetime.fromtimestamp(t, timezone.utc).isoformat() if t not in (None, FOREVER) else None
+        return {
+            "start": iso(self.start),
+            "end": iso(self.end),
+            "estimated": self.estimated,
+            "permanent": self.permanent,
+            "scheduled": self.scheduled,
+            "intervals": [[iso(lo), iso(hi)] for lo, hi in self.intervals],
+        }
+
+
+def _utc(t: float) -> datetime:
+    return datetime.fromtimestamp(t, timezone.utc)
+
+
+def notam_validity(text: str) -> Optional[Validity]:
+    """B/C/D of a NOTAM → Validity; None without a readable B) time."""
+    _, s = normalize_notam(text or "")
+    start = parse_notam_time(s.b)
+    if start is None:
+        return None
+    c = s.c.strip()
+    end = parse_notam_time(c)
+    permanent = end is None and c.startswith("PERM")
+    if end is None and not permanent:
+        return None
+    if end is not None and end <= start:
+        return None
+
+    window_end = end or start + timedelta(days=SCHEDULE_HORIZON_DAYS)
+    groups = parse_schedule(s.d) if s.d else None
+    if groups is None:
+        intervals = [(start.timestamp(), end.timestamp() if end else FOREVER)]
+    else:
+        intervals = _expand(groups, start, start, window_end)
+    lazy = groups is not None and end is None
+
+    return Validity(
+        start=start.timestamp(),
+        end=end.timestamp() if end else FOREVER,
+        intervals=intervals,
+        estimated=c.endswith("EST"),
+        permanent=permanent,
+        scheduled=groups is not None,
+        expanded=window_end.timestamp() if lazy else FOREVER,
+        groups=groups if lazy else None,
+    )
+
+
+class ValidityIndex:
+    """
+    NOTAM key → Validity, with every activity interval in an IntervalTree
+    and a min-heap of end times for eviction.
+    """
+
+    def __init__(self, evict_interval: float = EVICT_INTERVAL):
+        self._tree = IntervalTree()
+        self._items: Dict[str, Validity] = {}
+        self._expiry: List[Tuple[float, str]] = []
+        self._horizon: List[Tuple[float, str]] = []   # PERM schedules to extend
+        self._lazy: set = set()                        # keys of PERM schedules
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[str], Any]] = []
+        self.evict_interval = evict_interval
+        self._next_evict = 0.0
+        self.evicted = 0
+
+    def on_expire(self, fn: Callable[[str], Any]) -> None:
+        """fn(key) is called for each NOTAM evicted as expired."""
+        if fn not in self._listeners:
+            self._listeners.append(fn)
+
+    def add(self, key: str, validity: Validity) -> None:
+        with self._lock:
+            self._remove(key)
+            self._items[key] = validity
+            for lo, hi in validity.intervals:
+                self._tree.insert(lo, hi, key)
+            if validity.end != FOREVER:
+                heapq.heappush(self._expiry, (validity.end, key))
+            if validity.expanded != FOREVER:
+                heapq.heappush(self._horizon, (validity.expanded, key))
+                self._lazy.add(key)
+
+    def _extend_to(self, t: float) -> None:
+        """
+        Expand PERM schedules whose horizon a query at t looks past, but
+        only up to SCHEDULE_HORIZON_DAYS from now: a far-future `at` must
+        not materialize decades of daily intervals.
+        """
+        limit = float(int(time.time()) + SCHEDULE_HORIZON_DAYS * 86400)
+        t = min(t, limit)
+        done = []
+        while self._horizon and self._horizon[0][0] < t:
+            expanded, key = heapq.heappop(self._horizon)
+            v = self._items.get(key)
+            if v is None or v.expanded != expanded:  # removed or re-added
+                continue
+            for lo, hi in v.extend(t, limit):
+                self._tree.insert(lo, hi, key)
+            done.append((v.expanded, key))
+        for item in done:
+            heapq.heappush(self._horizon, item)
+
+    def _unexpanded(self, t1: float, t2: float) -> set:
+        """PERM schedules in force during [t1, t2] beyond their materialized part."""
+        hits = set()
+        for key in self._lazy:
+            v = self._items[key]
+            if v.expanded <= t2 and (v.active_at(t1) if t1 == t2 else v.active_during(t1, t2)):
+                hits.add(key)
+        return hits
+
+    def _remove(self, key: str) -> bool:
+        v = self._items.pop(key, None)
+        if v is None:
+            return False
+        for lo, hi in v.intervals:
+            self._tree.remove(lo, hi, key)
+        self._lazy.discard(key)
+        return True
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def get(self, key: str) -> Optional[Validity]:
+        return self._items.get(key)
+
+    def active_at(self, t: float) -> List[str]:
+        """Keys of NOTAMs in force at epoch second t."""
+        with self._lock:
+            self._extend_to(t)
+            return sorted({k for _, _, k in self._tree.at(t)} | self._unexpanded(t, t))
+
+    def active_during(self, t1: float, t2: float) -> List[str]:
+        """Keys of NOTAMs in force at any moment of [t1, t2]."""
+        with self._lock:
+            t1, t2 = min(t1, t2), max(t1, t2)
+            self._extend_to(t2)
+            return sorted({k for _, _, k in self._tree.overlap(t1, t2)} | self._unexpanded(t1, t2))
+
+    def evict_expired(self, now: float) -> List[str]:
+        """Drop NOTAMs whose C) time has passed; listeners get each key."""
+        gone = []
+        with self._lock:
+            while self._expiry and self._expiry[0][0] <= now:
+                end, key = heapq.heappop(self._expiry)
+                v = self._items.get(key)
+                if v is not None and v.end == end:  # not re-added with a later end
+                    self._remove(key)
+                    gone.append(key)
+            self.evicted += len(gone)
+        for key in gone:
+            for fn in list(self._listeners):
+                try:
+                    fn(key)
+                except Exception:
+                    pass
+        return gone
+
+    def maybe_evict(self, now: float) -> List[str]:
+        """evict_expired at most once per evict_interval seconds."""
+        if now < self._next_evict:
+            return []
+        self._next_evict = now + self.evict_interval
+        return self.evict_expired(now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tree.clear()
+            self._items.clear()
+            self._expiry.clear()
+            self._horizon.clear()
+            self._lazy.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._items),
+                "intervals": len(self._tree),
+                "scheduled": sum(1 for v in self._items.values() if v.scheduled),
+                "permanent": sum(1 for v in self._items.values() if v.permanent),
+                "evicted": self.evicted,
+            }
+
+
+VALIDITY_INDEX = ValidityIndex()
@@ -1,5 +1,5 @@
 // File: one-stop-solution/docs/script.js
-// Purpose: frontend glue: theme toggle, online->offline parse fallback, memory (localStorage), modal-based Save/Admin
+// Purpose: frontend glue: theme toggle, online->offline parse fallback, streamed AI explain/simplify/risk, memory (localStorage), modal-based Save/Admin
 (function () {
   'use strict';
 
@@ -95,6 +95,57 @@
     return { success: false };
   }
 
+  /* -------------------------
+     AI explain / simplify / risk
+     POST /ai/<task>/stream is Server-Sent Events on a POST, so it is read with
+     fetch + ReadableStream (EventSource can only GET). If streaming is not
+     possible, or fails before the first token, the blocking POST /ai/<task> answers.
+  ------------------------- */
+  const AI_ENDPOINT = '/ai/';
+  function aiRequest(path, accept) {
+    return fetch(AI_ENDPOINT + path, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', 'Accept': accept },
+      body: JSON.stringify({ notam: inputArea ? inputArea.value : '' })
+    });
+  }
+  async function streamAI(task, onToken) {
+    const res = await aiRequest(task + '/stream', 'text/event-stream');
+    if (!res.ok || !res.body || typeof res.body.getReader !== 'function') throw new Error('no stream ' + res.status);
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buf = '', provider = '', output = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buf += decoder.decode(value, { stream: true });
+      let cut;
+      while ((cut = buf.indexOf('\n\n')) >= 0) {
+        const block = buf.slice(0, cut); buf = buf.slice(cut + 2);
+        let event = 'message', data = '';
+        for (const line of block.split('\n')) {
+          if (line.startsWith('event:')) event = line.slice(6).trim();
+          else if (line.startsWith('data:')) data += line.slice(5).trim();
+        }
+        if (!data) continue;
+        const msg = JSON.parse(data);
+        if (event === 'error') {
+          if (!output) throw new Error(msg.error || 'stream error');
+          return { output, provider, error: msg.error };
+        }
+        if (msg.provider) provider = msg.provider;
+        if (typeof msg.token === 'string') { output += msg.token; onToken(output, provider); }
+      }
+    }
+    if (!output) throw new Error('empty stream');
+    return { output, provider };
+  }
+  async function blockingAI(task) {
+    const res = await aiRequest(task, 'application/json');
+    if (!res.ok) throw new Error('bad response ' + res.status);
+    return await res.json();  // { output, provider }
+  }
+
   function extractSegmentsFromModelText(text) {
     if (!text) return [];
     text = String(text).trim();
@@ -319,6 +370,26 @@
     openSaveModal(raw, []);
   }
 
+  /* -------------------------
+     AI flow: tokens are shown as they arrive; prose is not line-deduped
+  ------------------------- */
+  function showAIText(text, suffix = '') {
+    if (outputArea) outputArea.textContent = text + (suffix ? '\n\n' + suffix : '');
+  }
+  async function aiTaskFlow(task) {
+    const raw = inputArea ? inputArea.value : '';
+    if (!raw || !raw.trim()) { setOutput('[ERROR] empty input'); return; }
+    showAIText('', `(AI ${task}: waiting for first token...)`);
+    let res = null;
+    try {
+      res = await streamAI(task, (text, provider) => showAIText(text, `(AI ${task}: ${provider}, streaming...)`));
+    } catch (e) {
+      try { res = await blockingAI(task); } catch (e2) { res = null; }
+    }
+    if (!res || !res.output) { setOutput(`[ERROR] AI ${task} unavailable`); return; }
+    showAIText(res.output, `(AI ${task}: ${res.provider || 'unknown'}${res.error ? ', interrupted' : ''})`);
+  }
+
   /* -------------------------
      Save button handler (opens modal)
   ------------------------- */
@@ -337,9 +408,9 @@
   // expose old names for existing inline HTML
   window.toggleMode = toggleTheme;
   window.processNOTAM = () => parseNotamFlow(false);
-  window.aiExplain = () => parseNotamFlow(false);
-  window.aiSimplify = () => parseNotamFlow(false);
-  window.aiRisk = () => parseNotamFlow(false);
+  window.aiExplain = () => aiTaskFlow('explain');
+  window.aiSimplify = () => aiTaskFlow('simplify');
+  window.aiRisk = () => aiTaskFlow('risk');
 
   function makeMemoryButtonClickable() {
     const memBtn = byId('memoryAdminBtn');
@@ -45,3 +45,13 @@ def test_all_samples():
         # write sample mismatch file for debugging
         open(os.path.join(ROOT, 'parser_mismatches.json'),'w',encoding='utf-8').write(json.dumps(mismatches, indent=2))
     assert not mismatches, f"Found {len(mismatches)} mismatches; see parser_mismatches.json"
+
+def test_fl_bound_to_nearest_preceding_route():
+    parsed = parser.parse_notam(
+        "E)FLW ATS RTE SEGMENTS CLSD:\n"
+        "L736 NEDRA-GOMED FL045-FL130\n"
+        "R497 UPLIV-RAZDOLYE NDB (BD) FL280-FL540."
+    )
+    assert [(p['route'], p['low'], p['high']) for p in parsed] == [
+        ('L736', '045', '130'), ('R497', '280', '540'),
+    ]
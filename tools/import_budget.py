@@ -0,0 +1,83 @@
+"""
+Import-time benchmark for cold starts (Render free tier restarts often).
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter,
+reports the cumulative import time and the heaviest imports, and fails
+when the budget is exceeded or a provider SDK is imported eagerly.
+
+Usage:
+    python tools/import_budget.py [module] [--budget-ms 800] [--runs 3]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Provider SDKs must only load on first AI call (backend.ai_providers.registry)
+LAZY_MODULES = ("openai", "google.generativeai", "requests")
+
+LINE_RX = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module):
+    """Return (cumulative_us, rows, eager_lazy_modules) for one cold import."""
+    code = (
+        f"import {module}, sys; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+    rows = []
+    total = 0
+    for line in proc.stderr.splitlines():
+        m = LINE_RX.match(line)
+        if not m:
+            continue
+        self_us, cum_us, indent, name = int(m.group(1)), int(m.group(2)), m.group(3), m.group(4)
+        rows.append((cum_us, self_us, len(indent) // 2, name))
+        if name == module:
+            total = cum_us
+    eager = [m for m in proc.stdout.strip().split(",") if m]
+    return total, rows, eager
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("module", nargs="?", default="backend.app")
+    ap.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "800")))
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args(argv)
+
+    best = None
+    for _ in range(max(1, args.runs)):
+        result = measure(args.module)
+        if best is None or result[0] < best[0]:
+            best = result
+    total, rows, eager = best
+
+    print(f"{args.module}: {total / 1000:.1f} ms (budget {args.budget_ms:.0f} ms, best of {args.runs})")
+    print("heaviest top-level imports:")
+    for cum_us, _, depth, name in sorted((r for r in rows if r[2] <= 1), reverse=True)[:args.top]:
+        print(f"  {cum_us / 1000:8.1f} ms  {name}")
+
+    ok = True
+    if eager:
+        print(f"FAIL: provider SDKs imported at startup: {', '.join(eager)}")
+        ok = False
+    if total / 1000 > args.budget_ms:
+        print("FAIL: import budget exceeded")
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
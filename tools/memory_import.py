@@ -0,0 +1,68 @@
+"""
+Bulk memory import: load a large JSON / NDJSON dump into the memory store.
+
+Accepts a JSON array of entries (or NOTAM strings), a memory_store.json
+dump or NDJSON as written by /memory/export, plain or gzipped. The file
+is parsed incrementally, deduplicated against the store and committed in
+batches; derived indexes are refreshed once at the end.
+
+Usage:
+    python tools/memory_import.py FILE [FILE ...] [--batch-size N] [--no-dedup]
+    python tools/memory_import.py - < memory.ndjson.gz
+"""
+
+import argparse
+import json
+import os
+import sys
+import zlib
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.utils import memory_engine  # noqa: E402
+from backend.utils.memory_import import MemoryImporter, IMPORT_BATCH  # noqa: E402
+
+
+def import_file(path, batch_size=IMPORT_BATCH, dedup=True):
+    importer = MemoryImporter(batch_size=batch_size, dedup=dedup)
+    fh = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        while True:
+            chunk = fh.read(memory_engine.READ_CHUNK)
+            if not chunk:
+                break
+            importer.feed_bytes(chunk)
+        return importer.close()
+    except (ValueError, zlib.error):
+        importer.commit()  # keep the batches parsed so far
+        raise
+    finally:
+        if fh is not sys.stdin.buffer:
+            fh.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("files", nargs="+", help="dump files, or - for stdin")
+    ap.add_argument("--batch-size", type=int, default=IMPORT_BATCH,
+                    help="entries per store write")
+    ap.add_argument("--no-dedup", action="store_true",
+                    help="keep entries already in the store")
+    args = ap.parse_args(argv)
+
+    status = 0
+    for path in args.files:
+        try:
+            stats = import_file(path, args.batch_size, not args.no_dedup)
+        except (OSError, ValueError, zlib.error) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        print(json.dumps({"file": path, **stats}))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
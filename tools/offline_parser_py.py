@@ -1,5 +1,6 @@
 
 import re, math
+from backend.utils import fl_engine
 
 def normalize(text):
     return re.sub(r'[\u2013\u2014]', '-', text).strip()
@@ -36,40 +37,50 @@ def shorten_desc(desc):
     return re.sub(r'[\u2013\u2014]', '-', text).strip()
 
 def meter_to_fl(m):
-    feet = m * 3.28084
-    fl = math.floor(feet / 100)
-    return fl
+    # conservative floor rounding, via the shared backend FL engine
+    return fl_engine.meters_to_fl(m, "floor")
 
-def extract_fl_range(text):
+def rank_fl_range(text):
+    """
+    Returns (rank, fl) for the strongest FL form in text, lower rank wins:
+    0 FLxxx-FLyyy, 1 FROM/FM FLxxx TO FLyyy, 2 meters, 3 single FL, 4 FROM m TO m.
+    """
     if not text:
         return None
     t = text.upper()
     t = normalize(t)
     m = re.search(r'\bFL\s*(\d{1,3})\s*[-–]\s*FL\s*(\d{1,3})\b', t)
     if m:
-        return {'low': m.group(1).zfill(3), 'high': m.group(2).zfill(3)}
-    m = re.search(r'\bFROM\s+FL\s*(\d{1,3})\s+TO\s+FL\s*(\d{1,3})\b', t)
+        return 0, {'low': m.group(1).zfill(3), 'high': m.group(2).zfill(3)}
+    m = re.search(r'\b(?:FROM|FM)\s+FL\s*(\d{1,3})\s+TO\s+FL\s*(\d{1,3})\b', t)
     if m:
-        return {'low': m.group(1).zfill(3), 'high': m.group(2).zfill(3)}
-    m = re.search(r'(\d{3,6})\s*M\b', t)
+        return 1, {'low': m.group(1).zfill(3), 'high': m.group(2).zfill(3)}
+    m = re.search(r'(\d{1,3}(?:,\d{3})+|\d{3,6})\s*M\b', t)
     if m:
         meters = int(m.group(1).replace(',',''))
         fl = meter_to_fl(meters)
         if re.search(r'AND\s*BELOW', t):
-            return {'low':'000','high': str(fl).zfill(3)}
+            return 2, {'low':'000','high': str(fl).zfill(3)}
         if re.search(r'AND\s*ABOVE', t):
-            return {'low': str(fl).zfill(3), 'high':'999'}
-        return {'low': str(fl).zfill(3), 'high': str(fl).zfill(3)}
+            return 2, {'low': str(fl).zfill(3), 'high':'999'}
+        return 2, {'low': str(fl).zfill(3), 'high': str(fl).zfill(3)}
     m = re.search(r'\bFL\s*(\d{1,3})\b', t)
     if m:
-        return {'low': m.group(1).zfill(3), 'high': m.group(1).zfill(3)}
+        return 3, {'low': m.group(1).zfill(3), 'high': m.group(1).zfill(3)}
     m = re.search(r'\bFROM\s+(\d{1,6})\s*M\s+TO\s+(\d{1,6})\s*M\b', t)
     if m:
         low = meter_to_fl(int(m.group(1)))
         high = meter_to_fl(int(m.group(2)))
-        return {'low': str(low).zfill(3), 'high': str(high).zfill(3)}
+        return 4, {'low': str(low).zfill(3), 'high': str(high).zfill(3)}
     return None
 
+def extract_fl_range(text):
+    ranked = rank_fl_range(text)
+    return ranked[1] if ranked else None
+
+# FL tokens (FL095) look like route codes but are never routes
+FL_TOKEN_RX = re.compile(r'^FL\d', re.I)
+
 def extract_routes(lines):
     routes=[]
     route_rx = re.compile(r'^\s*([A-Z]{1,2}\d{1,4}|[A-Z]\d{1,3})\b[:\.\)]?\s*(.*)$', re.I)
@@ -77,7 +88,7 @@ def extract_routes(lines):
         ln = line.strip()
         ln2 = re.sub(r'^\d+\.\s*','',ln)
         m = route_rx.match(ln2)
-        if m and re.search(r'[A-Z]{1,2}\d{1,4}', m.group(1), re.I) and not '/' in m.group(1) and not 'NOTAM' in m.group(2).upper():
+        if m and re.search(r'[A-Z]{1,2}\d{1,4}', m.group(1), re.I) and not FL_TOKEN_RX.match(m.group(1)) and not '/' in m.group(1) and not 'NOTAM' in m.group(2).upper():
             code = m.group(1).upper()
             rest = m.group(2) or ''
             if not rest and i+1 < len(lines):
@@ -86,7 +97,7 @@ def extract_routes(lines):
             routes.append({'code':code,'desc':rest,'idx':i})
             continue
         inline = re.search(r'\b([A-Z]{1,2}\d{1,4})\b[\s\:]*([A-Z0-9\-\s\/\(\)]+)(FL|FROM|WITH|$)', ln, re.I)
-        if inline:
+        if inline and not FL_TOKEN_RX.match(inline.group(1)):
             code = inline.group(1).upper()
             desc = inline.group(2).strip()
             if 'NOTAM' in desc.upper() or '/' in desc[:3]:
@@ -96,21 +107,44 @@ def extract_routes(lines):
                 routes.append({'code':code,'desc':desc,'idx':i})
     return routes
 
+def bind_fl_to_routes(lines, routes):
+    """
+    One linear pass: every FL found on a line is bound to the nearest
+    preceding route (routes sharing a line share it); the strongest form
+    among a route's lines wins.
+    Returns a list of fl dicts (or None) aligned with `routes`.
+    """
+    best = [None] * len(routes)
+    ri = -1
+    for j, line in enumerate(lines):
+        while ri + 1 < len(routes) and routes[ri + 1]['idx'] <= j:
+            ri += 1
+        if ri < 0:
+            continue
+        ranked = rank_fl_range(line)
+        if not ranked:
+            continue
+        k = ri
+        while k >= 0 and routes[k]['idx'] == routes[ri]['idx']:
+            if best[k] is None or ranked[0] < best[k][0]:
+                best[k] = ranked
+            k -= 1
+    return [b[1] if b else None for b in best]
+
 def parse_notam(text):
-    lines = [l.strip() for l in re.split(r'\\r?\\n', text) if l.strip()]
+    lines = [l.strip() for l in re.split(r'\r?\n', text) if l.strip()]
     results=[]
     routes = extract_routes(lines)
-    for r in routes:
-        window = ' '.join(lines[r['idx']: r['idx']+4])
-        fl = extract_fl_range(window) or extract_fl_range(' '.join(lines))
+    bound = bind_fl_to_routes(lines, routes)
+    anyfl = None
+    if routes and None in bound:
+        anyfl = extract_fl_range(' '.join(lines))
+    for r, fl in zip(routes, bound):
+        fl = fl or anyfl
         if fl:
             results.append({'route': r['code'], 'desc': shorten_desc(r['desc']), 'low': fl['low'], 'high': fl['high']})
         else:
-            anyfl = extract_fl_range(' '.join(lines))
-            if anyfl:
-                results.append({'route': r['code'], 'desc': shorten_desc(r['desc']), 'low': anyfl['low'], 'high': anyfl['high']})
-            else:
-                results.append({'route': r['code'], 'desc': shorten_desc(r['desc']), 'low': None, 'high': None})
+            results.append({'route': r['code'], 'desc': shorten_desc(r['desc']), 'low': None, 'high': None})
     if not results:
         # last resort: find patterns like "W187:TUSLI - KARVI" anywhere
         for line in lines:
@@ -0,0 +1,83 @@
+"""
+Prompt token report: full vs compacted prompts on the NOTAM corpus.
+
+For every distinct input in "awy outputs only.txt" and every task, counts
+the tokens of prompt_router.build_prompt (raw NOTAM) against
+prompt_compact.build_compact_prompt, plus the derived max_tokens budget.
+Uses tiktoken when installed, otherwise ~4 characters per token.
+
+Usage:
+    python tools/prompt_token_report.py [--corpus FILE] [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.ai.prompt_router import build_prompt  # noqa: E402
+from backend.ai.prompt_compact import build_compact_prompt, max_tokens_for, TASK_FIELDS  # noqa: E402
+
+CORPUS = os.path.join(ROOT, "awy outputs only.txt")
+PAIR_RX = re.compile(r'i\/p:\s*(.*?)\s*O\/P:', re.I | re.S)
+
+
+def token_counter():
+    try:
+        import tiktoken
+        enc = tiktoken.get_encoding("cl100k_base")
+        return (lambda text: len(enc.encode(text))), "tiktoken/cl100k_base"
+    except Exception:
+        return (lambda text: max(1, len(text) // 4)), "chars/4"
+
+
+def load_corpus(path=CORPUS):
+    """Distinct NOTAM inputs, in corpus order."""
+    text = open(path, "r", encoding="utf-8").read()
+    return list(dict.fromkeys(m.strip() for m in PAIR_RX.findall(text) if m.strip()))
+
+
+def report(notams, tasks=tuple(TASK_FIELDS), count=None):
+    count = count or token_counter()[0]
+    rows = {}
+    for task in tasks:
+        full = sum(count(build_prompt(task, n)) for n in notams)
+        compact = sum(count(build_compact_prompt(task, n)) for n in notams)
+        rows[task] = {
+            "notams": len(notams),
+            "full_tokens": full,
+            "compact_tokens": compact,
+            "reduction_pct": round(100.0 * (full - compact) / full, 1) if full else 0.0,
+            "avg_max_tokens": round(sum(max_tokens_for(task, n) for n in notams) / max(len(notams), 1)),
+        }
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--corpus", default=CORPUS)
+    ap.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = ap.parse_args(argv)
+
+    count, method = token_counter()
+    notams = load_corpus(args.corpus)
+    rows = report(notams, count=count)
+    if args.json:
+        print(json.dumps({"method": method, "tasks": rows}, indent=2))
+        return 0
+
+    print(f"{len(notams)} distinct NOTAMs, token count: {method}")
+    print(f"{'task':<10}{'full':>10}{'compact':>10}{'saved':>9}{'max_tok':>9}")
+    for task, r in rows.items():
+        print(f"{task:<10}{r['full_tokens']:>10}{r['compact_tokens']:>10}"
+              f"{r['reduction_pct']:>8}%{r['avg_max_tokens']:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())